@@ -0,0 +1,5 @@
+"""
+Transport-pluggable latency benchmark shared by the publisher and subscriber containers.
+
+Run `python3 -m benchmark --help` for the available options.
+"""
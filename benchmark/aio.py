@@ -0,0 +1,197 @@
+import asyncio
+import time
+from contextlib import suppress
+from typing import List
+
+from benchmark import message
+from benchmark.clock import ClockSyncClient
+from benchmark.config import BenchmarkConfig
+from benchmark.histogram import LatencyHistogram
+from benchmark.pipeline import ProcessingPipeline
+from benchmark.protocols import create_subscriber, import_time
+from benchmark.recorder import LatencyRecorder, RunResult
+
+# Period used to check for completion and inactivity
+WAIT_PERIOD = 0.5
+
+
+class MessageQueue:
+    """
+    Bounded queue between the receiving side of a transport and the event loop.
+
+    Transports receiving on their own threads hand messages over with `put_threadsafe`, asyncio
+    transports with the `put` coroutine. When the queue is full the overflow policy applies:
+    "block" makes the receiver wait (backpressure towards the transport), "drop-oldest" discards the
+    oldest queued message and "drop-newest" the incoming one.
+
+    Attributes:
+        loop (asyncio.AbstractEventLoop): The event loop consuming the queue.
+        queue (asyncio.Queue): The queued (message, receive time) pairs.
+        overflow (str): The overflow policy.
+        dropped (int): Messages discarded by the overflow policy.
+        depth (LatencyHistogram): Queue depth after every enqueue.
+        wait (LatencyHistogram): Time spent in the queue by every message, in nanoseconds.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, size: int, overflow: str, precision: int = 3) -> None:
+        """
+        Initialize the queue.
+
+        :param loop: The event loop consuming the queue.
+        :param size: Maximum number of queued messages, 0 for unbounded.
+        :param overflow: The overflow policy: "block", "drop-oldest" or "drop-newest".
+        :param precision: Significant figures of the depth and wait histograms.
+        """
+        self.loop = loop
+        self.queue = asyncio.Queue(size)
+        self.overflow = overflow
+        self.dropped = 0
+        self.depth = LatencyHistogram(significant_figures=precision)
+        self.wait = LatencyHistogram(significant_figures=precision)
+
+    def put_threadsafe(self, data) -> None:
+        """
+        Enqueue a message from a transport thread, blocking it while the queue is full with the "block" policy.
+
+        :param data: The received message.
+        """
+        # Transports may reuse their receive buffer once the callback returns, multipart messages own their frames
+        item = (data if isinstance(data, (bytes, message.Parts)) else bytes(data), time.time_ns())
+        if self.overflow == "block":
+            asyncio.run_coroutine_threadsafe(self._put_blocking(item), self.loop).result()
+        else:
+            self.loop.call_soon_threadsafe(self._put_nowait, item)
+
+    async def put(self, data) -> None:
+        """
+        Enqueue a message from the event loop thread.
+
+        :param data: The received message.
+        """
+        item = (data if isinstance(data, (bytes, message.Parts)) else bytes(data), time.time_ns())
+        if self.overflow == "block":
+            await self._put_blocking(item)
+        else:
+            self._put_nowait(item)
+
+    async def _put_blocking(self, item: tuple) -> None:
+        """
+        Enqueue a message, waiting for room.
+
+        :param item: The (message, receive time) pair.
+        """
+        await self.queue.put(item)
+        self.depth.record(self.queue.qsize())
+
+    def _put_nowait(self, item: tuple) -> None:
+        """
+        Enqueue a message, applying the drop policy if the queue is full.
+
+        :param item: The (message, receive time) pair.
+        """
+        if self.queue.full():
+            self.dropped += 1
+            if self.overflow == "drop-newest":
+                return
+            self.queue.get_nowait()
+        self.queue.put_nowait(item)
+        self.depth.record(self.queue.qsize())
+
+    async def get(self) -> bytes:
+        """
+        :return: The next message, once available.
+        """
+        data, receive_ns = await self.queue.get()
+        self.wait.record(time.time_ns() - receive_ns)
+        return data
+
+    def report(self) -> None:
+        """
+        Print the queue depth, wait and drop statistics.
+        """
+        if not self.depth.total:
+            return
+        capacity = self.queue.maxsize or "unbounded"
+        print(f"Queue depth: mean {self.depth.mean():.1f}, p99 {self.depth.percentile(99)}, "
+              f"max {self.depth.maximum} of {capacity}, dropped {self.dropped} ({self.overflow})")
+        print(f"Queue wait: p50 {self.wait.percentile(50) / 1e6:.2f} ms, p99 {self.wait.percentile(99) / 1e6:.2f} ms, "
+              f"max {(self.wait.maximum or 0) / 1e6:.2f} ms")
+
+
+async def _consume(queue: MessageQueue, recorder: LatencyRecorder) -> None:
+    """
+    Handle the queued messages of a stream, latencies include the time spent in the queue.
+
+    :param queue: The queue of the stream.
+    :param recorder: The latency recorder of the stream.
+    """
+    while True:
+        data = await queue.get()
+        recorder.record(data, time.time_ns())
+
+
+async def _run(config: BenchmarkConfig, transports: List[str]) -> List[RunResult]:
+    """
+    Consume one stream per transport concurrently on the running event loop.
+
+    :param config: The benchmark configuration.
+    :param transports: The transport names.
+    :return: The result of every transport, in order.
+    """
+    loop = asyncio.get_running_loop()
+    streams = []
+    for transport in transports:
+        print(f"[{transport}] Creating asyncio subscriber.")
+        recorder = LatencyRecorder(config, transport)
+        if config.processing_work:
+            recorder.pipeline = ProcessingPipeline(config)
+        queue = MessageQueue(loop, config.queue_size, config.overflow_policy, config.histogram_precision)
+        subscriber = create_subscriber(transport, config)
+        seconds = import_time(transport)
+        if seconds is not None:
+            recorder.startup.record("import", seconds)
+        with recorder.startup.measure("open"):
+            await subscriber.open_async(queue)
+        recorder.opened = time.perf_counter()
+        recorder.resources.start()
+        streams.append((recorder, queue, subscriber, loop.create_task(_consume(queue, recorder))))
+        if config.clock_sync:
+            recorder.clock_client = ClockSyncClient(config, transport)
+
+    try:
+        # Streams are done once all of them completed, or none received anything for a while
+        while not all(recorder.finished.is_set() for recorder, _, _, _ in streams):
+            await asyncio.sleep(WAIT_PERIOD)
+            if time.monotonic() - max(recorder.last_activity for recorder, _, _, _ in streams) > config.timeout:
+                print(f"No packet received for {config.timeout}s, stopping.")
+                break
+    finally:
+        for recorder, _, subscriber, consumer in streams:
+            if recorder.clock_client is not None:
+                await loop.run_in_executor(None, recorder.clock_client.close)
+            # The consumer keeps draining while a blocked receiver shuts down
+            await subscriber.close_async()
+            consumer.cancel()
+            with suppress(asyncio.CancelledError):
+                await consumer
+            if recorder.pipeline is not None:
+                await loop.run_in_executor(None, recorder.pipeline.close)
+
+    results = []
+    for recorder, queue, subscriber, _ in streams:
+        print(f"[{recorder.transport}] Results:")
+        queue.report()
+        results.append(recorder.result(subscriber))
+    return results
+
+
+def run_subscribers(config: BenchmarkConfig, transports: List[str]) -> List[RunResult]:
+    """
+    Receive the configured workload over several transports at once, in a single asyncio event loop.
+    Every transport hands its messages to the loop through a bounded queue of `config.queue_size` messages.
+
+    :param config: The benchmark configuration.
+    :param transports: The transport names.
+    :return: The result of every transport, in order.
+    """
+    return asyncio.run(_run(config, transports))
@@ -0,0 +1,474 @@
+import argparse
+import sys
+from typing import Callable, List, Optional, Tuple
+
+from benchmark import aio, regression, resources, runner, sweep, trials
+from benchmark.config import (DDS_DATA_SHARING, DDS_PUBLISH_MODES, DDS_RELIABILITIES, IMAGE_ENCODINGS, MODES,
+                              OVERFLOW_POLICIES, PAYLOADS, PROCESSING_MODES, PUBLISH_MODES, RUNTIMES, ZMQ_ENDPOINTS,
+                              ZMQ_PATTERNS, BenchmarkConfig, ZmqConfig, parse_size, update)
+from benchmark.events import render_events
+from benchmark.histogram import LatencyHistogram, merge
+from benchmark.protocols import CODECS, TRANSPORTS, UnsupportedSetting, validate_config
+from benchmark.results import import_log, report, run_metadata, save_run
+from benchmark.schema import SCHEMAS
+
+# (sub-command, mode) -> function running one side of the benchmark for a single transport
+TRANSPORT_COMMANDS = {
+    ("publish", "oneway"): runner.run_publisher,
+    ("subscribe", "oneway"): runner.run_subscriber,
+    ("publish", "pingpong"): runner.run_ping,
+    ("subscribe", "pingpong"): runner.run_echo,
+    ("run", "oneway"): runner.run_local,
+    ("run", "pingpong"): runner.run_local,
+}
+# Results store of the import and report sub-commands
+DEFAULT_RESULTS_STORE = "results/store"
+
+
+def parse_qos_sweep(text: str) -> Tuple[str, list]:
+    """
+    Parse a DDS QoS sweep option, e.g. "history_depth=1,10,0".
+
+    :param text: The setting name and its comma separated values, "default" keeps the profile value.
+    :return: The setting name and its values.
+    """
+    name, _, values = text.partition("=")
+    name = name.replace("-", "_")
+    if name not in sweep.DDS_QOS_FIELDS or not values:
+        raise argparse.ArgumentTypeError(f"expected SETTING=VALUE,... with SETTING one of {', '.join(sweep.DDS_QOS_FIELDS)}")
+    convert = {"history_depth": int, "max_samples": int, "flow_controller_rate": parse_size}.get(name, str)
+    return name, [None if value == "default" else convert(value) for value in values.split(",")]
+
+
+def parse_bool(text: str) -> bool:
+    """
+    :param text: "true", "yes", "on" or "1", or "false", "no", "off" or "0".
+    :return: The boolean value.
+    """
+    if text.lower() not in ("true", "yes", "on", "1", "false", "no", "off", "0"):
+        raise argparse.ArgumentTypeError(f"expected a boolean, got '{text}'")
+    return text.lower() in ("true", "yes", "on", "1")
+
+
+def parse_zmq_sweep(text: str) -> Tuple[str, list]:
+    """
+    Parse a ZeroMQ sweep option, e.g. "endpoint=tcp,ipc,inproc" or "send_hwm=10,1000".
+
+    :param text: The setting name and its comma separated values, "default" keeps the default value.
+    :return: The setting name and its values.
+    """
+    name, _, values = text.partition("=")
+    name = name.replace("-", "_")
+    if name not in sweep.ZMQ_SWEEP_FIELDS or not values:
+        raise argparse.ArgumentTypeError(f"expected SETTING=VALUE,... with SETTING one of {', '.join(sweep.ZMQ_SWEEP_FIELDS)}")
+    convert = {"send_hwm": int, "receive_hwm": int, "send_buffer": parse_size, "receive_buffer": parse_size,
+               "io_threads": int, "multipart": parse_bool}.get(name, str)
+    choices = {"endpoint": ZMQ_ENDPOINTS, "pattern": ZMQ_PATTERNS}.get(name)
+    parsed = []
+    for value in values.split(","):
+        if value == "default":
+            parsed.append("tcp" if name == "endpoint" else getattr(ZmqConfig(), name))
+        elif choices is not None and value not in choices:
+            raise argparse.ArgumentTypeError(f"invalid {name} '{value}', expected one of {', '.join(choices)}")
+        else:
+            parsed.append(convert(value))
+    return name, parsed
+
+
+def add_workload_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the options describing the workload and the transports.
+
+    :param parser: The parser of a transport sub-command.
+    """
+    parser.add_argument("-t", "--transport", dest="transports", nargs="+", choices=sorted(TRANSPORTS),
+                        help="Transports to benchmark, in order (default: zmq)")
+    parser.add_argument("-m", "--mode", choices=MODES,
+                        help="oneway latency, or pingpong round-trip time with the subscriber echoing")
+    parser.add_argument("--echo-payload", action="store_true", default=None,
+                        help="Echo the full payload in ping-pong mode instead of the header only")
+    parser.add_argument("--ping-timeout", type=float, help="Seconds a ping waits for its echo")
+    parser.add_argument("--clock-sync", action="store_true", default=None,
+                        help="Correct one-way latencies with the clock offset estimated over the transport")
+    parser.add_argument("--clock-sync-interval", type=float, help="Seconds between two clock probes")
+    parser.add_argument("--clock-sync-window", type=int, help="Number of probes per min-RTT filtering group")
+    parser.add_argument("-c", "--config", help="JSON configuration file, command line options take precedence")
+    parser.add_argument("-n", "--count", type=int, help="Number of messages per transport")
+    parser.add_argument("-s", "--payload-size", type=parse_size, help="Payload size in bytes, K/M/G suffixes allowed")
+    parser.add_argument("-p", "--payload", choices=PAYLOADS, help="Payload content (default: constant)")
+    parser.add_argument("--payload-variants", type=int, help="Number of distinct payloads generated ahead of time")
+    parser.add_argument("--payload-seed", type=int, help="Seed of the payload generators")
+    parser.add_argument("--payload-file", help="Capture file, directory or glob pattern replayed by the file payload")
+    parser.add_argument("--image-width", type=int, help="Width of the synthetic image frames")
+    parser.add_argument("--image-encoding", choices=IMAGE_ENCODINGS, help="Encoding of the synthetic image frames")
+    parser.add_argument("--schema", choices=sorted(SCHEMAS),
+                        help="Send typed image frames or point clouds, decoded into numpy arrays by the subscriber")
+    parser.add_argument("-r", "--rate", type=float, help="Target send rate in Hz, 0 for back-to-back")
+    parser.add_argument("--sweep-sizes", nargs="+", type=parse_size, help="Payload sizes to sweep, e.g. 1K 64K 1M 4M 16M")
+    parser.add_argument("--sweep-rates", nargs="+", type=float, help="Send rates to sweep in Hz, 0 for back-to-back")
+    parser.add_argument("--ready-timeout", type=float,
+                        help="Seconds the publisher waits for its subscribers to be ready before sending anyway")
+    parser.add_argument("--startup-delay", type=float,
+                        help="Extra seconds the publisher waits once its subscribers are ready")
+    parser.add_argument("--timeout", type=float, help="Seconds the subscriber waits without traffic")
+    parser.add_argument("--warmup", type=int, help="Warm-up messages sent before the measured ones, not accounted for")
+    parser.add_argument("--warmup-detect", action="store_true", default=None,
+                        help="Detect the end of the warm-up transient in the latencies and exclude the messages before it")
+    parser.add_argument("--trials", type=int,
+                        help="Independent runs of every sweep point, reported with bootstrap confidence intervals")
+    parser.add_argument("--resource-interval", type=float,
+                        help="Seconds between two samples of the process resources of every side, 0 to disable")
+    parser.add_argument("--confidence", type=float, help="Confidence level of the intervals over the trials (default: 0.95)")
+    parser.add_argument("--runtime", choices=RUNTIMES,
+                        help="Subscriber runtime, asyncio consumes every transport at once through bounded queues")
+    parser.add_argument("--queue-size", type=int, help="Capacity of the asyncio runtime queues, 0 for unbounded")
+    parser.add_argument("--overflow-policy", choices=OVERFLOW_POLICIES, help="What a full asyncio runtime queue does")
+    parser.add_argument("--processing-work",
+                        help="Work run on every received payload: checksum, mean, copy or package.module:function")
+    parser.add_argument("--processing", choices=PROCESSING_MODES,
+                        help="Run the work in the receive callback, a thread pool or a process pool (default: threads)")
+    parser.add_argument("--processing-workers", type=int, help="Number of threads or processes of the processing pool")
+    parser.add_argument("--processing-slots", type=int, help="Maximum number of messages waiting for processing")
+    parser.add_argument("--publisher-id", type=int, help="Publisher identifier stamped in the header (default: random)")
+    parser.add_argument("--publishers", type=int, help="Number of publishers the subscriber waits for")
+    parser.add_argument("--subscribers", type=int,
+                        help="Number of local subscriber processes in a run (fan-out), and of subscribers to wait for")
+    parser.add_argument("--sweep-subscribers", nargs="+", type=int, help="Subscriber counts to sweep, e.g. 1 2 4 8")
+    parser.add_argument("--pin-cpus", action="store_true", default=None,
+                        help="Pin the local publisher and every subscriber to their own CPU")
+    parser.add_argument("--publish-mode", choices=PUBLISH_MODES,
+                        help="Reuse preallocated buffers (zero-copy) or build every message (copy)")
+    parser.add_argument("--buffer-pool-size", type=int, help="Number of preallocated buffers in zero-copy mode")
+    parser.add_argument("--chunk-size", type=parse_size,
+                        help="Split payloads larger than this many bytes in chunks, K/M/G suffixes allowed (default: 0, off)")
+    parser.add_argument("--chunk-pipeline", type=int, help="Number of chunk buffers in flight on the publisher")
+    parser.add_argument("--reassembly-slots", type=int, help="Number of messages reassembled at the same time")
+    parser.add_argument("--compression", choices=sorted(CODECS), help="Codec compressing the payloads (default: none)")
+    parser.add_argument("--compression-level", type=int, help="Compression level (default: codec default)")
+    parser.add_argument("--compression-min-ratio", type=float,
+                        help="Send the payloads compressing less than this ratio uncompressed")
+    parser.add_argument("--compression-link-rate", type=parse_size,
+                        help="Link rate in bytes/s, skip compression when it is slower than sending the saved bytes")
+    parser.add_argument("--compression-threads", type=int, help="Number of threads compressing off the publish loop")
+    parser.add_argument("--histogram-precision", type=int, choices=range(1, 6),
+                        help="Significant figures of the latency histogram")
+    parser.add_argument("--histogram-output",
+                        help="File to save the latency histogram to, {transport} is replaced by the transport name")
+    parser.add_argument("--event-log",
+                        help="File to record the per-message events to, {transport}, {role} and {pid} are replaced")
+    parser.add_argument("--event-capacity", type=int,
+                        help="Events kept before overwriting the oldest (default: every message of the run)")
+    parser.add_argument("--results-store",
+                        help="Directory to store every run to, with its per-message records and metadata")
+
+    zmq_group = parser.add_argument_group("zmq")
+    zmq_group.add_argument("--zmq-publisher-address", help="Endpoint the publisher binds to")
+    zmq_group.add_argument("--zmq-subscriber-address", help="Endpoint the subscriber connects to")
+    zmq_group.add_argument("--zmq-endpoint", choices=ZMQ_ENDPOINTS,
+                           help="Use the default same-host addresses of this endpoint kind, inproc runs in one process")
+    zmq_group.add_argument("--zmq-pattern", choices=ZMQ_PATTERNS,
+                           help="Socket pattern, radiodish needs libzmq draft support")
+    zmq_group.add_argument("--zmq-send-hwm", type=int, help="High water mark of the publisher socket, in messages")
+    zmq_group.add_argument("--zmq-receive-hwm", type=int, help="High water mark of the subscriber socket, in messages")
+    zmq_group.add_argument("--zmq-send-buffer", type=parse_size,
+                           help="Kernel send buffer size of the publisher socket, K/M/G suffixes allowed")
+    zmq_group.add_argument("--zmq-receive-buffer", type=parse_size,
+                           help="Kernel receive buffer size of the subscriber socket, K/M/G suffixes allowed")
+    zmq_group.add_argument("--zmq-io-threads", type=int, help="Number of I/O threads of the ZeroMQ context")
+    zmq_group.add_argument("--zmq-multipart", action="store_true", default=None,
+                           help="Send the header and the payload as separate frames, the payload without copy "
+                                "in zero-copy mode")
+    zmq_group.add_argument("--zmq-sweep", nargs="+", type=parse_zmq_sweep, metavar="SETTING=VALUES",
+                           help="Sweep ZeroMQ settings, e.g. endpoint=tcp,ipc,inproc pattern=pubsub,pushpull "
+                                "send_hwm=10,1000")
+
+    zenoh_group = parser.add_argument_group("zenoh")
+    zenoh_group.add_argument("--zenoh-key", help="Key expression to publish on")
+    zenoh_group.add_argument("--zenoh-shared-memory", action="store_true", default=None,
+                             help="Publish from a shared memory pool to same-host subscribers. This saves the socket "
+                                  "transfer, not copies: the publisher still copies every message into the pool and "
+                                  "the subscriber out of it, the 1.2.x Python API exposing no view of the segment")
+    zenoh_group.add_argument("--zenoh-shm-pool-size", type=parse_size,
+                             help="Size of the shared memory pool, K/M/G suffixes allowed (default: 16 messages)")
+
+    dds_group = parser.add_argument_group("dds")
+    dds_group.add_argument("--dds-profile", help="Participant profile name")
+    dds_group.add_argument("--dds-topic", help="Topic name (default: <data type>Topic)")
+    dds_group.add_argument("--dds-data-type", choices=("BinaryMessage", "PlainMessage", "SimpleMessage"),
+                           help="DDS data type carrying the messages")
+    dds_group.add_argument("--dds-data-sharing", choices=DDS_DATA_SHARING, help="Data-sharing mode")
+    dds_group.add_argument("--dds-reliability", choices=DDS_RELIABILITIES, help="Reliability of the writer and reader")
+    dds_group.add_argument("--dds-history-depth", type=int, help="KEEP_LAST history depth, 0 for KEEP_ALL")
+    dds_group.add_argument("--dds-max-samples", type=int, help="Resource limit on the samples held by the writer and reader")
+    dds_group.add_argument("--dds-publish-mode", choices=DDS_PUBLISH_MODES, help="Writer publish mode")
+    dds_group.add_argument("--dds-flow-controller-rate", type=parse_size,
+                           help="Limit the writer to this many bytes per second with a flow controller, K/M/G suffixes allowed")
+    dds_group.add_argument("--dds-qos-sweep", nargs="+", type=parse_qos_sweep, metavar="SETTING=VALUES",
+                           help="Sweep DDS settings, e.g. reliability=reliable,best-effort history_depth=1,10,0; "
+                                "'default' keeps the profile value")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Build the command line parser.
+
+    :return: The argument parser.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python3 -m benchmark",
+        description="Run the same latency workload over one or more middleware transports.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    publish = commands.add_parser("publish", help="Publish the workload, or send pings in ping-pong mode")
+    add_workload_arguments(publish)
+    subscribe = commands.add_parser("subscribe", help="Receive the workload and report latency, or echo pings")
+    add_workload_arguments(subscribe)
+    run = commands.add_parser("run", help="Run the publisher and the subscriber on this host")
+    add_workload_arguments(run)
+
+    merge_parser = commands.add_parser("merge", help="Merge saved latency histograms and report percentiles")
+    merge_parser.add_argument("histograms", nargs="+", help="Histogram files saved with --histogram-output")
+    merge_parser.add_argument("-o", "--output", help="File to save the merged histogram to")
+
+    events_parser = commands.add_parser("events", help="Print the per-message events saved with --event-log")
+    events_parser.add_argument("files", nargs="+", help="Event files")
+    events_parser.add_argument("--csv", action="store_true", help="Print the raw fields as CSV")
+
+    import_parser = commands.add_parser("import", help="Import the logs of the original scripts into a results store")
+    import_parser.add_argument("logs", nargs="+", help="Subscriber logs, e.g. results/subscriber_*.log")
+    import_parser.add_argument("--store", default=DEFAULT_RESULTS_STORE, help="Results store directory")
+
+    report_parser = commands.add_parser("report", help="Compare the runs of a results store")
+    report_parser.add_argument("--store", default=DEFAULT_RESULTS_STORE, help="Results store directory")
+    report_parser.add_argument("--transport", nargs="+", dest="transports", help="Only report these transports")
+    report_parser.add_argument("--plots", help="Directory to save the latency CDF and percentile plots to")
+
+    regress = commands.add_parser("regress", help="Run the local regression suite and compare it with the baseline")
+    add_workload_arguments(regress)
+    regress.add_argument("--baseline", default=regression.DEFAULT_BASELINE, help="Baseline file")
+    regress.add_argument("--tolerance", type=float, default=regression.DEFAULT_TOLERANCE,
+                         help="Relative change tolerated on top of the baseline noise")
+    regress.add_argument("--update-baseline", action="store_true",
+                         help="Save the measurements as the new baseline instead of comparing")
+    return parser
+
+
+def parse_config(args: argparse.Namespace) -> BenchmarkConfig:
+    """
+    Build the benchmark configuration from the configuration file and the command line.
+
+    :param args: The parsed command line arguments.
+    :return: The benchmark configuration.
+    """
+    config = BenchmarkConfig.from_file(args.config) if args.config else BenchmarkConfig()
+
+    zmq_endpoint = ZMQ_ENDPOINTS.get(args.zmq_endpoint, {})
+    overrides = {
+        "transports": args.transports,
+        "mode": args.mode,
+        "echo_payload": args.echo_payload,
+        "ping_timeout": args.ping_timeout,
+        "clock_sync": args.clock_sync,
+        "clock_sync_interval": args.clock_sync_interval,
+        "clock_sync_window": args.clock_sync_window,
+        "count": args.count,
+        "payload_size": args.payload_size,
+        "payload": args.payload,
+        "payload_variants": args.payload_variants,
+        "payload_seed": args.payload_seed,
+        "payload_file": args.payload_file,
+        "image_width": args.image_width,
+        "image_encoding": args.image_encoding,
+        "schema": args.schema,
+        "rate": args.rate,
+        "sweep_payload_sizes": args.sweep_sizes,
+        "sweep_rates": args.sweep_rates,
+        "ready_timeout": args.ready_timeout,
+        "startup_delay": args.startup_delay,
+        "timeout": args.timeout,
+        "warmup": args.warmup,
+        "warmup_detect": args.warmup_detect,
+        "trials": args.trials,
+        "confidence": args.confidence,
+        "resource_interval": args.resource_interval,
+        "runtime": args.runtime,
+        "queue_size": args.queue_size,
+        "overflow_policy": args.overflow_policy,
+        "processing_work": args.processing_work,
+        "processing": args.processing,
+        "processing_workers": args.processing_workers,
+        "processing_slots": args.processing_slots,
+        "publisher_id": args.publisher_id,
+        "publishers": args.publishers,
+        "subscribers": args.subscribers,
+        "sweep_subscribers": args.sweep_subscribers,
+        "pin_cpus": args.pin_cpus,
+        "publish_mode": args.publish_mode,
+        "buffer_pool_size": args.buffer_pool_size,
+        "chunk_size": args.chunk_size,
+        "chunk_pipeline": args.chunk_pipeline,
+        "reassembly_slots": args.reassembly_slots,
+        "compression": args.compression,
+        "compression_level": args.compression_level,
+        "compression_min_ratio": args.compression_min_ratio,
+        "compression_link_rate": args.compression_link_rate,
+        "compression_threads": args.compression_threads,
+        "histogram_precision": args.histogram_precision,
+        "histogram_output": args.histogram_output,
+        "event_log": args.event_log,
+        "event_capacity": args.event_capacity,
+        "results_store": args.results_store,
+        "zmq": {
+            **zmq_endpoint,
+            "publisher_address": args.zmq_publisher_address or zmq_endpoint.get("publisher_address"),
+            "subscriber_address": args.zmq_subscriber_address or zmq_endpoint.get("subscriber_address"),
+            "pattern": args.zmq_pattern,
+            "send_hwm": args.zmq_send_hwm,
+            "receive_hwm": args.zmq_receive_hwm,
+            "send_buffer": args.zmq_send_buffer,
+            "receive_buffer": args.zmq_receive_buffer,
+            "io_threads": args.zmq_io_threads,
+            "multipart": args.zmq_multipart,
+            "sweep": dict(args.zmq_sweep) if args.zmq_sweep else None,
+        },
+        "zenoh": {
+            "key": args.zenoh_key,
+            "shared_memory": args.zenoh_shared_memory,
+            "shm_pool_size": args.zenoh_shm_pool_size,
+        },
+        "dds": {
+            "profile": args.dds_profile,
+            "topic": args.dds_topic,
+            "data_name": args.dds_data_type,
+            "data_sharing": args.dds_data_sharing,
+            "reliability": args.dds_reliability,
+            "history_depth": args.dds_history_depth,
+            "max_samples": args.dds_max_samples,
+            "publish_mode": args.dds_publish_mode,
+            "flow_controller_rate": args.dds_flow_controller_rate,
+            "sweep": dict(args.dds_qos_sweep) if args.dds_qos_sweep else None,
+        },
+    }
+    update(config, _drop_unset(overrides))
+    return config
+
+
+def _drop_unset(values: dict) -> dict:
+    """
+    Remove the options that were not given on the command line.
+
+    :param values: Nested dictionary of options.
+    :return: The dictionary without None values.
+    """
+    result = {}
+    for name, value in values.items():
+        if isinstance(value, dict):
+            value = _drop_unset(value)
+        if value is not None:
+            result[name] = value
+    return result
+
+
+def merge_histograms(args: argparse.Namespace) -> None:
+    """
+    Merge saved histograms, print their summary and optionally save the result.
+
+    :param args: The parsed command line arguments.
+    """
+    merged = merge(LatencyHistogram.load(path) for path in args.histograms)
+    merged.report()
+    if args.output:
+        merged.save(args.output)
+
+
+def store_result(config: BenchmarkConfig, result: runner.RunResult) -> None:
+    """
+    Label the middleware variant of a run and save the run to `config.results_store`, if set.
+
+    :param config: The configuration of the run.
+    :param result: The result of the run.
+    """
+    result.variant = sweep.describe_variant(config, result.transport)
+    if config.results_store:
+        path = save_run(config.results_store, run_metadata(config, result), result.records)
+        print(f"Run stored to {path}")
+
+
+def run_trials(point: BenchmarkConfig, run: Callable[[], list]) -> List[runner.RunResult]:
+    """
+    Run a sweep point `point.trials` times, store every trial and combine the trials of every transport.
+
+    :param point: The configuration of the point.
+    :param run: Runs the point once, returns the result of every transport (None for the sides measuring nothing).
+    :return: The combined result of every transport, see trials.combine_trials.
+    """
+    runs = []
+    for trial in range(point.trials):
+        if point.trials > 1:
+            print(f"Trial {trial + 1}/{point.trials}")
+        runs.append([result for result in run() if isinstance(result, runner.RunResult)])
+        for result in runs[-1]:
+            store_result(point, result)
+
+    combined = []
+    for transport_runs in zip(*runs):
+        result = trials.combine_trials(list(transport_runs))
+        if len(result.trials) > 1:
+            trials.report_trials(result, point.confidence)
+        combined.append(result)
+    return combined
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Command line entry point.
+
+    :param argv: Command line arguments, defaults to sys.argv.
+    """
+    args = build_parser().parse_args(argv)
+    if args.command == "merge":
+        merge_histograms(args)
+        return
+    if args.command == "events":
+        for path in args.files:
+            render_events(path, args.csv)
+        return
+    if args.command == "import":
+        for path in args.logs:
+            stored = import_log(path, args.store)
+            print(f"{path}: " + (f"stored to {stored}" if stored else "no received packet, skipped"))
+        return
+    if args.command == "report":
+        report(args.store, args.plots, args.transports)
+        return
+
+    config = parse_config(args)
+    if args.command == "regress":
+        suite_trials = args.trials or regression.DEFAULT_TRIALS
+        if not regression.run_suite(config, args.baseline, suite_trials, args.tolerance, args.update_baseline):
+            sys.exit(1)
+        return
+
+    command = TRANSPORT_COMMANDS[(args.command, config.mode)]
+    results = []
+    if args.command == "subscribe" and config.mode == "oneway" and config.runtime == "asyncio":
+        # A single event loop consumes every transport concurrently
+        for point in sweep.sweep_configs(config):
+            results.extend(run_trials(point, lambda: aio.run_subscribers(point, config.transports)))
+    else:
+        for transport in config.transports:
+            for point in sweep.sweep_configs(config, transport):
+                try:
+                    validate_config(transport, point)
+                except UnsupportedSetting as error:
+                    # A setting the installed middleware bindings do not have only fails the points using it
+                    print(f"[{transport}] Skipping {sweep.describe_variant(point, transport) or 'default settings'}, "
+                          f"{point.payload_size} bytes at {f'{point.rate:g} Hz' if point.rate else 'max rate'}: "
+                          f"{error}")
+                    continue
+                results.extend(run_trials(point, lambda: [command(point, transport)]))
+
+    if len(results) > 1:
+        sweep.print_table(results)
+        resources.print_table(results)
+        trials.compare_trials(results, config.confidence)
@@ -0,0 +1,257 @@
+import random
+import struct
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from benchmark import message
+from benchmark.protocols import REPLY_CHANNEL, TransportPublisher, create_publisher, create_subscriber
+
+# Payload of a probe reply: remote receive and send timestamps (t1, t2)
+PROBE_REPLY = struct.Struct("<qq")
+
+
+class ClockOffsetEstimator:
+    """
+    NTP-style estimate of the offset of a remote clock from probe exchanges.
+
+    Every exchange gives the local send time t0, remote receive time t1, remote send time t2 and
+    local receive time t3. Its offset is ((t1 - t0) + (t2 - t3)) / 2, and is exact when both legs take
+    the same time, so only the exchange with the smallest round-trip of every `window` exchanges is kept.
+    A line fitted through the kept points tracks the drift between the two clocks.
+
+    Attributes:
+        window (int): Number of exchanges per min-RTT filtering group.
+        history (int): Number of filtered points used to fit the drift.
+        points (List[Tuple[int, int, int]]): Filtered (local time, offset, round-trip) points, all in ns.
+        samples (int): Number of exchanges received.
+    """
+
+    def __init__(self, window: int = 8, history: int = 16) -> None:
+        """
+        Initialize the estimator.
+
+        :param window: Number of exchanges per min-RTT filtering group.
+        :param history: Number of filtered points used to fit the drift.
+        """
+        self.window = window
+        self.history = history
+        self.points: List[Tuple[int, int, int]] = []
+        self.samples = 0
+        self._group: List[Tuple[int, int, int]] = []
+        self._fit: Optional[Tuple[float, float, float]] = None
+        self._lock = threading.Lock()
+
+    def add(self, t0: int, t1: int, t2: int, t3: int) -> None:
+        """
+        Add a probe exchange.
+
+        :param t0: Local time the probe was sent.
+        :param t1: Remote time the probe was received.
+        :param t2: Remote time the reply was sent.
+        :param t3: Local time the reply was received.
+        """
+        round_trip = (t3 - t0) - (t2 - t1)
+        offset = ((t1 - t0) + (t2 - t3)) // 2
+        with self._lock:
+            self.samples += 1
+            self._group.append(((t0 + t3) // 2, offset, round_trip))
+            if len(self._group) >= self.window:
+                self.points.append(min(self._group, key=lambda point: point[2]))
+                del self.points[:-self.history]
+                self._group = []
+                self._fit = self._fit_points()
+
+    def _fit_points(self) -> Optional[Tuple[float, float, float]]:
+        """
+        :return: Least squares (reference time, offset at reference, slope) of the filtered points.
+        """
+        if not self.points:
+            return None
+        reference = self.points[0][0]
+        xs = [point[0] - reference for point in self.points]
+        ys = [point[1] for point in self.points]
+        mean_x = sum(xs) / len(xs)
+        mean_y = sum(ys) / len(ys)
+        spread = sum((x - mean_x) ** 2 for x in xs)
+        slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / spread if spread else 0.0
+        return reference, mean_y - slope * mean_x, slope
+
+    def offset(self, at_ns: int) -> Optional[int]:
+        """
+        :param at_ns: Local time at which the offset is needed.
+        :return: Remote clock minus local clock in ns at that time, None before the first exchange.
+        """
+        with self._lock:
+            if self._fit is not None:
+                reference, intercept, slope = self._fit
+                return int(intercept + slope * (at_ns - reference))
+            if self._group:
+                return min(self._group, key=lambda point: point[2])[1]
+        return None
+
+    def drift_ppm(self) -> float:
+        """
+        :return: Drift of the remote clock relative to the local one, in parts per million.
+        """
+        return self._fit[2] * 1e6 if self._fit is not None else 0.0
+
+    def min_round_trip(self) -> Optional[int]:
+        """
+        :return: Smallest round-trip time of the kept exchanges, in ns.
+        """
+        candidates = self.points + self._group
+        return min(point[2] for point in candidates) if candidates else None
+
+    def report(self) -> None:
+        """
+        Print the current estimate.
+        """
+        offset = self.offset(time.time_ns())
+        if offset is None:
+            print("Clock offset: no probe reply received, latencies are not corrected")
+            return
+        print(f"Clock offset: {offset / 1e6:.3f} ms, drift: {self.drift_ppm():.2f} ppm, "
+              f"min probe RTT: {self.min_round_trip() / 1e6:.3f} ms, probes: {self.samples}")
+
+
+def encode_probe(client_id: int, sequence: int) -> bytes:
+    """
+    :param client_id: Identifier of the probing subscriber.
+    :param sequence: The probe sequence number.
+    :return: A probe stamped with the local send time t0.
+    """
+    return message.encode(client_id, sequence, b"", message.Flags.CLOCK_PROBE)
+
+
+def encode_probe_reply(probe: message.MessageHeader, receive_ns: int) -> bytes:
+    """
+    :param probe: Header of the received probe.
+    :param receive_ns: Local time the probe was received (t1).
+    :return: A reply echoing t0 and carrying t1 and the local send time t2.
+    """
+    payload = PROBE_REPLY.pack(receive_ns, time.time_ns())
+    return message.encode(probe.publisher_id, probe.sequence, payload, message.Flags.CLOCK_REPLY,
+                          timestamp_ns=probe.timestamp_ns)
+
+
+class ClockSyncServer:
+    """
+    Publisher side of the clock synchronization: answers the probes of the subscribers.
+    Probes arrive on the reply channel, answers leave on the data channel with the benchmark messages.
+
+    Attributes:
+        publisher (TransportPublisher): The data channel publisher.
+        send_lock (threading.Lock): Lock serializing the sends on the publisher.
+        subscriber: The reply channel subscriber receiving probes.
+        window (int): Number of probes per filtering window of the subscribers.
+        answered (int): Number of probes answered.
+        settled (threading.Event): Set once a full filtering window of probes was answered.
+    """
+
+    def __init__(self, config, transport: str, publisher: TransportPublisher, send_lock: threading.Lock) -> None:
+        """
+        Start answering probes.
+
+        :param config: The benchmark configuration.
+        :param transport: The transport name.
+        :param publisher: The data channel publisher.
+        :param send_lock: Lock serializing the sends on the publisher.
+        """
+        self.publisher = publisher
+        self.send_lock = send_lock
+        self.window = config.clock_sync_window
+        self.answered = 0
+        self.settled = threading.Event()
+        self.subscriber = create_subscriber(transport, config, REPLY_CHANNEL)
+        self.subscriber.open(self._on_probe)
+
+    def _on_probe(self, data) -> None:
+        """
+        Answer a probe.
+
+        :param data: The received message.
+        """
+        receive_ns = time.time_ns()
+        header, _ = message.decode(data)
+        if not header.flags & message.Flags.CLOCK_PROBE:
+            return
+        with self.send_lock:
+            self.publisher.send(encode_probe_reply(header, receive_ns))
+        self.answered += 1
+        if self.answered >= self.window:
+            self.settled.set()
+
+    def close(self) -> None:
+        """
+        Stop answering probes.
+        """
+        self.subscriber.close()
+
+
+class ClockSyncClient:
+    """
+    Subscriber side of the clock synchronization: probes the publisher periodically in the background.
+
+    Attributes:
+        client_id (int): Identifier stamped in the probes.
+        interval (float): Seconds between two probes.
+        estimator (ClockOffsetEstimator): The offset estimator fed with the replies.
+        publisher: The reply channel publisher sending probes.
+        alive (bool): Flag to indicate if the probe thread should keep running.
+        thread (threading.Thread): The probe thread.
+    """
+
+    def __init__(self, config, transport: str) -> None:
+        """
+        Start probing.
+
+        :param config: The benchmark configuration.
+        :param transport: The transport name.
+        """
+        self.client_id = random.getrandbits(32)
+        self.interval = config.clock_sync_interval
+        self.estimator = ClockOffsetEstimator(config.clock_sync_window)
+        self.publisher = create_publisher(transport, config, REPLY_CHANNEL)
+        self.publisher.open()
+        self.alive = True
+        self.thread = threading.Thread(target=self._probe, daemon=True)
+        self.thread.start()
+
+    def _probe(self) -> None:
+        """
+        Probe loop, stopped by clearing the alive flag.
+        """
+        sequence = 0
+        while self.alive:
+            self.publisher.send(encode_probe(self.client_id, sequence))
+            sequence += 1
+            time.sleep(self.interval)
+
+    def handle_reply(self, header: message.MessageHeader, payload, receive_ns: int) -> None:
+        """
+        Feed a probe reply received on the data channel to the estimator.
+
+        :param header: The reply header.
+        :param payload: The reply payload.
+        :param receive_ns: Local time the reply was received (t3).
+        """
+        if header.publisher_id != self.client_id:
+            return
+        remote_receive_ns, remote_send_ns = PROBE_REPLY.unpack_from(payload)
+        self.estimator.add(header.timestamp_ns, remote_receive_ns, remote_send_ns, receive_ns)
+
+    def offset(self, at_ns: int) -> Optional[int]:
+        """
+        :param at_ns: Local time at which the offset is needed.
+        :return: Publisher clock minus local clock in ns, None before the first reply.
+        """
+        return self.estimator.offset(at_ns)
+
+    def close(self) -> None:
+        """
+        Stop probing.
+        """
+        self.alive = False
+        self.thread.join()
+        self.publisher.close()
@@ -0,0 +1,321 @@
+import json
+from dataclasses import dataclass, field, fields, is_dataclass
+from typing import Dict, List, Optional
+
+# Defaults matching the original standalone publisher/subscriber scripts
+DEFAULT_PACKET_COUNT = 100
+DEFAULT_PAYLOAD_SIZE = 4056292  # bytes
+PUBLISH_MODES = ("copy", "zero-copy")
+MODES = ("oneway", "pingpong")
+PAYLOADS = ("constant", "random", "image", "pointcloud", "file")
+IMAGE_ENCODINGS = ("raw", "jpeg", "png")
+RUNTIMES = ("threads", "asyncio")
+OVERFLOW_POLICIES = ("block", "drop-oldest", "drop-newest")
+PROCESSING_MODES = ("inline", "threads", "processes")
+DDS_RELIABILITIES = ("reliable", "best-effort")
+DDS_PUBLISH_MODES = ("sync", "async")
+DDS_DATA_SHARING = ("automatic", "off")
+ZMQ_PATTERNS = ("pubsub", "pushpull", "radiodish")
+# Endpoint kind -> ZeroMQ addresses of a same-host run. inproc needs both sides in the same process.
+ZMQ_ENDPOINTS = {
+    "tcp": {"publisher_address": "tcp://0.0.0.0:5555", "subscriber_address": "tcp://127.0.0.1:5555",
+            "reply_publisher_address": "tcp://0.0.0.0:5556", "reply_subscriber_address": "tcp://127.0.0.1:5556"},
+    "ipc": {"publisher_address": "ipc:///tmp/benchmark-data", "subscriber_address": "ipc:///tmp/benchmark-data",
+            "reply_publisher_address": "ipc:///tmp/benchmark-reply", "reply_subscriber_address": "ipc:///tmp/benchmark-reply"},
+    "inproc": {"publisher_address": "inproc://benchmark-data", "subscriber_address": "inproc://benchmark-data",
+               "reply_publisher_address": "inproc://benchmark-reply", "reply_subscriber_address": "inproc://benchmark-reply"},
+}
+
+
+@dataclass
+class ZmqConfig:
+    """
+    ZeroMQ transport settings.
+
+    Attributes:
+        publisher_address (str): Endpoint the publisher binds to.
+        subscriber_address (str): Endpoint the subscriber connects to.
+        reply_publisher_address (str): Endpoint the echo responder binds to in ping-pong mode.
+        reply_subscriber_address (str): Endpoint the ping originator connects to in ping-pong mode.
+            Addresses may be tcp://, ipc:// or inproc:// endpoints, see ZMQ_ENDPOINTS.
+        pattern (str): Socket pattern: "pubsub" (PUB/SUB), "pushpull" (PUSH/PULL, every message goes to a single
+            subscriber) or "radiodish" (RADIO/DISH, needs libzmq draft support).
+        send_hwm (Optional[int]): High water mark of the publisher socket in messages, None keeps the default (1000).
+        receive_hwm (Optional[int]): High water mark of the subscriber socket in messages, None keeps the default.
+        send_buffer (Optional[int]): Kernel send buffer size of the publisher socket in bytes, None keeps the OS default.
+        receive_buffer (Optional[int]): Kernel receive buffer size of the subscriber socket in bytes, None keeps the OS default.
+        io_threads (int): Number of I/O threads of the ZeroMQ context.
+        multipart (bool): Send the header and the payload as two frames, the payload frame without copy in
+            zero-copy mode.
+        sweep (Dict[str, list]): Values to sweep for some of the settings above (endpoint, a key of ZMQ_ENDPOINTS,
+            pattern, send_hwm, receive_hwm, send_buffer, receive_buffer, io_threads, multipart);
+            every combination is run.
+    """
+    publisher_address: str = "tcp://0.0.0.0:5555"
+    subscriber_address: str = "tcp://127.0.0.1:5555"
+    reply_publisher_address: str = "tcp://0.0.0.0:5556"
+    reply_subscriber_address: str = "tcp://127.0.0.1:5556"
+    pattern: str = "pubsub"
+    send_hwm: Optional[int] = None
+    receive_hwm: Optional[int] = None
+    send_buffer: Optional[int] = None
+    receive_buffer: Optional[int] = None
+    io_threads: int = 1
+    multipart: bool = False
+    sweep: Dict[str, list] = field(default_factory=dict)
+
+
+@dataclass
+class ZenohConfig:
+    """
+    Zenoh transport settings.
+
+    Attributes:
+        key (str): Key expression the messages are published on.
+        reply_key (str): Key expression the echo responder replies on in ping-pong mode.
+        shared_memory (bool): Enable the shared memory transport of the sessions and publish from a shared memory
+            pool, so same-host subscribers map the payload instead of receiving it over a socket, then copy it out.
+        shm_pool_size (Optional[int]): Size of the publisher shared memory pool in bytes, None for 16 messages.
+    """
+    key: str = "demo/latency"
+    reply_key: str = "demo/latency/reply"
+    shared_memory: bool = False
+    shm_pool_size: Optional[int] = None
+
+
+@dataclass
+class DdsConfig:
+    """
+    Fast DDS transport settings.
+
+    Attributes:
+        profile (str): Participant profile name from DEFAULT_FASTRTPS_PROFILES.xml.
+        data_name (str): Name of the registered DDS data type: "BinaryMessage" (bounded octet sequence),
+            "PlainMessage" (fixed-size, zero-copy with data-sharing) or "SimpleMessage" (string).
+        topic (Optional[str]): Name of the DDS topic, defaults to the data name followed by "Topic".
+            Ping-pong replies use the same name followed by "Reply".
+        data_sharing (Optional[str]): Data-sharing mode, "automatic" or "off", None keeps the profile default.
+        reliability (Optional[str]): Reliability of the writer and reader, "reliable" or "best-effort",
+            None keeps the default.
+        history_depth (Optional[int]): KEEP_LAST history depth of the writer and reader, 0 for KEEP_ALL,
+            None keeps the default.
+        max_samples (Optional[int]): Resource limit on the samples the writer and reader hold, None keeps the default.
+        publish_mode (Optional[str]): Writer publish mode, "sync" writes from the calling thread, "async"
+            from a Fast DDS thread. None keeps the default.
+        flow_controller_rate (Optional[int]): Bytes per second of a flow controller limiting the writer,
+            which then publishes asynchronously. None for no flow controller.
+        sweep (Dict[str, list]): Values to sweep for some of the settings above (profile, data_sharing,
+            reliability, history_depth, max_samples, publish_mode, flow_controller_rate); every combination is run.
+    """
+    profile: str = "SHMParticipant"
+    data_name: str = "BinaryMessage"
+    topic: Optional[str] = None
+    data_sharing: Optional[str] = None
+    reliability: Optional[str] = None
+    history_depth: Optional[int] = None
+    max_samples: Optional[int] = None
+    publish_mode: Optional[str] = None
+    flow_controller_rate: Optional[int] = None
+    sweep: Dict[str, list] = field(default_factory=dict)
+
+
+@dataclass
+class BenchmarkConfig:
+    """
+    Workload description shared by the publisher and the subscriber side.
+
+    Attributes:
+        transports (List[str]): Transports to benchmark, run one after the other.
+        mode (str): "oneway" measures publisher to subscriber latency, "pingpong" has the subscriber
+            echo every message and measures the round-trip time on the publisher.
+        count (int): Number of messages sent per transport.
+        payload_size (int): Size of the dummy payload in bytes.
+        payload (str): Payload content: "constant" repeats a byte, "random" is incompressible, "image"
+            synthetic camera frames, "pointcloud" synthetic LiDAR sweeps, "file" replays captured data.
+        payload_variants (int): Number of distinct payloads generated ahead of time and sent in turn.
+        payload_seed (int): Seed of the random, image and point cloud generators.
+        payload_file (Optional[str]): Capture replayed by the file payload, a file cut in payload_size records,
+            or a directory or glob pattern with one payload per file.
+        image_width (int): Width in pixels of the synthetic image frames.
+        image_encoding (str): Encoding of the synthetic image frames: "raw", "jpeg" or "png" (needs OpenCV).
+        schema (Optional[str]): Typed message schema of the payloads, "image" frames or "pointcloud" sweeps:
+            the synthetic arrays are serialized with the schema and the subscriber decodes every payload
+            into `numpy.frombuffer` views. None sends the untyped payloads.
+        rate (float): Target send rate in messages per second, 0 sends back-to-back.
+        sweep_payload_sizes (List[int]): Payload sizes to sweep, empty to only use payload_size.
+        sweep_rates (List[float]): Send rates to sweep, empty to only use rate.
+        ready_timeout (float): Seconds the publisher waits for its subscribers to be ready before sending anyway.
+        startup_delay (float): Extra seconds the publisher waits once its subscribers are ready, for transports
+            without readiness signal (ZeroMQ RADIO/DISH) or to let the clock synchronization settle.
+        warmup (int): Messages sent at the configured rate before the measured ones, flagged so that the subscriber
+            does not account for them: connections, caches and buffer pools settle before the measurement.
+        warmup_detect (bool): Detect the end of the warm-up transient in the measured latencies (MSER-5)
+            and exclude the messages before it from the latency.
+        trials (int): Independent runs of every sweep point, summarized with bootstrap confidence intervals.
+        confidence (float): Confidence level of the intervals over the trials.
+        resource_interval (float): Seconds between two samples of the CPU, memory, page faults and context switches
+            of every side, 0 to disable the sampling.
+        timeout (float): Seconds the subscriber waits without traffic before giving up.
+        echo_payload (bool): Echo the full payload in ping-pong mode instead of the header only.
+        ping_timeout (float): Seconds a ping waits for its echo.
+        clock_sync (bool): Estimate the offset between the publisher and subscriber clocks with probes
+            over the benchmarked transport and correct every one-way latency, for cross-host runs.
+        clock_sync_interval (float): Seconds between two clock probes.
+        clock_sync_window (int): Number of probes per group, only the smallest round-trip of a group is kept.
+        runtime (str): Subscriber runtime: "threads" handles messages in the transport callbacks, "asyncio"
+            hands them to an event loop through bounded queues, and `subscribe` then consumes every transport at once.
+        queue_size (int): Capacity of the asyncio runtime queues, 0 for unbounded.
+        overflow_policy (str): What a full asyncio runtime queue does: "block" the receiver, "drop-oldest"
+            or "drop-newest" message.
+        processing_work (Optional[str]): Work run on every received payload: "checksum", "mean", "copy" or
+            "package.module:function", None for no processing stage.
+        processing (str): Where the work runs: "inline" in the receive callback, "threads" on a thread pool,
+            "processes" on a process pool working on shared memory slots.
+        processing_workers (int): Number of threads or processes of the processing pool.
+        processing_slots (int): Maximum number of messages handed to the pool and not processed yet.
+        publisher_id (Optional[int]): Identifier stamped in the message header, random when not set.
+        publishers (int): Number of publishers the subscriber waits for.
+        subscribers (int): Number of subscriber processes fed by the publisher when running locally,
+            and number of subscribers the publisher waits for.
+        sweep_subscribers (List[int]): Subscriber counts to sweep, empty to only use subscribers.
+        pin_cpus (bool): Pin the local publisher to the first CPU and every subscriber to its own CPU.
+        publish_mode (str): "zero-copy" patches the header of preallocated buffers in place,
+            "copy" builds a new message for every send.
+        buffer_pool_size (int): Number of preallocated message buffers in zero-copy mode.
+        chunk_size (int): Payload bytes per chunk, larger messages are split and reassembled, 0 disables chunking.
+        chunk_pipeline (int): Number of chunk buffers the publisher can have in flight.
+        reassembly_slots (int): Number of messages the subscriber can reassemble at the same time.
+        compression (Optional[str]): Codec compressing the payloads (zlib, lzma, bz2, lz4, zstd), None to disable.
+        compression_level (Optional[int]): Compression level, None for the codec default.
+        compression_min_ratio (float): Payloads compressing less than this ratio are sent uncompressed.
+        compression_link_rate (float): Link rate in bytes per second, payloads whose compression takes longer
+            than sending the saved bytes at that rate are sent uncompressed, 0 disables the check.
+        compression_probe_interval (int): Messages sent uncompressed without trying the codec after
+            a payload that was not worth compressing.
+        compression_threads (int): Number of threads compressing the payloads off the publish loop.
+        histogram_precision (int): Significant figures kept by the latency histogram (1 to 5).
+        histogram_output (Optional[str]): File the subscriber saves its latency histogram to,
+            `{transport}` is replaced by the transport name.
+        event_log (Optional[str]): File every side records its per-message events to, None to disable.
+            `{transport}`, `{role}` (publisher, subscriber or ping) and `{pid}` are replaced.
+        event_capacity (int): Number of events the file holds before overwriting the oldest ones,
+            0 to fit every message of the run.
+        results_store (Optional[str]): Directory every run is stored to, with its per-message records and
+            metadata, for `python3 -m benchmark report`. None to disable.
+        zmq (ZmqConfig): ZeroMQ specific settings.
+        zenoh (ZenohConfig): Zenoh specific settings.
+        dds (DdsConfig): Fast DDS specific settings.
+    """
+    transports: List[str] = field(default_factory=lambda: ["zmq"])
+    mode: str = "oneway"
+    count: int = DEFAULT_PACKET_COUNT
+    payload_size: int = DEFAULT_PAYLOAD_SIZE
+    payload: str = "constant"
+    payload_variants: int = 4
+    payload_seed: int = 0
+    payload_file: Optional[str] = None
+    image_width: int = 1920
+    image_encoding: str = "raw"
+    schema: Optional[str] = None
+    rate: float = 0.0
+    sweep_payload_sizes: List[int] = field(default_factory=list)
+    sweep_rates: List[float] = field(default_factory=list)
+    ready_timeout: float = 30.0
+    startup_delay: float = 0.0
+    warmup: int = 0
+    warmup_detect: bool = False
+    trials: int = 1
+    confidence: float = 0.95
+    resource_interval: float = 0.5
+    timeout: float = 30.0
+    echo_payload: bool = False
+    ping_timeout: float = 1.0
+    clock_sync: bool = False
+    clock_sync_interval: float = 0.1
+    clock_sync_window: int = 8
+    runtime: str = "threads"
+    queue_size: int = 64
+    overflow_policy: str = "block"
+    processing_work: Optional[str] = None
+    processing: str = "threads"
+    processing_workers: int = 4
+    processing_slots: int = 8
+    publisher_id: Optional[int] = None
+    publishers: int = 1
+    subscribers: int = 1
+    sweep_subscribers: List[int] = field(default_factory=list)
+    pin_cpus: bool = False
+    publish_mode: str = "zero-copy"
+    buffer_pool_size: int = 4
+    chunk_size: int = 0
+    chunk_pipeline: int = 8
+    reassembly_slots: int = 4
+    compression: Optional[str] = None
+    compression_level: Optional[int] = None
+    compression_min_ratio: float = 1.1
+    compression_link_rate: float = 0.0
+    compression_probe_interval: int = 16
+    compression_threads: int = 2
+    histogram_precision: int = 3
+    histogram_output: Optional[str] = None
+    event_log: Optional[str] = None
+    event_capacity: int = 0
+    results_store: Optional[str] = None
+    zmq: ZmqConfig = field(default_factory=ZmqConfig)
+    zenoh: ZenohConfig = field(default_factory=ZenohConfig)
+    dds: DdsConfig = field(default_factory=DdsConfig)
+
+    @classmethod
+    def from_dict(cls, values: dict) -> "BenchmarkConfig":
+        """
+        Build a configuration from a (possibly partial) dictionary.
+
+        :param values: Dictionary with the same layout as the dataclass, e.g. {"count": 10, "zmq": {...}}.
+        :return: The benchmark configuration.
+        """
+        config = cls()
+        update(config, values)
+        return config
+
+    @classmethod
+    def from_file(cls, path: str) -> "BenchmarkConfig":
+        """
+        Load a configuration from a JSON file.
+
+        :param path: Path of the JSON configuration file.
+        :return: The benchmark configuration.
+        """
+        with open(path, "r") as config_file:
+            return cls.from_dict(json.load(config_file))
+
+
+def update(config, values: dict) -> None:
+    """
+    Recursively update a configuration dataclass in place from a dictionary.
+
+    :param config: The configuration dataclass instance to update.
+    :param values: The values to apply, nested dataclasses are given as nested dictionaries.
+    """
+    known = {f.name for f in fields(config)}
+    for name, value in values.items():
+        if name not in known:
+            raise ValueError(f"Unknown configuration option '{name}' for {type(config).__name__}")
+        current = getattr(config, name)
+        if is_dataclass(current) and isinstance(value, dict):
+            update(current, value)
+        else:
+            setattr(config, name, value)
+
+
+def parse_size(text: str) -> int:
+    """
+    Parse a size in bytes with an optional binary unit suffix, e.g. "512", "64K", "4M", "1G".
+
+    :param text: The size.
+    :return: The size in bytes.
+    """
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+    text = text.strip().upper().rstrip("B")
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
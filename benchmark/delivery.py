@@ -0,0 +1,223 @@
+import threading
+from typing import Dict, List, Optional
+
+
+class StreamTracker:
+    """
+    Sequence accounting for the messages of a single publisher.
+
+    Only the highest sequence seen and the set of outstanding gaps are kept, so memory
+    grows with the number of missing messages rather than with the number received.
+
+    Attributes:
+        expected (Optional[int]): Number of messages the publisher sends, when known.
+        highest (int): Highest sequence number received so far, -1 before the first message.
+        missing (set): Sequence numbers skipped over that have not arrived yet.
+        delivered (int): Number of distinct messages received.
+        duplicates (int): Messages received more than once.
+        out_of_order (int): Messages received after a higher sequence number.
+        gaps (int): Number of jumps in the sequence, each one possibly spanning several messages.
+        payload_bytes (int): Payload bytes of the distinct messages received.
+        first_send_ns (Optional[int]): Send timestamp of the first message received.
+        last_receive_ns (Optional[int]): Receive timestamp of the last message received.
+    """
+
+    def __init__(self, expected: Optional[int] = None) -> None:
+        """
+        Initialize the tracker.
+
+        :param expected: Number of messages the publisher sends, when known.
+        """
+        self.expected = expected
+        self.highest = -1
+        self.missing = set()
+        self.delivered = 0
+        self.duplicates = 0
+        self.out_of_order = 0
+        self.gaps = 0
+        self.payload_bytes = 0
+        self.first_send_ns = None
+        self.last_receive_ns = None
+
+    def record(self, sequence: int, payload_length: int, send_ns: int, receive_ns: int) -> bool:
+        """
+        Account for a received message.
+
+        :param sequence: The message sequence number.
+        :param payload_length: The payload size in bytes.
+        :param send_ns: The send timestamp in nanoseconds.
+        :param receive_ns: The receive timestamp in nanoseconds.
+        :return: False if the message is a duplicate, True otherwise.
+        """
+        if sequence > self.highest:
+            if sequence > self.highest + 1:
+                self.gaps += 1
+                self.missing.update(range(self.highest + 1, sequence))
+            self.highest = sequence
+        elif sequence in self.missing:
+            self.missing.remove(sequence)
+            self.out_of_order += 1
+        else:
+            self.duplicates += 1
+            return False
+
+        self.delivered += 1
+        self.payload_bytes += payload_length
+        if self.first_send_ns is None or send_ns < self.first_send_ns:
+            self.first_send_ns = send_ns
+        self.last_receive_ns = receive_ns
+        return True
+
+    def complete(self) -> bool:
+        """
+        :return: True once the last expected message arrived.
+        """
+        return self.expected is not None and self.highest >= self.expected - 1
+
+    def sent(self) -> int:
+        """
+        :return: Number of messages the publisher sent, as far as the subscriber can tell.
+        """
+        if self.expected is not None:
+            return max(self.expected, self.highest + 1)
+        return self.highest + 1
+
+    def lost(self) -> int:
+        """
+        :return: Number of messages that never arrived, including the ones after the highest received.
+        """
+        return self.sent() - self.delivered
+
+    def delivered_ratio(self) -> float:
+        """
+        :return: Fraction of the sent messages that were delivered.
+        """
+        sent = self.sent()
+        return self.delivered / sent if sent else 0.0
+
+    def duration(self) -> float:
+        """
+        :return: Seconds from the first send to the last receive, 0 before any message.
+        """
+        if self.first_send_ns is None or self.last_receive_ns <= self.first_send_ns:
+            return 0.0
+        return (self.last_receive_ns - self.first_send_ns) / 1e9
+
+    def goodput(self) -> float:
+        """
+        :return: Delivered payload bytes per second, from the first send to the last receive.
+        """
+        duration = self.duration()
+        return self.payload_bytes / duration if duration else 0.0
+
+    def message_rate(self) -> float:
+        """
+        :return: Delivered messages per second, from the first send to the last receive.
+        """
+        duration = self.duration()
+        return self.delivered / duration if duration else 0.0
+
+    def report(self) -> None:
+        """
+        Print the delivery statistics of the stream.
+        """
+        print(f"Delivered: {self.delivered}/{self.sent()} ({self.delivered_ratio() * 100:.2f}%), "
+              f"Lost: {self.lost()}, Duplicates: {self.duplicates}, "
+              f"Out of order: {self.out_of_order}, Gaps: {self.gaps}")
+        print(f"Goodput: {self.goodput() / 1e6:.2f} MB/s")
+
+
+class DeliveryStatistics:
+    """
+    Delivery accounting for every publisher seen by a subscriber.
+
+    Attributes:
+        expected (Optional[int]): Number of messages each publisher sends, when known.
+        streams (Dict[int, StreamTracker]): Tracker of each publisher, by publisher id.
+    """
+
+    def __init__(self, expected: Optional[int] = None) -> None:
+        """
+        Initialize the delivery statistics.
+
+        :param expected: Number of messages each publisher sends, when known.
+        """
+        self.expected = expected
+        self.streams: Dict[int, StreamTracker] = {}
+        self._lock = threading.Lock()
+
+    def record(self, publisher_id: int, sequence: int, payload_length: int, send_ns: int, receive_ns: int) -> bool:
+        """
+        Account for a received message.
+
+        :param publisher_id: The identifier of the publisher that sent the message.
+        :param sequence: The message sequence number.
+        :param payload_length: The payload size in bytes.
+        :param send_ns: The send timestamp in nanoseconds.
+        :param receive_ns: The receive timestamp in nanoseconds.
+        :return: False if the message is a duplicate, True otherwise.
+        """
+        with self._lock:
+            stream = self.streams.get(publisher_id)
+            if stream is None:
+                stream = self.streams[publisher_id] = StreamTracker(self.expected)
+            return stream.record(sequence, payload_length, send_ns, receive_ns)
+
+    def delivered(self) -> int:
+        """
+        :return: Number of distinct messages received from all publishers.
+        """
+        return sum(stream.delivered for stream in self.streams.values())
+
+    def complete(self, publishers: int = 1) -> bool:
+        """
+        :param publishers: Number of publishers expected.
+        :return: True once the last message of every expected publisher arrived.
+        """
+        return len(self.streams) >= publishers and all(stream.complete() for stream in self.streams.values())
+
+    def summary(self) -> dict:
+        """
+        :return: Delivery totals over every publisher, rates are summed.
+        """
+        streams = list(self.streams.values())
+        sent = sum(stream.sent() for stream in streams) or (self.expected or 0)
+        delivered = sum(stream.delivered for stream in streams)
+        return {
+            "publishers": len(streams),
+            "sent": sent,
+            "delivered": delivered,
+            "lost": sent - delivered,
+            "duplicates": sum(stream.duplicates for stream in streams),
+            "out_of_order": sum(stream.out_of_order for stream in streams),
+            "delivered_ratio": delivered / sent if sent else 0.0,
+            "goodput": sum(stream.goodput() for stream in streams),
+            "message_rate": sum(stream.message_rate() for stream in streams),
+        }
+
+    def report(self) -> None:
+        """
+        Print the delivery statistics of every publisher.
+        """
+        if not self.streams:
+            print(f"Delivered: 0/{self.expected or 0}")
+            return
+        for publisher_id, stream in sorted(self.streams.items()):
+            print(f"Publisher {publisher_id:08x}:")
+            stream.report()
+
+
+def combine_summaries(summaries: List[dict]) -> dict:
+    """
+    Combine the delivery summaries of several subscribers of the same stream.
+    Counts and goodput are summed, the message rate is the one of the slowest subscriber.
+
+    :param summaries: Summaries produced by DeliveryStatistics.summary.
+    :return: The combined summary.
+    """
+    combined = {name: sum(summary[name] for summary in summaries)
+                for name in ("sent", "delivered", "lost", "duplicates", "out_of_order", "goodput")}
+    combined["publishers"] = max(summary["publishers"] for summary in summaries)
+    combined["delivered_ratio"] = combined["delivered"] / combined["sent"] if combined["sent"] else 0.0
+    combined["message_rate"] = min(summary["message_rate"] for summary in summaries)
+    return combined
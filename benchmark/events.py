@@ -0,0 +1,195 @@
+import csv
+import itertools
+import mmap
+import os
+import struct
+import sys
+from enum import IntEnum
+from typing import Iterator, NamedTuple, Optional, Tuple
+
+# File header: magic, format version, event record size, capacity in events, events recorded
+FILE_HEADER = struct.Struct("<4sHHQQ")
+FILE_MAGIC = b"BMEV"
+FILE_VERSION = 1
+# Event record, little endian: kind (B), message flags (B), padding (2x), publisher id (I), sequence (Q),
+# message timestamp in ns (q), event time in ns (q), message size in bytes (I), padding (4x)
+EVENT = struct.Struct("<BBxxIQqqI4x")
+
+
+class EventKind(IntEnum):
+    """
+    Kind of a recorded event.
+    """
+    # Message sent: the timestamp is the intended send time, the event time the actual one
+    SENT = 0
+    # Message received: the timestamp is the send time on the local clock, the event time the receive time
+    RECEIVED = 1
+    # Message received again, not accounted for
+    DUPLICATE = 2
+    # Echo of a ping received: both times are `time.perf_counter_ns()` of the originator
+    ROUND_TRIP = 3
+
+
+class Event(NamedTuple):
+    """
+    Decoded event record.
+
+    Attributes:
+        kind (EventKind): The event kind.
+        flags (int): Flags of the message.
+        publisher_id (int): Identifier of the publisher of the message.
+        sequence (int): Sequence number of the message.
+        timestamp_ns (int): Time carried by the message, see EventKind.
+        event_ns (int): Time of the event, see EventKind.
+        size (int): Size of the message in bytes.
+    """
+    kind: EventKind
+    flags: int
+    publisher_id: int
+    sequence: int
+    timestamp_ns: int
+    event_ns: int
+    size: int
+
+
+class EventLog:
+    """
+    Lossless per-message event recording, off the terminal.
+
+    Events are fixed-size binary records written into a preallocated memory-mapped file, so recording one
+    costs a struct pack into memory; the kernel writes the pages back in the background and `close` only
+    updates the file header. The file is a ring of `capacity` records: once full, the oldest events are
+    overwritten. Render the file afterwards with `python3 -m benchmark events`.
+
+    Attributes:
+        path (str): The event file.
+        capacity (int): Number of records the file holds.
+    """
+
+    def __init__(self, path: str, capacity: int) -> None:
+        """
+        Create the event file.
+
+        :param path: The event file.
+        :param capacity: Number of records the file holds.
+        """
+        self.path = path
+        self.capacity = max(capacity, 1)
+        size = FILE_HEADER.size + self.capacity * EVENT.size
+        self._file = open(path, "w+b")
+        self._file.truncate(size)
+        self._map = mmap.mmap(self._file.fileno(), size)
+        FILE_HEADER.pack_into(self._map, 0, FILE_MAGIC, FILE_VERSION, EVENT.size, self.capacity, 0)
+        # Taking the next index is atomic, the transports may call back from several threads
+        self._next = itertools.count()
+
+    def record(self, kind: EventKind, flags: int, publisher_id: int, sequence: int,
+               timestamp_ns: int, event_ns: int, size: int) -> None:
+        """
+        Record an event.
+
+        :param kind: The event kind.
+        :param flags: Flags of the message.
+        :param publisher_id: Identifier of the publisher of the message.
+        :param sequence: Sequence number of the message.
+        :param timestamp_ns: Time carried by the message, see EventKind.
+        :param event_ns: Time of the event, see EventKind.
+        :param size: Size of the message in bytes.
+        """
+        index = next(self._next) % self.capacity
+        EVENT.pack_into(self._map, FILE_HEADER.size + index * EVENT.size,
+                        kind, flags, publisher_id, sequence, timestamp_ns, event_ns, size)
+
+    def close(self) -> None:
+        """
+        Write the number of recorded events and close the file.
+        """
+        recorded = next(self._next)
+        FILE_HEADER.pack_into(self._map, 0, FILE_MAGIC, FILE_VERSION, EVENT.size, self.capacity, recorded)
+        self._map.flush()
+        self._map.close()
+        self._file.close()
+        overwritten = max(recorded - self.capacity, 0)
+        print(f"{recorded} events saved to {self.path}" + (f" ({overwritten} oldest overwritten)" if overwritten else ""))
+
+
+def open_event_log(config, transport: str, role: str, capacity: int) -> Optional[EventLog]:
+    """
+    Create the event file of a benchmark side, if `config.event_log` is set.
+
+    :param config: The benchmark configuration.
+    :param transport: The transport name.
+    :param role: The side recording the events: "publisher", "subscriber" or "ping".
+    :param capacity: Number of events the side records without overwriting, used unless
+        `config.event_capacity` is set.
+    :return: The event log, None if disabled.
+    """
+    if not config.event_log:
+        return None
+    path = config.event_log.format(transport=transport, role=role, pid=os.getpid())
+    return EventLog(path, config.event_capacity or capacity)
+
+
+def read_events(path: str) -> Tuple[int, Iterator[Event]]:
+    """
+    Read an event file.
+
+    :param path: The event file.
+    :return: The number of events recorded, and the events still in the file, oldest first.
+    """
+    with open(path, "rb") as source:
+        data = source.read()
+    magic, version, record_size, capacity, recorded = FILE_HEADER.unpack_from(data)
+    if magic != FILE_MAGIC or version != FILE_VERSION or record_size != EVENT.size:
+        raise ValueError(f"{path} is not an event file of this version")
+
+    records = memoryview(data)[FILE_HEADER.size:FILE_HEADER.size + capacity * EVENT.size]
+    if recorded > capacity:
+        # The ring wrapped, the oldest event follows the last one written
+        start = (recorded % capacity) * EVENT.size
+        chunks = (records[start:], records[:start])
+    else:
+        chunks = (records[:recorded * EVENT.size],)
+    events = (Event(EventKind(kind), *fields)
+              for chunk in chunks for kind, *fields in EVENT.iter_unpack(chunk))
+    return recorded, events
+
+
+def _describe(event: Event) -> str:
+    """
+    :param event: An event.
+    :return: The human-readable log line of the event.
+    """
+    delay_ms = (event.event_ns - event.timestamp_ns) / 1e6
+    if event.kind == EventKind.SENT:
+        return (f"Sent packet: Publisher {event.publisher_id:08x}, Seq {event.sequence}, Size {event.size}, "
+                f"Lag = {delay_ms:.2f} ms")
+    if event.kind == EventKind.RECEIVED:
+        return (f"Received packet: Publisher {event.publisher_id:08x}, Seq {event.sequence}, Size {event.size}, "
+                f"Latency = {delay_ms:.2f} ms")
+    if event.kind == EventKind.DUPLICATE:
+        return f"Duplicate packet: Publisher {event.publisher_id:08x}, Seq {event.sequence}"
+    return f"Ping {event.sequence + 1}: RTT = {delay_ms:.2f} ms"
+
+
+def render_events(path: str, as_csv: bool = False) -> None:
+    """
+    Print the events of an event file, as log lines or as CSV.
+
+    :param path: The event file.
+    :param as_csv: Print CSV rows with the raw fields instead of log lines.
+    """
+    recorded, events = read_events(path)
+    if as_csv:
+        writer = csv.writer(sys.stdout)
+        writer.writerow(Event._fields)
+        for event in events:
+            writer.writerow((event.kind.name.lower(), *event[1:]))
+        return
+
+    count = 0
+    for event in events:
+        print(_describe(event))
+        count += 1
+    if recorded > count:
+        print(f"{recorded - count} older events were overwritten, use a larger --event-capacity")
@@ -0,0 +1,301 @@
+import json
+import math
+from array import array
+from typing import Dict, Iterable, Optional
+
+# Percentiles printed in every report
+REPORT_PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+class LatencyHistogram:
+    """
+    HDR-style histogram of integer values (nanoseconds), with a fixed number of significant figures.
+
+    Memory is allocated once from the trackable range and precision, so recording is a constant
+    time index computation and an increment, regardless of how many samples are recorded.
+    Values outside [0, highest_trackable] are clamped and counted in `clamped`.
+
+    Attributes:
+        lowest_discernible (int): Smallest value distinguishable from 0.
+        highest_trackable (int): Largest value that can be recorded.
+        significant_figures (int): Number of significant decimal digits kept for every value.
+        counts (array): Sample count of each bucket.
+        total (int): Number of recorded samples.
+        minimum (Optional[int]): Smallest recorded value.
+        maximum (Optional[int]): Largest recorded value.
+        clamped (int): Number of samples that were out of range.
+    """
+
+    def __init__(self, lowest_discernible: int = 1, highest_trackable: int = 60 * 10**9,
+                 significant_figures: int = 3) -> None:
+        """
+        Initialize an empty histogram.
+
+        :param lowest_discernible: Smallest value distinguishable from 0, at least 1.
+        :param highest_trackable: Largest value that can be recorded, at least twice lowest_discernible.
+        :param significant_figures: Precision of the recorded values, between 1 and 5.
+        """
+        if lowest_discernible < 1:
+            raise ValueError("lowest_discernible must be at least 1")
+        if highest_trackable < 2 * lowest_discernible:
+            raise ValueError("highest_trackable must be at least twice lowest_discernible")
+        if not 1 <= significant_figures <= 5:
+            raise ValueError("significant_figures must be between 1 and 5")
+
+        self.lowest_discernible = lowest_discernible
+        self.highest_trackable = highest_trackable
+        self.significant_figures = significant_figures
+
+        largest_single_unit = 2 * 10**significant_figures
+        self._unit_magnitude = int(math.floor(math.log2(lowest_discernible)))
+        sub_bucket_count_magnitude = int(math.ceil(math.log2(largest_single_unit)))
+        self._sub_bucket_half_count_magnitude = max(sub_bucket_count_magnitude, 1) - 1
+        self._sub_bucket_count = 1 << (self._sub_bucket_half_count_magnitude + 1)
+        self._sub_bucket_half_count = self._sub_bucket_count // 2
+        self._sub_bucket_mask = (self._sub_bucket_count - 1) << self._unit_magnitude
+
+        bucket_count = 1
+        smallest_untrackable = self._sub_bucket_count << self._unit_magnitude
+        while smallest_untrackable <= highest_trackable:
+            smallest_untrackable <<= 1
+            bucket_count += 1
+
+        self.counts = array("Q", bytes(8 * (bucket_count + 1) * self._sub_bucket_half_count))
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Remove every recorded sample.
+        """
+        self.counts = array("Q", bytes(8 * len(self.counts)))
+        self.total = 0
+        self.minimum = None
+        self.maximum = None
+        self.clamped = 0
+        self._sum = 0
+        self._sum_squares = 0
+
+    def _index(self, value: int) -> int:
+        """
+        :param value: A value in the trackable range.
+        :return: The index of the bucket counting the value.
+        """
+        bucket_index = ((value | self._sub_bucket_mask).bit_length() - self._unit_magnitude
+                        - (self._sub_bucket_half_count_magnitude + 1))
+        sub_bucket_index = value >> (bucket_index + self._unit_magnitude)
+        return ((bucket_index + 1) << self._sub_bucket_half_count_magnitude) + (sub_bucket_index - self._sub_bucket_half_count)
+
+    def _value(self, index: int) -> int:
+        """
+        :param index: A bucket index.
+        :return: The highest value counted by the bucket.
+        """
+        bucket_index = (index >> self._sub_bucket_half_count_magnitude) - 1
+        sub_bucket_index = (index & (self._sub_bucket_half_count - 1)) + self._sub_bucket_half_count
+        if bucket_index < 0:
+            sub_bucket_index -= self._sub_bucket_half_count
+            bucket_index = 0
+        lowest = sub_bucket_index << (bucket_index + self._unit_magnitude)
+        return lowest + (1 << (bucket_index + self._unit_magnitude)) - 1
+
+    def record(self, value: int, count: int = 1) -> None:
+        """
+        Record a value.
+
+        :param value: The value, in nanoseconds when recording latencies.
+        :param count: Number of times the value occurred.
+        """
+        value = int(value)
+        if value < 0 or value > self.highest_trackable:
+            self.clamped += count
+            value = min(max(value, 0), self.highest_trackable)
+
+        self.counts[self._index(value)] += count
+        self.total += count
+        self._sum += value * count
+        self._sum_squares += value * value * count
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """
+        Add the samples of another histogram with the same settings to this one.
+
+        :param other: The histogram to merge.
+        """
+        if (other.lowest_discernible, other.highest_trackable, other.significant_figures) != \
+                (self.lowest_discernible, self.highest_trackable, self.significant_figures):
+            raise ValueError("Only histograms with the same range and precision can be merged")
+        if other.total == 0:
+            return
+
+        for index, count in enumerate(other.counts):
+            if count:
+                self.counts[index] += count
+        self.total += other.total
+        self.clamped += other.clamped
+        self._sum += other._sum
+        self._sum_squares += other._sum_squares
+        self.minimum = other.minimum if self.minimum is None else min(self.minimum, other.minimum)
+        self.maximum = other.maximum if self.maximum is None else max(self.maximum, other.maximum)
+
+    def with_settings(self, lowest_discernible: int, highest_trackable: int,
+                      significant_figures: int) -> "LatencyHistogram":
+        """
+        Convert the histogram to other settings, e.g. to merge histograms recorded with different precisions.
+        Every bucket is recorded again at its highest value, the exact moments and extremes are kept.
+
+        :param lowest_discernible: Smallest value distinguishable from 0 of the converted histogram.
+        :param highest_trackable: Largest value that can be recorded in the converted histogram.
+        :param significant_figures: Precision of the converted histogram.
+        :return: The converted histogram, this one if the settings are the same.
+        """
+        if (lowest_discernible, highest_trackable, significant_figures) == \
+                (self.lowest_discernible, self.highest_trackable, self.significant_figures):
+            return self
+        converted = LatencyHistogram(lowest_discernible, highest_trackable, significant_figures)
+        for index, count in enumerate(self.counts):
+            if count:
+                converted.record(min(self._value(index), self.maximum), count)
+        converted.clamped += self.clamped
+        converted._sum, converted._sum_squares = self._sum, self._sum_squares
+        converted.minimum, converted.maximum = self.minimum, self.maximum
+        return converted
+
+    def mean(self) -> float:
+        """
+        :return: The exact mean of the recorded values.
+        """
+        return self._sum / self.total if self.total else 0.0
+
+    def variance(self) -> float:
+        """
+        :return: The exact population variance of the recorded values.
+        """
+        if not self.total:
+            return 0.0
+        mean = self.mean()
+        return max(self._sum_squares / self.total - mean * mean, 0.0)
+
+    def stddev(self) -> float:
+        """
+        :return: The exact population standard deviation of the recorded values.
+        """
+        return math.sqrt(self.variance())
+
+    def percentile(self, percentile: float) -> int:
+        """
+        :param percentile: The percentile, between 0 and 100.
+        :return: The value below or at which the given percentage of samples fall,
+                 within the histogram precision.
+        """
+        if not self.total:
+            return 0
+        target = max(int(math.ceil(percentile / 100.0 * self.total)), 1)
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= target:
+                return min(self._value(index), self.maximum)
+        return self.maximum
+
+    def percentiles(self, percentiles: Iterable[float] = REPORT_PERCENTILES) -> Dict[float, int]:
+        """
+        :param percentiles: The percentiles to compute.
+        :return: The value of each percentile.
+        """
+        return {percentile: self.percentile(percentile) for percentile in percentiles}
+
+    def report(self, unit: float = 1e6, unit_name: str = "ms", label: str = "Latency") -> None:
+        """
+        Print the summary of the recorded values.
+
+        :param unit: Divisor converting the recorded values to the printed unit.
+        :param unit_name: Name of the printed unit.
+        :param label: Name of the recorded quantity.
+        """
+        if not self.total:
+            print("No packets received.")
+            return
+
+        print(f"Samples: {self.total}")
+        print(f"Average {label}: {self.mean() / unit:.2f} {unit_name}")
+        print(f"Std Dev {label}: {self.stddev() / unit:.2f} {unit_name}")
+        print(f"Min {label}: {self.minimum / unit:.2f} {unit_name}")
+        for percentile, value in self.percentiles().items():
+            print(f"p{percentile:g} {label}: {value / unit:.2f} {unit_name}")
+        print(f"Max {label}: {self.maximum / unit:.2f} {unit_name}")
+        if self.clamped:
+            print(f"Out of range samples: {self.clamped}")
+
+    def to_dict(self) -> dict:
+        """
+        :return: A JSON serializable representation, only non empty buckets are kept.
+        """
+        return {
+            "lowest_discernible": self.lowest_discernible,
+            "highest_trackable": self.highest_trackable,
+            "significant_figures": self.significant_figures,
+            "total": self.total,
+            "minimum": self.minimum,
+            "maximum": self.maximum,
+            "clamped": self.clamped,
+            "sum": self._sum,
+            "sum_squares": self._sum_squares,
+            "counts": [[index, count] for index, count in enumerate(self.counts) if count],
+        }
+
+    @classmethod
+    def from_dict(cls, values: dict) -> "LatencyHistogram":
+        """
+        :param values: A representation produced by to_dict.
+        :return: The histogram.
+        """
+        histogram = cls(values["lowest_discernible"], values["highest_trackable"], values["significant_figures"])
+        for index, count in values["counts"]:
+            histogram.counts[index] = count
+        histogram.total = values["total"]
+        histogram.minimum = values["minimum"]
+        histogram.maximum = values["maximum"]
+        histogram.clamped = values["clamped"]
+        histogram._sum = values["sum"]
+        histogram._sum_squares = values["sum_squares"]
+        return histogram
+
+    def save(self, path: str) -> None:
+        """
+        Write the histogram to a JSON file.
+
+        :param path: Path of the output file.
+        """
+        with open(path, "w") as output_file:
+            json.dump(self.to_dict(), output_file)
+
+    @classmethod
+    def load(cls, path: str) -> "LatencyHistogram":
+        """
+        Read a histogram written by save.
+
+        :param path: Path of the histogram file.
+        :return: The histogram.
+        """
+        with open(path, "r") as input_file:
+            return cls.from_dict(json.load(input_file))
+
+
+def merge(histograms: Iterable[LatencyHistogram]) -> Optional[LatencyHistogram]:
+    """
+    Merge several histograms with the same settings into a new one.
+
+    :param histograms: The histograms to merge.
+    :return: The merged histogram, None if no histogram was given.
+    """
+    merged = None
+    for histogram in histograms:
+        if merged is None:
+            merged = LatencyHistogram(histogram.lowest_discernible, histogram.highest_trackable,
+                                      histogram.significant_figures)
+        merged.merge(histogram)
+    return merged
@@ -0,0 +1,234 @@
+import struct
+import time
+from enum import IntFlag
+from typing import List, NamedTuple, Optional, Sequence, Tuple, Union
+
+# Fixed-width header prepended to every message, little endian:
+# magic (H), version (B), flags (B), payload length (I), publisher id (I), padding (4x),
+# sequence (Q), send timestamp in ns (Q)
+HEADER = struct.Struct("<HBBII4xQQ")
+HEADER_SIZE = HEADER.size
+MAGIC = 0x4D42  # "BM"
+VERSION = 2
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+class Flags(IntFlag):
+    """
+    Per-message flags carried in the header.
+    """
+    NONE = 0
+    # Ping-pong request, the timestamp is the originator's time.perf_counter_ns()
+    PING = 1 << 0
+    # Ping-pong reply, echoing the header of a ping
+    ECHO = 1 << 1
+    # Clock offset probe from a subscriber, the timestamp is the subscriber's send time
+    CLOCK_PROBE = 1 << 2
+    # Answer to a clock probe, echoing its timestamp, the payload carries the publisher's receive and send times
+    CLOCK_REPLY = 1 << 3
+    # Chunk of a larger message, the payload starts with a chunk header
+    CHUNK = 1 << 4
+    # The payload is compressed with the configured codec
+    COMPRESSED = 1 << 5
+    # End of stream: the publisher sent its last message, the sequence is the number of messages sent
+    END = 1 << 6
+    # Warm-up message sent before the measured ones, not accounted for; sequences restart at 0 after the warm-up
+    WARMUP = 1 << 7
+
+
+class MessageHeader(NamedTuple):
+    """
+    Decoded message header.
+
+    Attributes:
+        flags (int): Per-message flags.
+        payload_length (int): Payload size in bytes.
+        publisher_id (int): Identifier of the publisher that sent the message.
+        sequence (int): Sequence number assigned by the publisher.
+        timestamp_ns (int): Send timestamp, `time.time_ns()` on the publisher.
+    """
+    flags: int
+    payload_length: int
+    publisher_id: int
+    sequence: int
+    timestamp_ns: int
+
+
+def generate_payload(size: int) -> bytes:
+    """
+    Generate the dummy payload carried by every message.
+
+    :param size: Payload size in bytes.
+    :return: The dummy payload.
+    """
+    return b"x" * size
+
+
+def pack_header(buffer: Buffer, publisher_id: int, sequence: int, payload_length: int,
+                flags: int = Flags.NONE, timestamp_ns: Optional[int] = None) -> None:
+    """
+    Write a header at the start of a writable buffer.
+
+    :param buffer: The writable buffer, at least HEADER_SIZE bytes long.
+    :param publisher_id: The publisher identifier.
+    :param sequence: The sequence number.
+    :param payload_length: The payload size in bytes.
+    :param flags: The message flags.
+    :param timestamp_ns: The send timestamp, defaults to now.
+    """
+    if timestamp_ns is None:
+        timestamp_ns = time.time_ns()
+    HEADER.pack_into(buffer, 0, MAGIC, VERSION, flags, payload_length, publisher_id, sequence, timestamp_ns)
+
+
+def encode(publisher_id: int, sequence: int, payload: Buffer, flags: int = Flags.NONE,
+           timestamp_ns: Optional[int] = None) -> bytes:
+    """
+    Build a message by prefixing the payload with a header.
+
+    :param publisher_id: The publisher identifier.
+    :param sequence: The sequence number.
+    :param payload: The payload.
+    :param flags: The message flags.
+    :param timestamp_ns: The send timestamp, defaults to now.
+    :return: The message (header + payload).
+    """
+    header = bytearray(HEADER_SIZE)
+    pack_header(header, publisher_id, sequence, len(payload), flags, timestamp_ns)
+    return bytes(header) + payload
+
+
+class Parts:
+    """
+    Message received as separate header and payload buffers, such as the two frames of a ZeroMQ
+    multipart message, decoded and measured without joining them.
+
+    Attributes:
+        header (Buffer): The header bytes.
+        payload (Buffer): The payload bytes.
+    """
+
+    def __init__(self, header: Buffer, payload: Buffer) -> None:
+        self.header = header
+        self.payload = payload
+
+    def __len__(self) -> int:
+        return len(self.header) + len(self.payload)
+
+    def __bytes__(self) -> bytes:
+        return bytes(self.header) + bytes(self.payload)
+
+
+def decode(message: Union[Buffer, Parts]) -> Tuple[MessageHeader, memoryview]:
+    """
+    Parse the header of a received message without copying the payload.
+
+    :param message: The received message.
+    :return: The header and a view over the payload.
+    """
+    if isinstance(message, Parts):
+        view, body = memoryview(message.header), memoryview(message.payload)
+        available = len(body)
+    else:
+        view = body = memoryview(message)
+        available = len(view) - HEADER_SIZE
+    if len(view) < HEADER_SIZE:
+        raise ValueError(f"Message of {len(view)} bytes is shorter than the {HEADER_SIZE} bytes header")
+
+    magic, version, flags, payload_length, publisher_id, sequence, timestamp_ns = HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise ValueError(f"Invalid message magic 0x{magic:04x}")
+    if version != VERSION:
+        raise ValueError(f"Unsupported message version {version}")
+    if payload_length > available:
+        raise ValueError(f"Truncated message: header announces {payload_length} payload bytes, "
+                         f"got {available}")
+
+    header = MessageHeader(flags, payload_length, publisher_id, sequence, timestamp_ns)
+    start = 0 if body is not view else HEADER_SIZE
+    return header, body[start:start + payload_length]
+
+
+def copy_into(buffer: Buffer, message: Union[Buffer, Parts]) -> None:
+    """
+    Copy a received message at the start of a writable buffer.
+
+    :param buffer: The writable buffer, at least `len(message)` bytes long.
+    :param message: The received message.
+    """
+    if isinstance(message, Parts):
+        buffer[:len(message.header)] = message.header
+        buffer[len(message.header):len(message)] = message.payload
+    else:
+        buffer[:len(message)] = message
+
+
+class MessagePool:
+    """
+    Ring of preallocated message buffers holding a copy of a payload after room for the header.
+
+    Publishing from the pool only rewrites the header in place, the payload is never copied again.
+    A transport that keeps a reference to the buffer after sending returns a guard with a `wait()`
+    method, the buffer is reused only once that guard completes.
+
+    Attributes:
+        buffers (List[bytearray]): The message buffers (header + payload).
+        guards (List): Release guard of each buffer, None when the buffer is free.
+    """
+
+    def __init__(self, payloads: Sequence[Buffer], size: int = 4) -> None:
+        """
+        Allocate the buffers and copy a payload into each of them once, cycling through the payloads.
+
+        :param payloads: The payloads carried by the messages, in sending order.
+        :param size: Minimum number of buffers in the ring, there is at least one buffer per payload.
+        """
+        if size < 1 or not payloads:
+            raise ValueError("The message pool needs at least one buffer and one payload")
+        self.buffers: List[bytearray] = []
+        for index in range(max(size, len(payloads))):
+            payload = payloads[index % len(payloads)]
+            buffer = bytearray(HEADER_SIZE + len(payload))
+            buffer[HEADER_SIZE:] = payload
+            self.buffers.append(buffer)
+        self.guards = [None] * len(self.buffers)
+        self._next = 0
+
+    def acquire(self) -> Tuple[int, bytearray]:
+        """
+        Take the next buffer of the ring, waiting for the transport to release it if needed.
+
+        :return: The buffer index and the buffer.
+        """
+        index = self._next
+        self._next = (index + 1) % len(self.buffers)
+        guard = self.guards[index]
+        if guard is not None:
+            guard.wait()
+            self.guards[index] = None
+        return index, self.buffers[index]
+
+    def release(self, index: int, guard=None) -> None:
+        """
+        Hand a sent buffer back to the ring.
+
+        :param index: The buffer index returned by acquire.
+        :param guard: Object whose `wait()` returns once the transport no longer uses the buffer.
+        """
+        self.guards[index] = guard
+
+    def encode(self, publisher_id: int, sequence: int, flags: int = Flags.NONE,
+               timestamp_ns: Optional[int] = None) -> Tuple[int, bytearray]:
+        """
+        Acquire a buffer and write its header.
+
+        :param publisher_id: The publisher identifier.
+        :param sequence: The sequence number.
+        :param flags: The message flags.
+        :param timestamp_ns: The send timestamp, defaults to now.
+        :return: The buffer index and the message.
+        """
+        index, buffer = self.acquire()
+        pack_header(buffer, publisher_id, sequence, len(buffer) - HEADER_SIZE, flags, timestamp_ns)
+        return index, buffer
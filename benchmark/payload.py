@@ -0,0 +1,248 @@
+import glob
+import importlib
+import mmap
+import os
+import random
+from typing import Callable, Dict, List
+
+from benchmark import message
+from benchmark.schema import IMAGE_FRAME, POINT_CLOUD, SCHEMAS
+
+# Bytes per point of the synthetic point clouds: float32 x, y, z and intensity
+POINT_SIZE = 16
+# Channels of the synthetic raw camera frames (BGR)
+IMAGE_CHANNELS = 3
+
+
+def _numpy():
+    """
+    :return: The numpy module, imported only by the generators that need it.
+    """
+    return importlib.import_module("numpy")
+
+
+def _opencv():
+    """
+    :return: The OpenCV module, None if it is not installed.
+    """
+    try:
+        return importlib.import_module("cv2")
+    except ImportError:
+        return None
+
+
+def constant_payloads(config) -> List[bytes]:
+    """
+    :param config: The benchmark configuration.
+    :return: The original dummy payload, a repeated byte.
+    """
+    return [message.generate_payload(config.payload_size)]
+
+
+def random_payloads(config) -> List[bytes]:
+    """
+    :param config: The benchmark configuration.
+    :return: `config.payload_variants` payloads of incompressible random bytes.
+    """
+    generator = random.Random(config.payload_seed)
+    return [generator.randbytes(config.payload_size) for _ in range(config.payload_variants)]
+
+
+def image_frames(config) -> list:
+    """
+    Synthetic camera frames: a lit gradient background with moving shapes and sensor noise.
+    Frames are `config.image_width` pixels wide and as high as needed to fill the payload size.
+
+    :param config: The benchmark configuration.
+    :return: `config.payload_variants` consecutive frames, uint8 height x width x BGR arrays.
+    """
+    numpy = _numpy()
+    cv2 = _opencv()
+
+    width = config.image_width
+    height = max(-(-config.payload_size // (width * IMAGE_CHANNELS)), 1)
+    rows, columns = numpy.mgrid[0:height, 0:width]
+    background = numpy.stack([columns * 255 // max(width - 1, 1),
+                              rows * 255 // max(height - 1, 1),
+                              numpy.full((height, width), 96)], axis=-1).astype(numpy.int16)
+    generator = numpy.random.default_rng(config.payload_seed)
+
+    frames = []
+    for index in range(config.payload_variants):
+        frame = background + generator.normal(0, 8, background.shape).astype(numpy.int16)
+        frame = numpy.clip(frame, 0, 255).astype(numpy.uint8)
+        # A square and a disc crossing the frame
+        x = (index * width // 16) % width
+        y = height // 3
+        size = max(min(width, height) // 6, 1)
+        if cv2 is not None:
+            cv2.rectangle(frame, (x, y), (x + size, y + size), (0, 0, 255), -1)
+            cv2.circle(frame, (width - 1 - x, 2 * height // 3), size // 2, (255, 255, 0), -1)
+        else:
+            frame[y:y + size, x:x + size] = (0, 0, 255)
+            disc = (rows - 2 * height // 3) ** 2 + (columns - (width - 1 - x)) ** 2 <= (size // 2) ** 2
+            frame[disc] = (255, 255, 0)
+        frames.append(frame)
+    return frames
+
+
+def image_payloads(config) -> List[bytes]:
+    """
+    Synthetic camera frames, see image_frames. Raw frames are cut to the payload size.
+    With `config.image_encoding` set to jpeg or png the frames are encoded with OpenCV, so their size varies.
+
+    :param config: The benchmark configuration.
+    :return: `config.payload_variants` consecutive frames.
+    """
+    cv2 = _opencv()
+    if config.image_encoding != "raw" and cv2 is None:
+        raise RuntimeError(f"The {config.image_encoding} image encoding needs OpenCV (opencv-python)")
+    payloads = []
+    for frame in image_frames(config):
+        if config.image_encoding == "raw":
+            payloads.append(frame.tobytes()[:config.payload_size])
+        else:
+            ok, encoded = cv2.imencode(f".{config.image_encoding}", frame)
+            if not ok:
+                raise RuntimeError(f"OpenCV could not encode the frame as {config.image_encoding}")
+            payloads.append(encoded.tobytes())
+    return payloads
+
+
+def pointclouds(config) -> list:
+    """
+    Synthetic LiDAR sweeps: float32 (x, y, z, intensity) points of a ground plane and a few obstacles,
+    with range noise, as many points as fit in the payload size.
+
+    :param config: The benchmark configuration.
+    :return: `config.payload_variants` consecutive sweeps, points x 4 float32 arrays.
+    """
+    numpy = _numpy()
+    generator = numpy.random.default_rng(config.payload_seed)
+    count = max(config.payload_size // POINT_SIZE, 1)
+    # 64 channels from -25 to +15 degrees, the azimuth resolution follows from the point count
+    channels = 64
+    elevation = numpy.radians(numpy.linspace(-25.0, 15.0, channels))
+    sensor_height = 1.8
+
+    sweeps = []
+    for index in range(config.payload_variants):
+        azimuth = numpy.linspace(0, 2 * numpy.pi, -(-count // channels), endpoint=False) + index * 0.01
+        azimuth, beam = numpy.meshgrid(azimuth, elevation)
+        azimuth = azimuth.ravel()[:count]
+        beam = beam.ravel()[:count]
+
+        # Ground hits for the beams pointing down, far returns for the others
+        ground = numpy.where(beam < 0, sensor_height / numpy.tan(-numpy.minimum(beam, -1e-3)), 100.0)
+        # Obstacles around the sensor, shifting a little between sweeps
+        obstacles = 8.0 + 4.0 * numpy.sin(4 * azimuth + index * 0.05)
+        distance = numpy.minimum(numpy.minimum(ground, obstacles / numpy.cos(beam)), 100.0)
+        distance = distance + generator.normal(0, 0.02, count)
+
+        points = numpy.empty((count, 4), dtype=numpy.float32)
+        points[:, 0] = distance * numpy.cos(beam) * numpy.cos(azimuth)
+        points[:, 1] = distance * numpy.cos(beam) * numpy.sin(azimuth)
+        points[:, 2] = sensor_height + distance * numpy.sin(beam)
+        points[:, 3] = numpy.clip(1.0 / (1.0 + distance) + generator.normal(0, 0.01, count), 0, 1)
+        sweeps.append(points)
+    return sweeps
+
+
+def pointcloud_payloads(config) -> List[bytes]:
+    """
+    Synthetic LiDAR sweeps, see pointclouds, cut to the payload size.
+
+    :param config: The benchmark configuration.
+    :return: `config.payload_variants` consecutive sweeps.
+    """
+    return [points.tobytes()[:config.payload_size] for points in pointclouds(config)]
+
+
+def _read_pointcloud(path: str) -> bytes:
+    """
+    Read a captured point cloud with open3d.
+
+    :param path: Path of a .pcd or .ply file.
+    :return: The float32 (x, y, z) points.
+    """
+    open3d = importlib.import_module("open3d")
+    cloud = open3d.io.read_point_cloud(path)
+    return _numpy().asarray(cloud.points, dtype="float32").tobytes()
+
+
+def file_payloads(config) -> List[bytes]:
+    """
+    Replay captured data, read through memory maps.
+
+    When `config.payload_file` is a directory or a glob pattern every matching file is one payload
+    (.pcd and .ply point clouds are converted to float32 points with open3d). Otherwise the file is cut
+    into consecutive records of `config.payload_size` bytes. In both cases the first
+    `config.payload_variants` payloads are replayed, cycling if there are fewer.
+
+    :param config: The benchmark configuration.
+    :return: The payloads.
+    """
+    path = config.payload_file
+    if not path:
+        raise ValueError("The file payload needs payload_file")
+
+    if os.path.isdir(path) or glob.has_magic(path):
+        pattern = os.path.join(path, "*") if os.path.isdir(path) else path
+        files = sorted(name for name in glob.glob(pattern) if os.path.isfile(name))
+        if not files:
+            raise ValueError(f"No file matches {path}")
+        payloads = []
+        for name in files[:config.payload_variants]:
+            if name.lower().endswith((".pcd", ".ply")):
+                payloads.append(_read_pointcloud(name))
+                continue
+            with open(name, "rb") as capture, mmap.mmap(capture.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                payloads.append(bytes(mapped))
+        return payloads
+
+    with open(path, "rb") as capture, mmap.mmap(capture.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        records = max(len(mapped) // config.payload_size, 1)
+        return [bytes(mapped[(index % records) * config.payload_size:(index % records + 1) * config.payload_size])
+                for index in range(min(config.payload_variants, records))]
+
+
+def typed_payloads(config) -> List[bytes]:
+    """
+    Synthetic frames or sweeps serialized with the typed message schema `config.schema`.
+    Frames keep their full height, so the payloads can be a little larger than the payload size.
+
+    :param config: The benchmark configuration.
+    :return: `config.payload_variants` consecutive typed payloads.
+    """
+    if config.schema == "image":
+        if config.image_encoding != "raw":
+            raise ValueError("Typed image frames carry raw pixels, the image encoding must be raw")
+        return [bytes(IMAGE_FRAME.encode({"pixels": frame})) for frame in image_frames(config)]
+    if config.schema == "pointcloud":
+        return [bytes(POINT_CLOUD.encode({"points": points})) for points in pointclouds(config)]
+    raise ValueError(f"Unknown schema '{config.schema}', expected one of {sorted(SCHEMAS)}")
+
+
+# Payload kind -> generator returning the payloads to cycle through
+GENERATORS: Dict[str, Callable] = {
+    "constant": constant_payloads,
+    "random": random_payloads,
+    "image": image_payloads,
+    "pointcloud": pointcloud_payloads,
+    "file": file_payloads,
+}
+
+
+def generate_payloads(config) -> List[bytes]:
+    """
+    Generate, ahead of sending, the payloads the publisher cycles through.
+    With `config.schema` set, the typed payloads of that schema replace `config.payload`.
+
+    :param config: The benchmark configuration.
+    :return: The payloads, at least one.
+    """
+    if config.schema:
+        return typed_payloads(config)
+    if config.payload not in GENERATORS:
+        raise ValueError(f"Unknown payload '{config.payload}', expected one of {sorted(GENERATORS)}")
+    return GENERATORS[config.payload](config)
@@ -0,0 +1,272 @@
+import importlib
+import multiprocessing
+import multiprocessing.util
+import queue
+import threading
+import time
+import zlib
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+from typing import Callable, Dict, Tuple
+
+from benchmark import message
+from benchmark.histogram import LatencyHistogram
+
+
+def _work_checksum(payload: memoryview) -> int:
+    return zlib.crc32(payload)
+
+
+def _work_mean(payload: memoryview) -> float:
+    numpy = importlib.import_module("numpy")
+    return float(numpy.frombuffer(payload, dtype=numpy.uint8).mean())
+
+
+def _work_copy(payload: memoryview) -> int:
+    return len(bytes(payload))
+
+
+# Built-in processing functions, called with a view over the payload
+WORK: Dict[str, Callable] = {
+    "checksum": _work_checksum,
+    "mean": _work_mean,
+    "copy": _work_copy,
+}
+
+
+def resolve_work(name: str) -> Callable:
+    """
+    :param name: A built-in processing function name, or "package.module:function" for a custom one.
+    :return: The processing function, called with a view over the payload.
+    """
+    if name in WORK:
+        return WORK[name]
+    if ":" not in name:
+        raise ValueError(f"Unknown processing '{name}', expected one of {sorted(WORK)} or module:function")
+    module, function = name.split(":", 1)
+    return getattr(importlib.import_module(module), function)
+
+
+# Processing functions of a pool worker process by name, and its mapping of every slot by slot index
+_worker_work: Dict[str, Callable] = {}
+_worker_memory: Dict[int, shared_memory.SharedMemory] = {}
+
+
+def _close_worker_memory() -> None:
+    """
+    Unmap the slots mapped by a pool worker process.
+    """
+    for segment in _worker_memory.values():
+        segment.close()
+    _worker_memory.clear()
+
+
+def _init_worker() -> None:
+    """
+    Pool worker process initializer, unmapping the slots when the worker exits.
+    """
+    # Pool workers leave through os._exit, which skips atexit but not the multiprocessing finalizers
+    multiprocessing.util.Finalize(None, _close_worker_memory, exitpriority=10)
+
+
+def _start_worker(work_name: str) -> None:
+    """
+    Import the processing function in a pool worker process, ahead of the first message.
+
+    :param work_name: The processing function name.
+    """
+    work = _worker_work[work_name] = resolve_work(work_name)
+    # A first call loads what the function imports lazily
+    work(memoryview(bytes(1)))
+    # Hold the worker a little so every warm-up job lands in a different process
+    time.sleep(0.05)
+
+
+def _process_slot(work_name: str, index: int, slot_name: str, length: int) -> Tuple[int, int, int]:
+    """
+    Process the message held in a shared memory slot, in a pool worker process.
+
+    :param work_name: The processing function name.
+    :param index: The slot index.
+    :param slot_name: The shared memory segment name of the slot, which changes when the slot is resized.
+    :param length: The message length in bytes.
+    :return: The start time and end time (`time.time_ns()`), and the processing duration in ns.
+    """
+    start_ns = time.time_ns()
+    work = _worker_work.get(work_name)
+    if work is None:
+        work = _worker_work[work_name] = resolve_work(work_name)
+    segment = _worker_memory.get(index)
+    if segment is not None and segment.name != slot_name:
+        # The slot was resized into a new segment, the old one is unlinked by the subscriber process
+        segment.close()
+        segment = None
+    if segment is None:
+        # Spawned workers share the resource tracker of the subscriber process, which unlinks the segment
+        segment = _worker_memory[index] = shared_memory.SharedMemory(slot_name)
+
+    view = segment.buf[:length]
+    try:
+        _, payload = message.decode(view)
+        started = time.perf_counter_ns()
+        work(payload)
+        duration_ns = time.perf_counter_ns() - started
+        payload.release()
+    finally:
+        view.release()
+    return start_ns, time.time_ns(), duration_ns
+
+
+class ProcessingPipeline:
+    """
+    Processing stage running the user work on every received message, decoupled from the transport callback.
+
+    In "inline" mode the work runs in the callback, as a baseline. In "threads" mode the callback only hands
+    a reference to the message to a thread pool. In "processes" mode the callback copies the message into a
+    free shared memory slot and a process pool works on the slot in place, so the payload is never pickled.
+    At most `config.processing_slots` messages are in flight, the callback waits for a free slot beyond that.
+
+    Attributes:
+        mode (str): The processing mode.
+        work_name (str): The processing function name.
+        processing_time (LatencyHistogram): Duration of the work on every message, in nanoseconds.
+        queue_wait (LatencyHistogram): Time from hand-off to the start of the work, in nanoseconds.
+        processed_latency (LatencyHistogram): Latency from the send time to the end of the work, in nanoseconds.
+        slot_waits (int): Hand-offs that had to wait for a free slot.
+    """
+
+    def __init__(self, config) -> None:
+        """
+        Start the processing pool.
+
+        :param config: The benchmark configuration.
+        """
+        self.mode = config.processing
+        self.work_name = config.processing_work
+        self.work = resolve_work(self.work_name)
+        precision = config.histogram_precision
+        self.processing_time = LatencyHistogram(significant_figures=precision)
+        self.queue_wait = LatencyHistogram(significant_figures=precision)
+        self.processed_latency = LatencyHistogram(significant_figures=precision)
+        self.slot_waits = 0
+        self._lock = threading.Lock()
+        self._free = queue.Queue()
+        for index in range(max(config.processing_slots, 1)):
+            self._free.put(index)
+        self._slots = []
+        self._pool = None
+
+        if self.mode == "threads":
+            self._pool = ThreadPoolExecutor(config.processing_workers, thread_name_prefix="processing")
+        elif self.mode == "processes":
+            self._slots = [shared_memory.SharedMemory(create=True, size=message.HEADER_SIZE + config.payload_size)
+                           for _ in range(self._free.qsize())]
+            self._pool = ProcessPoolExecutor(config.processing_workers, mp_context=multiprocessing.get_context("spawn"),
+                                             initializer=_init_worker)
+            # Spawning the workers takes a while, it must not count in the first message timings
+            for warm_up in [self._pool.submit(_start_worker, self.work_name) for _ in range(config.processing_workers)]:
+                warm_up.result()
+
+    def _acquire(self) -> int:
+        """
+        :return: The index of a free slot, waiting for one if needed.
+        """
+        try:
+            return self._free.get_nowait()
+        except queue.Empty:
+            self.slot_waits += 1
+            return self._free.get()
+
+    def _record(self, send_ns: int, handoff_ns: int, start_ns: int, end_ns: int, duration_ns: int) -> None:
+        """
+        Record the timings of a processed message.
+        """
+        with self._lock:
+            self.queue_wait.record(start_ns - handoff_ns)
+            self.processing_time.record(duration_ns)
+            self.processed_latency.record(end_ns - send_ns)
+
+    def _run(self, data, send_ns: int, handoff_ns: int) -> None:
+        """
+        Run the work on a message in this process.
+
+        :param data: The message.
+        :param send_ns: The send time of the message, on the local clock.
+        :param handoff_ns: The time the message was handed to the pipeline.
+        """
+        start_ns = time.time_ns()
+        _, payload = message.decode(data)
+        started = time.perf_counter_ns()
+        self.work(payload)
+        duration_ns = time.perf_counter_ns() - started
+        self._record(send_ns, handoff_ns, start_ns, time.time_ns(), duration_ns)
+
+    def submit(self, data, send_ns: int) -> None:
+        """
+        Hand a received message to the processing stage.
+
+        :param data: The message.
+        :param send_ns: The send time of the message, on the local clock.
+        """
+        handoff_ns = time.time_ns()
+        if self.mode == "inline":
+            self._run(data, send_ns, handoff_ns)
+            return
+
+        index = self._acquire()
+        if self.mode == "threads":
+            # A view may point to a buffer the transport reuses once the callback returns
+            reference = data if isinstance(data, bytes) else bytes(data)
+            future = self._pool.submit(self._run, reference, send_ns, handoff_ns)
+            future.add_done_callback(lambda done: self._release(index, done))
+            return
+
+        slot = self._slots[index]
+        if len(data) > slot.size:
+            slot.close()
+            slot.unlink()
+            slot = self._slots[index] = shared_memory.SharedMemory(create=True, size=len(data))
+        message.copy_into(slot.buf, data)
+        future = self._pool.submit(_process_slot, self.work_name, index, slot.name, len(data))
+        future.add_done_callback(lambda done: self._release(index, done, send_ns, handoff_ns))
+
+    def _release(self, index: int, future: Future, send_ns: int = 0, handoff_ns: int = 0) -> None:
+        """
+        Record the result of a pool job and free its slot.
+
+        :param index: The slot index.
+        :param future: The finished job.
+        :param send_ns: The send time of the message, for process pool jobs.
+        :param handoff_ns: The hand-off time of the message, for process pool jobs.
+        """
+        try:
+            result = future.result()
+            if self.mode == "processes":
+                self._record(send_ns, handoff_ns, *result)
+        except Exception as error:
+            print(f"Processing failed: {error!r}")
+        finally:
+            self._free.put(index)
+
+    def close(self) -> None:
+        """
+        Wait for the messages in flight and stop the pool.
+        """
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+        for slot in self._slots:
+            slot.close()
+            slot.unlink()
+
+    def report(self) -> None:
+        """
+        Print the processing statistics.
+        """
+        if not self.processing_time.total:
+            return
+        print(f"Processing ({self.mode}, {self.work_name}): {self.processing_time.total} messages, "
+              f"slot waits {self.slot_waits}")
+        for label, histogram in (("Processing time", self.processing_time), ("Processing queue wait", self.queue_wait),
+                                 ("Latency to processed", self.processed_latency)):
+            print(f"{label}: p50 {histogram.percentile(50) / 1e6:.2f} ms, p99 {histogram.percentile(99) / 1e6:.2f} ms, "
+                  f"max {histogram.maximum / 1e6:.2f} ms")
@@ -0,0 +1,102 @@
+import importlib
+import sys
+import time
+from typing import Optional
+
+from benchmark.protocols.base import (DATA_CHANNEL, REPLY_CHANNEL, MessageCallback, TransportPublisher,
+                                      TransportSubscriber, UnsupportedSetting)
+from benchmark.protocols.chunking import ChunkingPublisher, ChunkingSubscriber
+from benchmark.protocols.compression import CODECS, CompressingPublisher, DecompressingSubscriber
+
+# Transport name -> module implementing create_publisher/create_subscriber.
+# Modules are imported lazily so a missing middleware only breaks its own transport.
+TRANSPORTS = {
+    "zmq": "benchmark.protocols.zmq",
+    "zenoh": "benchmark.protocols.zenoh",
+    "dds": "benchmark.protocols.dds",
+}
+# Transport name -> seconds its module took to import in this process
+IMPORT_TIMES = {}
+
+
+def _load(name: str):
+    """
+    Import the module implementing a transport.
+
+    :param name: The transport name.
+    :return: The transport module.
+    """
+    if name not in TRANSPORTS:
+        raise ValueError(f"Unknown transport '{name}', expected one of {sorted(TRANSPORTS)}")
+    if TRANSPORTS[name] in sys.modules:
+        return sys.modules[TRANSPORTS[name]]
+    start = time.perf_counter()
+    module = importlib.import_module(TRANSPORTS[name])
+    IMPORT_TIMES[name] = time.perf_counter() - start
+    return module
+
+
+def import_time(name: str) -> Optional[float]:
+    """
+    :param name: The transport name.
+    :return: Seconds the module of the transport took to import in this process, only on the first call.
+    """
+    return IMPORT_TIMES.pop(name, None)
+
+
+def requires_single_process(name: str, config) -> bool:
+    """
+    :param name: The transport name.
+    :param config: The benchmark configuration.
+    :return: True if the configured endpoints only connect sockets of the same process.
+    """
+    check = getattr(_load(name), "requires_single_process", None)
+    return check is not None and check(config)
+
+
+def validate_config(name: str, config) -> None:
+    """
+    Check that the installed middleware of a transport supports the configured settings, when it can tell
+    without opening anything. Raises UnsupportedSetting for the first unsupported setting.
+
+    :param name: The transport name.
+    :param config: The benchmark configuration.
+    """
+    check = getattr(_load(name), "validate_config", None)
+    if check is not None:
+        check(config)
+
+
+def create_publisher(name: str, config, channel: str = DATA_CHANNEL) -> TransportPublisher:
+    """
+    Create the publisher of a transport. Payloads are compressed first if `config.compression` is set,
+    then split in chunks if `config.chunk_size` is set.
+
+    :param name: The transport name.
+    :param config: The benchmark configuration.
+    :param channel: The channel to send on.
+    :return: The transport publisher.
+    """
+    publisher = _load(name).create_publisher(config, channel)
+    if config.chunk_size:
+        publisher = ChunkingPublisher(publisher, config)
+    if config.compression:
+        publisher = CompressingPublisher(publisher, config)
+    return publisher
+
+
+def create_subscriber(name: str, config, channel: str = DATA_CHANNEL) -> TransportSubscriber:
+    """
+    Create the subscriber of a transport, undoing the chunking and compression of the publisher.
+
+    :param name: The transport name.
+    :param config: The benchmark configuration.
+    :param channel: The channel to receive from.
+    :return: The transport subscriber.
+    """
+    subscriber = _load(name).create_subscriber(config, channel)
+    if config.chunk_size:
+        subscriber = ChunkingSubscriber(subscriber, config)
+    if config.compression:
+        subscriber = DecompressingSubscriber(subscriber, config)
+    return subscriber
@@ -0,0 +1,133 @@
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Optional
+
+class UnsupportedSetting(Exception):
+    """
+    A configured setting the installed middleware bindings do not support.
+    """
+
+
+# Callback invoked by a subscriber for every received message
+MessageCallback = Callable[[bytes], None]
+
+# Channels of a transport: the benchmark data, and the replies of the echo responder in ping-pong mode
+DATA_CHANNEL = "data"
+REPLY_CHANNEL = "reply"
+
+
+class TransportPublisher(ABC):
+    """
+    Sending side of a transport backend.
+
+    Attributes:
+        config: The benchmark configuration.
+        channel (str): The channel the publisher sends on.
+        bytes_copied (int): Message bytes copied by the backend before handing them to the middleware.
+    """
+
+    def __init__(self, config, channel: str = DATA_CHANNEL) -> None:
+        """
+        Initialize the transport publisher.
+
+        :param config: The benchmark configuration.
+        :param channel: The channel to send on.
+        """
+        self.config = config
+        self.channel = channel
+        self.bytes_copied = 0
+
+    @abstractmethod
+    def open(self) -> None:
+        """
+        Create the middleware entities needed to publish.
+        """
+
+    def wait_ready(self, subscribers: int = 1, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the transport is ready to deliver messages to a number of subscribers.
+        Transports without a readiness mechanism return immediately.
+
+        :param subscribers: Number of subscribers to wait for.
+        :param timeout: Seconds to wait at most, None to wait forever.
+        :return: False if the timeout expired before every subscriber was ready.
+        """
+        return True
+
+    @abstractmethod
+    def send(self, message: bytes) -> Optional[Any]:
+        """
+        Publish a single message.
+
+        :param message: The serialized message.
+        :return: None if the message buffer can be reused right away, otherwise an object
+                 whose `wait()` returns once the middleware released the buffer.
+        """
+
+    def report(self) -> None:
+        """
+        Print the statistics specific to the backend, if any.
+        """
+
+    @abstractmethod
+    def close(self) -> None:
+        """
+        Release every middleware entity owned by the publisher.
+        """
+
+
+class TransportSubscriber(ABC):
+    """
+    Receiving side of a transport backend.
+
+    Attributes:
+        config: The benchmark configuration.
+        channel (str): The channel the subscriber receives from.
+    """
+
+    def __init__(self, config, channel: str = DATA_CHANNEL) -> None:
+        """
+        Initialize the transport subscriber.
+
+        :param config: The benchmark configuration.
+        :param channel: The channel to receive from.
+        """
+        self.config = config
+        self.channel = channel
+
+    @abstractmethod
+    def open(self, callback: MessageCallback) -> None:
+        """
+        Start receiving, calling the callback for every received message.
+
+        :param callback: Function called with the raw message.
+        """
+
+    async def open_async(self, sink) -> None:
+        """
+        Start receiving from an asyncio event loop, handing every message to a sink.
+        Backends without native asyncio support keep receiving on their own threads and use
+        the thread-safe entry point of the sink.
+
+        :param sink: Object with a `put_threadsafe(message)` method callable from any thread,
+                     and a `put(message)` coroutine for the event loop thread.
+        """
+        self.open(sink.put_threadsafe)
+
+    async def close_async(self) -> None:
+        """
+        Stop receiving from an asyncio event loop.
+        The blocking close runs in an executor, so the loop keeps draining the messages in flight.
+        """
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+    def report(self) -> None:
+        """
+        Print the statistics specific to the backend, if any.
+        """
+
+    @abstractmethod
+    def close(self) -> None:
+        """
+        Stop receiving and release every middleware entity owned by the subscriber.
+        """
@@ -0,0 +1,260 @@
+import struct
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, List, Optional
+
+from benchmark import message
+from benchmark.histogram import LatencyHistogram
+from benchmark.protocols.base import MessageCallback, TransportPublisher, TransportSubscriber
+
+# Chunk header following the message header of every chunk:
+# chunk index, chunk count, offset in the message payload, message payload length, chunk send time
+CHUNK_HEADER = struct.Struct("<IIQQq")
+CHUNK_HEADER_SIZE = CHUNK_HEADER.size
+# Number of recently completed messages remembered to drop their late duplicate chunks
+COMPLETED_HISTORY = 64
+
+
+class ChunkingPublisher(TransportPublisher):
+    """
+    Publisher splitting the messages larger than `config.chunk_size` into chunks sent back-to-back
+    over another publisher, so payloads beyond the middleware message or segment limits can be benchmarked.
+
+    Every chunk is a message of its own carrying the header of the original message with the CHUNK flag,
+    followed by a chunk header. Chunks are written into a ring of `config.chunk_pipeline` preallocated
+    buffers, so that many chunks can be in flight in a zero-copy transport before a buffer is reused.
+
+    Attributes:
+        inner (TransportPublisher): The publisher sending the chunks.
+        chunk_size (int): Maximum payload bytes per chunk.
+        buffers (List[bytearray]): The chunk buffers (header + chunk header + chunk payload).
+        guards (List): Release guard of each buffer, None when the buffer is free.
+        chunks_sent (int): Number of chunks sent.
+    """
+
+    def __init__(self, inner: TransportPublisher, config) -> None:
+        """
+        Initialize the chunking publisher.
+
+        :param inner: The publisher sending the chunks.
+        :param config: The benchmark configuration.
+        """
+        super().__init__(config, inner.channel)
+        self.inner = inner
+        self.chunk_size = config.chunk_size
+        self.buffers: List[bytearray] = [bytearray(message.HEADER_SIZE + CHUNK_HEADER_SIZE + self.chunk_size)
+                                         for _ in range(max(config.chunk_pipeline, 1))]
+        self.guards = [None] * len(self.buffers)
+        self.chunks_sent = 0
+        self._copied = 0
+        self._next = 0
+
+    def open(self) -> None:
+        """
+        Open the inner publisher.
+        """
+        self.inner.open()
+
+    def wait_ready(self, subscribers: int = 1, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the inner publisher to be ready.
+
+        :param subscribers: Number of subscribers to wait for.
+        :param timeout: Seconds to wait at most, None to wait forever.
+        :return: False if the timeout expired before every subscriber was ready.
+        """
+        return self.inner.wait_ready(subscribers, timeout)
+
+    def _acquire(self) -> int:
+        """
+        Take the next chunk buffer of the ring, waiting for the transport to release it if needed.
+
+        :return: The buffer index.
+        """
+        index = self._next
+        self._next = (index + 1) % len(self.buffers)
+        guard = self.guards[index]
+        if guard is not None:
+            guard.wait()
+            self.guards[index] = None
+        return index
+
+    def send(self, data) -> Optional[Any]:
+        """
+        Send a message, in chunks if its payload is larger than the chunk size.
+        The payload is copied into the chunk buffers, so the message buffer can be reused right away.
+
+        :param data: The serialized message.
+        :return: The guard of the inner publisher for a message sent whole, None otherwise.
+        """
+        header, payload = message.decode(data)
+        if header.payload_length <= self.chunk_size:
+            guard = self.inner.send(data)
+            self.bytes_copied = self._copied + self.inner.bytes_copied
+            return guard
+
+        count = -(-header.payload_length // self.chunk_size)
+        payload_start = message.HEADER_SIZE + CHUNK_HEADER_SIZE
+        for chunk_index in range(count):
+            offset = chunk_index * self.chunk_size
+            part = payload[offset:offset + self.chunk_size]
+            index = self._acquire()
+            buffer = self.buffers[index]
+            message.pack_header(buffer, header.publisher_id, header.sequence, CHUNK_HEADER_SIZE + len(part),
+                                header.flags | message.Flags.CHUNK, header.timestamp_ns)
+            CHUNK_HEADER.pack_into(buffer, message.HEADER_SIZE, chunk_index, count, offset,
+                                   header.payload_length, time.time_ns())
+            buffer[payload_start:payload_start + len(part)] = part
+            self._copied += len(part)
+            if len(part) < self.chunk_size:
+                # Not every middleware accepts a view, the short last chunk is sent as a copy
+                chunk = bytes(memoryview(buffer)[:payload_start + len(part)])
+                self._copied += len(chunk)
+                self.guards[index] = self.inner.send(chunk)
+            else:
+                self.guards[index] = self.inner.send(buffer)
+            self.chunks_sent += 1
+        self.bytes_copied = self._copied + self.inner.bytes_copied
+        return None
+
+    def report(self) -> None:
+        """
+        Print the number of chunks sent.
+        """
+        print(f"Chunks sent: {self.chunks_sent} of up to {self.chunk_size} bytes")
+        self.inner.report()
+
+    def close(self) -> None:
+        """
+        Wait for the chunks in flight and close the inner publisher.
+        """
+        for guard in self.guards:
+            if guard is not None:
+                guard.wait()
+        self.inner.close()
+
+
+class _Reassembly:
+    """
+    A message being reassembled.
+
+    Attributes:
+        buffer (bytearray): The buffer receiving the message (header + payload).
+        count (int): Number of chunks of the message.
+        received (set): Indexes of the chunks received.
+    """
+
+    def __init__(self, buffer: bytearray, count: int) -> None:
+        self.buffer = buffer
+        self.count = count
+        self.received = set()
+
+
+class ChunkingSubscriber(TransportSubscriber):
+    """
+    Subscriber reassembling the chunks of another subscriber into whole messages.
+
+    Messages are reassembled into `config.reassembly_slots` preallocated buffers. When every buffer is
+    in use the oldest incomplete message is dropped, it then shows up as lost in the delivery statistics.
+    Messages that were not chunked are passed through unchanged.
+
+    Attributes:
+        inner (TransportSubscriber): The subscriber receiving the chunks.
+        chunk_latency (LatencyHistogram): Latency of every chunk, from its send time, in nanoseconds.
+        dropped (int): Incomplete messages dropped for lack of a reassembly buffer.
+    """
+
+    def __init__(self, inner: TransportSubscriber, config) -> None:
+        """
+        Initialize the chunking subscriber.
+
+        :param inner: The subscriber receiving the chunks.
+        :param config: The benchmark configuration.
+        """
+        super().__init__(config, inner.channel)
+        self.inner = inner
+        self.chunk_latency = LatencyHistogram(significant_figures=config.histogram_precision)
+        self.dropped = 0
+        self._free = [bytearray(message.HEADER_SIZE + config.payload_size)
+                      for _ in range(max(config.reassembly_slots, 1))]
+        self._pending: "OrderedDict[tuple, _Reassembly]" = OrderedDict()
+        self._completed = deque(maxlen=COMPLETED_HISTORY)
+        self._callback = None
+        self._lock = threading.Lock()
+
+    def open(self, callback: MessageCallback) -> None:
+        """
+        Start receiving chunks.
+
+        :param callback: Function called with every reassembled message.
+        """
+        self._callback = callback
+        self.inner.open(self._on_chunk)
+
+    def _on_chunk(self, data) -> None:
+        """
+        Copy a chunk into its reassembly buffer, and deliver the message once complete.
+
+        :param data: The received chunk.
+        """
+        receive_ns = time.time_ns()
+        header, payload = message.decode(data)
+        if not header.flags & message.Flags.CHUNK:
+            self._callback(data)
+            return
+
+        index, count, offset, length, send_ns = CHUNK_HEADER.unpack_from(payload)
+        self.chunk_latency.record(receive_ns - send_ns)
+        key = (header.publisher_id, header.sequence)
+        with self._lock:
+            if key in self._completed:
+                return
+            reassembly = self._pending.get(key)
+            if reassembly is None:
+                reassembly = self._pending[key] = _Reassembly(self._take_buffer(message.HEADER_SIZE + length), count)
+                message.pack_header(reassembly.buffer, header.publisher_id, header.sequence, length,
+                                    header.flags & ~message.Flags.CHUNK, header.timestamp_ns)
+            if index in reassembly.received:
+                return
+            reassembly.received.add(index)
+            start = message.HEADER_SIZE + offset
+            reassembly.buffer[start:start + len(payload) - CHUNK_HEADER_SIZE] = payload[CHUNK_HEADER_SIZE:]
+
+            if len(reassembly.received) == reassembly.count:
+                del self._pending[key]
+                self._completed.append(key)
+                self._callback(memoryview(reassembly.buffer)[:message.HEADER_SIZE + length])
+                self._free.append(reassembly.buffer)
+
+    def _take_buffer(self, size: int) -> bytearray:
+        """
+        Take a free reassembly buffer, dropping the oldest incomplete message if none is left.
+
+        :param size: Number of bytes the buffer must hold.
+        :return: The buffer.
+        """
+        if not self._free:
+            _, oldest = self._pending.popitem(last=False)
+            self.dropped += 1
+            self._free.append(oldest.buffer)
+        buffer = self._free.pop()
+        if len(buffer) < size:
+            buffer = bytearray(size)
+        return buffer
+
+    def report(self) -> None:
+        """
+        Print the chunk latencies and the dropped messages.
+        """
+        if self.chunk_latency.total:
+            self.chunk_latency.report(label="Chunk Latency")
+        if self.dropped:
+            print(f"Incomplete messages dropped: {self.dropped}")
+        self.inner.report()
+
+    def close(self) -> None:
+        """
+        Close the inner subscriber.
+        """
+        self.inner.close()
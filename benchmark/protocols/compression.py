@@ -0,0 +1,349 @@
+import bz2
+import importlib
+import lzma
+import queue
+import threading
+import time
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from benchmark import message
+from benchmark.histogram import LatencyHistogram
+from benchmark.protocols.base import MessageCallback, TransportPublisher, TransportSubscriber
+
+
+class Codec:
+    """
+    A compression codec.
+
+    Attributes:
+        name (str): The codec name.
+        compress (Callable[[bytes], bytes]): Compress a buffer.
+        decompress (Callable[[bytes], bytes]): Decompress a buffer produced by compress.
+    """
+
+    def __init__(self, name: str, compress: Callable, decompress: Callable) -> None:
+        self.name = name
+        self.compress = compress
+        self.decompress = decompress
+
+
+def _zlib(level: Optional[int]) -> Codec:
+    return Codec("zlib", lambda data: zlib.compress(data, 1 if level is None else level), zlib.decompress)
+
+
+def _lzma(level: Optional[int]) -> Codec:
+    return Codec("lzma", lambda data: lzma.compress(data, preset=0 if level is None else level), lzma.decompress)
+
+
+def _bz2(level: Optional[int]) -> Codec:
+    return Codec("bz2", lambda data: bz2.compress(data, 1 if level is None else level), bz2.decompress)
+
+
+def _lz4(level: Optional[int]) -> Codec:
+    frame = importlib.import_module("lz4.frame")
+    return Codec("lz4", lambda data: frame.compress(data, compression_level=level or 0), frame.decompress)
+
+
+def _zstd(level: Optional[int]) -> Codec:
+    zstandard = importlib.import_module("zstandard")
+    compressor = zstandard.ZstdCompressor(level=3 if level is None else level)
+    decompressor = zstandard.ZstdDecompressor()
+    # The contexts are not thread safe, and the compression runs on a pool
+    lock = threading.Lock()
+
+    def compress(data):
+        with lock:
+            return compressor.compress(data)
+
+    return Codec("zstd", compress, decompressor.decompress)
+
+
+# Codec name -> factory taking the compression level, None for the codec default.
+# lz4 and zstd need the lz4 and zstandard packages, which are only imported when selected.
+CODECS = {
+    "zlib": _zlib,
+    "lzma": _lzma,
+    "bz2": _bz2,
+    "lz4": _lz4,
+    "zstd": _zstd,
+}
+
+
+def create_codec(name: str, level: Optional[int] = None) -> Codec:
+    """
+    :param name: The codec name.
+    :param level: The compression level, None for the codec default.
+    :return: The codec.
+    """
+    if name not in CODECS:
+        raise ValueError(f"Unknown codec '{name}', expected one of {sorted(CODECS)}")
+    return CODECS[name](level)
+
+
+class _Sent:
+    """
+    Release guard of a message handed to the compression pipeline, done once the inner publisher
+    sent it and released its buffer.
+    """
+
+    def __init__(self) -> None:
+        self._done = threading.Event()
+
+    def set(self) -> None:
+        self._done.set()
+
+    def wait(self) -> None:
+        self._done.wait()
+
+
+class CompressingPublisher(TransportPublisher):
+    """
+    Publisher compressing the message payloads before handing them to another publisher.
+
+    Compression runs on a pool of `config.compression_threads` threads, so the publish loop only
+    queues messages; a sender thread then sends them through the inner publisher in order. The send call
+    time of the publish loop is thus the queueing time, compression and inner send times are reported apart.
+    A message is sent uncompressed, without the COMPRESSED flag, when compression does not pay off:
+    its ratio is below `config.compression_min_ratio`, or the compression takes longer than sending the
+    saved bytes at `config.compression_link_rate`. After such a message, the next
+    `config.compression_probe_interval` messages bypass the codec entirely.
+
+    Attributes:
+        inner (TransportPublisher): The publisher sending the messages.
+        codec (Codec): The compression codec.
+        compress_time (LatencyHistogram): Duration of every compression in nanoseconds.
+        inner_send_time (LatencyHistogram): Duration of every inner publisher send call in nanoseconds.
+        compressed (int): Messages sent compressed.
+        bypassed (int): Messages sent uncompressed.
+        bytes_in (int): Payload bytes given to the codec.
+        bytes_out (int): Payload bytes produced by the codec.
+    """
+
+    def __init__(self, inner: TransportPublisher, config) -> None:
+        """
+        Initialize the compressing publisher.
+
+        :param inner: The publisher sending the messages.
+        :param config: The benchmark configuration.
+        """
+        super().__init__(config, inner.channel)
+        self.inner = inner
+        self.codec = create_codec(config.compression, config.compression_level)
+        self.compress_time = LatencyHistogram(significant_figures=config.histogram_precision)
+        self.inner_send_time = LatencyHistogram(significant_figures=config.histogram_precision)
+        self.compressed = 0
+        self.bypassed = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self._bypass_remaining = 0
+        # Taken by the publish loop deciding to bypass and the pool threads re-arming the bypass
+        self._bypass_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._pool = None
+        self._queue = queue.Queue()
+        self._sender = None
+        self._last_sent = None
+        # First error of the sender thread, compressing or sending a message
+        self._error: Optional[Exception] = None
+
+    def open(self) -> None:
+        """
+        Open the inner publisher and start the compression pool and the sender thread.
+        """
+        self.inner.open()
+        self._pool = ThreadPoolExecutor(max(self.config.compression_threads, 1), thread_name_prefix="compress")
+        self._sender = threading.Thread(target=self._send_loop, daemon=True)
+        self._sender.start()
+
+    def wait_ready(self, subscribers: int = 1, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the inner publisher to be ready.
+
+        :param subscribers: Number of subscribers to wait for.
+        :param timeout: Seconds to wait at most, None to wait forever.
+        :return: False if the timeout expired before every subscriber was ready.
+        """
+        return self.inner.wait_ready(subscribers, timeout)
+
+    def send(self, data) -> _Sent:
+        """
+        Queue a message for compression and sending.
+
+        :param data: The serialized message.
+        :return: A guard whose `wait()` returns once the message buffer can be reused.
+        """
+        self._raise_error()
+        sent = _Sent()
+        with self._bypass_lock:
+            bypass = self._bypass_remaining > 0
+            if bypass:
+                self._bypass_remaining -= 1
+        if bypass:
+            future = Future()
+            future.set_result(data)
+        else:
+            future = self._pool.submit(self._compress, data)
+        self._queue.put((future, sent))
+        self._last_sent = sent
+        return sent
+
+    def _raise_error(self) -> None:
+        """
+        Fail the publish loop once compressing or sending a queued message failed.
+        """
+        if self._error is not None:
+            raise RuntimeError(f"Compressed publishing failed: {self._error!r}") from self._error
+
+    def _compress(self, data):
+        """
+        Compress the payload of a message, on a pool thread.
+
+        :param data: The serialized message.
+        :return: The compressed message, or the original one if compression did not pay off.
+        """
+        header, payload = message.decode(data)
+        start_ns = time.perf_counter_ns()
+        compressed = self.codec.compress(payload)
+        duration_ns = time.perf_counter_ns() - start_ns
+        with self._stats_lock:
+            self.compress_time.record(duration_ns)
+            self.bytes_in += len(payload)
+            self.bytes_out += len(compressed)
+
+        saved = len(payload) - len(compressed)
+        ratio = len(payload) / len(compressed) if compressed else 0.0
+        link_rate = self.config.compression_link_rate
+        too_slow = link_rate > 0 and duration_ns / 1e9 > saved / link_rate
+        if ratio < self.config.compression_min_ratio or too_slow:
+            with self._bypass_lock:
+                self._bypass_remaining = self.config.compression_probe_interval
+            return data
+        return message.encode(header.publisher_id, header.sequence, compressed,
+                              header.flags | message.Flags.COMPRESSED, header.timestamp_ns)
+
+    def _send_loop(self) -> None:
+        """
+        Send the queued messages in order, stopped by a None entry.
+        """
+        while True:
+            entry = self._queue.get()
+            if entry is None:
+                return
+            future, sent = entry
+            try:
+                data = future.result()
+                start_ns = time.perf_counter_ns()
+                if message.decode(data)[0].flags & message.Flags.COMPRESSED:
+                    self.compressed += 1
+                    self.inner.send(data)
+                    self.inner_send_time.record(time.perf_counter_ns() - start_ns)
+                else:
+                    self.bypassed += 1
+                    guard = self.inner.send(data)
+                    self.inner_send_time.record(time.perf_counter_ns() - start_ns)
+                    if guard is not None:
+                        guard.wait()
+            except Exception as error:
+                # Raised in the publish loop by the next send, the remaining messages are still sent
+                if self._error is None:
+                    self._error = error
+            finally:
+                self.bytes_copied = self.inner.bytes_copied
+                sent.set()
+
+    def report(self) -> None:
+        """
+        Print the compression statistics, once the queued messages are sent.
+        """
+        if self._last_sent is not None:
+            self._last_sent.wait()
+        self._raise_error()
+        ratio = self.bytes_in / self.bytes_out if self.bytes_out else 0.0
+        print(f"Compression ({self.codec.name}): {self.compressed} compressed, {self.bypassed} bypassed, "
+              f"ratio {ratio:.2f} (the send call time only covers queueing the message)")
+        if self.compress_time.total:
+            print(f"Compress time: p50 {self.compress_time.percentile(50) / 1e6:.2f} ms, "
+                  f"p99 {self.compress_time.percentile(99) / 1e6:.2f} ms, max {self.compress_time.maximum / 1e6:.2f} ms")
+        if self.inner_send_time.total:
+            print(f"Inner send time: p50 {self.inner_send_time.percentile(50) / 1e6:.2f} ms, "
+                  f"p99 {self.inner_send_time.percentile(99) / 1e6:.2f} ms, "
+                  f"max {self.inner_send_time.maximum / 1e6:.2f} ms")
+        self.inner.report()
+
+    def close(self) -> None:
+        """
+        Send the queued messages, stop the pool and close the inner publisher.
+        """
+        if self._sender is not None:
+            self._queue.put(None)
+            self._sender.join()
+            self._pool.shutdown()
+        self.inner.close()
+
+
+class DecompressingSubscriber(TransportSubscriber):
+    """
+    Subscriber decompressing the messages of another subscriber that carry the COMPRESSED flag.
+
+    Attributes:
+        inner (TransportSubscriber): The subscriber receiving the messages.
+        codec (Codec): The compression codec.
+        decompress_time (LatencyHistogram): Duration of every decompression in nanoseconds.
+    """
+
+    def __init__(self, inner: TransportSubscriber, config) -> None:
+        """
+        Initialize the decompressing subscriber.
+
+        :param inner: The subscriber receiving the messages.
+        :param config: The benchmark configuration.
+        """
+        super().__init__(config, inner.channel)
+        self.inner = inner
+        self.codec = create_codec(config.compression, config.compression_level)
+        self.decompress_time = LatencyHistogram(significant_figures=config.histogram_precision)
+        self._callback = None
+
+    def open(self, callback: MessageCallback) -> None:
+        """
+        Start receiving messages.
+
+        :param callback: Function called with every decompressed message.
+        """
+        self._callback = callback
+        self.inner.open(self._on_message)
+
+    def _on_message(self, data) -> None:
+        """
+        Decompress a message if needed and pass it on.
+
+        :param data: The received message.
+        """
+        header, payload = message.decode(data)
+        if not header.flags & message.Flags.COMPRESSED:
+            self._callback(data)
+            return
+
+        start_ns = time.perf_counter_ns()
+        decompressed = self.codec.decompress(payload)
+        self.decompress_time.record(time.perf_counter_ns() - start_ns)
+        self._callback(message.encode(header.publisher_id, header.sequence, decompressed,
+                                      header.flags & ~message.Flags.COMPRESSED, header.timestamp_ns))
+
+    def report(self) -> None:
+        """
+        Print the decompression times.
+        """
+        if self.decompress_time.total:
+            print(f"Decompress time: p50 {self.decompress_time.percentile(50) / 1e6:.2f} ms, "
+                  f"p99 {self.decompress_time.percentile(99) / 1e6:.2f} ms, "
+                  f"max {self.decompress_time.maximum / 1e6:.2f} ms")
+        self.inner.report()
+
+    def close(self) -> None:
+        """
+        Close the inner subscriber.
+        """
+        self.inner.close()
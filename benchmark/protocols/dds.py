@@ -0,0 +1,627 @@
+import base64
+import fastdds
+from typing import Optional 
+from threading import Condition
+import build.SimpleMessage as SimpleMessage
+
+from benchmark.protocols import dds_objects_operations as operations
+from benchmark.protocols.base import (DATA_CHANNEL, REPLY_CHANNEL, MessageCallback, TransportPublisher,
+                                      TransportSubscriber, UnsupportedSetting)
+
+# Data type name -> generated PubSubType
+DATA_TYPES = {
+    "SimpleMessage": SimpleMessage.SimpleMessagePubSubType,
+    "BinaryMessage": SimpleMessage.BinaryMessagePubSubType,
+    "PlainMessage": SimpleMessage.PlainMessagePubSubType,
+}
+# Name of the flow controller registered when the writer rate is limited
+FLOW_CONTROLLER_NAME = "benchmark_flow_controller"
+# Period of the flow controller, the rate is enforced per period
+FLOW_CONTROLLER_PERIOD_MS = 10
+
+
+def configure_data_sharing(qos, mode: Optional[str]) -> None:
+    """
+    Set the data-sharing policy of a data writer or data reader QoS.
+    Data-sharing only applies to bounded types, and delivers without copies for plain types.
+
+    :param qos: The DataWriterQos or DataReaderQos.
+    :param mode: "automatic", "off", or None to keep the profile default.
+    """
+    if mode is None:
+        return
+    if mode == "automatic":
+        qos.data_sharing().automatic()
+    elif mode == "off":
+        qos.data_sharing().off()
+    else:
+        raise ValueError(f"Invalid data-sharing mode '{mode}'")
+
+
+def configure_qos(qos, settings) -> None:
+    """
+    Apply the reliability, history and resource limit overrides to a data writer or data reader QoS.
+
+    :param qos: The DataWriterQos or DataReaderQos.
+    :param settings: The DDS settings (DdsConfig), the None values keep the profile defaults.
+    """
+    if settings.reliability == "reliable":
+        qos.reliability().kind = fastdds.RELIABLE_RELIABILITY_QOS
+    elif settings.reliability == "best-effort":
+        qos.reliability().kind = fastdds.BEST_EFFORT_RELIABILITY_QOS
+    elif settings.reliability is not None:
+        raise ValueError(f"Invalid reliability '{settings.reliability}'")
+
+    if settings.history_depth == 0:
+        qos.history().kind = fastdds.KEEP_ALL_HISTORY_QOS
+    elif settings.history_depth is not None:
+        qos.history().kind = fastdds.KEEP_LAST_HISTORY_QOS
+        qos.history().depth = settings.history_depth
+
+    if settings.max_samples is not None:
+        limits = qos.resource_limits()
+        limits.max_samples = settings.max_samples
+        limits.max_samples_per_instance = settings.max_samples
+        limits.allocated_samples = min(limits.allocated_samples, settings.max_samples)
+
+
+def configure_publish_mode(qos, settings) -> None:
+    """
+    Apply the publish mode and the flow controller to a data writer QoS.
+
+    :param qos: The DataWriterQos.
+    :param settings: The DDS settings (DdsConfig).
+    """
+    if settings.flow_controller_rate is not None:
+        # Flow controllers only apply to asynchronous writers
+        qos.publish_mode().kind = fastdds.ASYNCHRONOUS_PUBLISH_MODE
+        qos.publish_mode().flow_controller_name = FLOW_CONTROLLER_NAME
+    elif settings.publish_mode == "async":
+        qos.publish_mode().kind = fastdds.ASYNCHRONOUS_PUBLISH_MODE
+    elif settings.publish_mode == "sync":
+        qos.publish_mode().kind = fastdds.SYNCHRONOUS_PUBLISH_MODE
+    elif settings.publish_mode is not None:
+        raise ValueError(f"Invalid publish mode '{settings.publish_mode}'")
+
+
+def flow_controller(rate: int):
+    """
+    :param rate: Bytes per second of the flow controller.
+    :return: The descriptor of the flow controller the asynchronous writers refer to.
+    """
+    descriptor = fastdds.FlowControllerDescriptor()
+    descriptor.name = FLOW_CONTROLLER_NAME
+    descriptor.period_ms = FLOW_CONTROLLER_PERIOD_MS
+    descriptor.max_bytes_per_period = max(rate * FLOW_CONTROLLER_PERIOD_MS // 1000, 1)
+    return descriptor
+
+
+def create_participant(profile: str, flow_controller_rate: Optional[int] = None):
+    """
+    Create a DDS participant from a profile, registering a flow controller if a rate is given.
+
+    :param profile: The DDS profile name.
+    :param flow_controller_rate: Bytes per second of the flow controller, None for no flow controller.
+    :return: The DDS participant.
+    """
+    factory = fastdds.DomainParticipantFactory.get_instance()
+    if flow_controller_rate is None:
+        return factory.create_participant_with_profile(profile)
+
+    qos = fastdds.DomainParticipantQos()
+    if factory.get_participant_qos_from_profile(profile, qos) != fastdds.RETCODE_OK:
+        raise ValueError(f"Unknown DDS profile '{profile}'")
+    qos.flow_controllers().push_back(flow_controller(flow_controller_rate))
+    return factory.create_participant(0, qos)
+
+
+def validate_config(config) -> None:
+    """
+    Apply the DDS settings to throwaway QoS objects, so a setting the installed bindings do not support fails
+    before any process of the point starts. No participant is created.
+
+    :param config: The benchmark configuration.
+    """
+    settings = config.dds
+    try:
+        writer_qos = fastdds.DataWriterQos()
+        configure_data_sharing(writer_qos, settings.data_sharing)
+        configure_qos(writer_qos, settings)
+        configure_publish_mode(writer_qos, settings)
+        reader_qos = fastdds.DataReaderQos()
+        configure_data_sharing(reader_qos, settings.data_sharing)
+        configure_qos(reader_qos, settings)
+        if settings.flow_controller_rate is not None:
+            fastdds.DomainParticipantQos().flow_controllers().push_back(flow_controller(settings.flow_controller_rate))
+    except AttributeError as error:
+        raise UnsupportedSetting(f"unsupported setting ({error})") from error
+
+
+class WriterListener(fastdds.DataWriterListener):
+    """
+    Default DDS writer listener class for FastDDS.
+
+    Attributes:
+        _writer: The associated DDS writer.
+    """
+
+    def __init__(self, writer) -> None:
+        """
+        Initialize the DDS writer listener.
+
+        :param writer: The associated DDS writer.
+        """
+        self._writer = writer
+        super().__init__()
+
+    def on_publication_matched(self, datawriter, info) -> None:
+        """
+        Callback when a publication is matched by a subscriber.
+
+        :param datawriter: The DDS data writer.
+        :param info: Information about the matched publication.
+        """
+        if (0 < info.current_count_change):
+            print ("Publisher matched subscriber {}".format(info.last_subscription_handle))
+            self._writer._cvDiscovery.acquire()
+            self._writer._matched_reader += 1
+            self._writer.participant_handles.push_back(info.last_subscription_handle)
+            self._writer._cvDiscovery.notify()
+            self._writer._cvDiscovery.release()
+            
+        else:
+            print ("Publisher unmatched subscriber {}".format(info.last_subscription_handle))
+            self._writer._cvDiscovery.acquire()
+            # Attempt to remove the handle correctly
+            try:
+                # Find the index of the handle to remove
+                index = [i for i, handle in enumerate(self._writer.participant_handles) if handle == info.last_subscription_handle][0]
+                # Convert index to iterator and erase
+                it = self._writer.participant_handles.begin()
+                for _ in range(index):
+                    it.next()
+                self._writer.participant_handles.erase(it)
+                self._writer._matched_reader -= 1
+                self._writer._cvDiscovery.notify()
+            except (IndexError, Exception) as e:
+                print(f"Failed to remove participant handle due to: {str(e)}")
+            self._writer._cvDiscovery.release()
+        
+
+class Writer:
+    """
+    Default DDS writer class for FastDDS using SimpleMessage or WarningPayload.
+
+    Attributes:
+        _matched_reader (int): Count of matched readers.
+        _cvDiscovery (Condition): Condition variable for discovery synchronization.
+        alive (bool): Flag to indicate if the writer is alive.
+        participant_qos: Quality of Service settings for the DDS participant.
+        participant: The DDS participant.
+        topic_data_type: Data type for the DDS topic.
+        type_support: DDS type support.
+        topic_qos: Quality of Service settings for the DDS topic.
+        topic: The DDS topic.
+        publisher_qos: Quality of Service settings for the DDS publisher.
+        publisher: The DDS publisher.
+        listener: Listener for DDS writer events.
+        writer_qos: Quality of Service settings for the DDS data writer.
+        writer: The DDS data writer.
+    """
+
+    def __init__(self, profile: str, data_name: str, topic_name: Optional[str] = None,
+                 data_sharing: Optional[str] = None, settings=None) -> None:
+        """
+        Initialize the DDS data writer.
+
+        :param profile: The DDS profile name.
+        :param data_name: The name of the DDS data.
+        :param topic_name: The name of the DDS topic, defaults to the data name followed by "Topic".
+        :param data_sharing: The data-sharing mode, None to keep the profile default.
+        :param settings: The DDS settings (DdsConfig) with the QoS overrides, None to keep the defaults.
+        """
+        self._matched_reader = 0
+        self._cvDiscovery = Condition()
+        self.alive = True
+        self.participant_handles = fastdds.InstanceHandleVector()  # Store handles here
+
+        # Create a DDS participant
+        factory = fastdds.DomainParticipantFactory.get_instance()
+        self.participant_qos = fastdds.DomainParticipantQos()
+        factory.get_default_participant_qos(self.participant_qos)
+        participant = create_participant(profile, settings.flow_controller_rate if settings is not None else None)
+        self.participant = participant
+        
+        # Register the DDS data type
+        if data_name in DATA_TYPES:
+            self.topic_data_type = DATA_TYPES[data_name]()
+        else:
+            raise ValueError("Invalid data name")
+        
+        self.topic_data_type.setName(data_name)
+        self.type_support = fastdds.TypeSupport(self.topic_data_type)
+        self.participant.register_type(self.type_support)
+
+        # Create a DDS topic
+        self.topic_qos = fastdds.TopicQos()
+        self.participant.get_default_topic_qos(self.topic_qos)
+        self.topic = self.participant.create_topic(topic_name or data_name + "Topic", self.topic_data_type.getName(), self.topic_qos)
+
+        # Create a DDS publisher
+        self.publisher_qos = fastdds.PublisherQos()
+        self.participant.get_default_publisher_qos(self.publisher_qos)
+        self.publisher = self.participant.create_publisher(self.publisher_qos)
+
+        # Create a writer listener
+        self.listener = WriterListener(self)
+
+        # Create a DDS data writer
+        self.writer_qos = fastdds.DataWriterQos()
+        self.publisher.get_default_datawriter_qos(self.writer_qos)
+        configure_data_sharing(self.writer_qos, data_sharing)
+        if settings is not None:
+            configure_qos(self.writer_qos, settings)
+            configure_publish_mode(self.writer_qos, settings)
+        self.writer = self.publisher.create_datawriter(self.topic, self.writer_qos, self.listener)
+
+    def print_locator_info(self, locator_list):
+        """
+        Helper function to print information from a LocatorList.
+        Assumes that locator_list provides a method to access its size and elements by index.
+        """
+        for i in range(locator_list.size()):
+            locator = locator_list.get_locator_at(i)
+            if locator.kind == fastdds.LOCATOR_KIND_TCPv4 or locator.kind == fastdds.LOCATOR_KIND_UDPv4:
+                ip = '.'.join(str(octet) for octet in locator.address[:4])
+                port = locator.port
+                print(f"Locator IP: {ip}, Port: {port}")
+            else:
+                print("Non-IPv4 locator found.")
+
+    def discover_and_print_participants(self):
+        """
+        Discover and print locator information for participants.
+        """
+
+        # Accessing the metatraffic locator lists
+        metatraffic_multicast = self.participant_qos.wire_protocol().default_multicast_locator_list
+        metatraffic_unicast = self.participant_qos.wire_protocol().default_unicast_locator_list
+
+        print("Metatraffic Multicast Locators:")
+        self.print_locator_info(metatraffic_multicast)
+
+        print("Metatraffic Unicast Locators:")
+        self.print_locator_info(metatraffic_unicast)
+        
+    def wait_discovery(self, readers: int = 1, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for DDS discovery to complete.
+
+        :param readers: Number of matched readers to wait for.
+        :param timeout: Seconds to wait at most, None to wait forever.
+        :return: False if the timeout expired before enough readers matched.
+        """
+        self._cvDiscovery.acquire()
+        print ("Writer is waiting discovery...")
+        matched = self._cvDiscovery.wait_for(lambda : self._matched_reader >= readers, timeout)
+        self._cvDiscovery.release()
+        print("Writer discovery finished...")
+        return matched
+
+    def stop(self) -> None:
+        """
+        Set the alive flag to False to handle the DDS writer shutdown.
+        """
+        self.alive = False
+    
+    def delete(self):
+        """
+        Delete the DDS writer and participant.
+        """
+        factory = fastdds.DomainParticipantFactory.get_instance()
+        self.participant.delete_contained_entities()
+        factory.delete_participant(self.participant)
+
+
+class ReaderListener(fastdds.DataReaderListener):
+    """
+    Default DDS reader listener class for FastDDS.
+
+    Attributes:
+        None
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize the DDS reader listener.
+        """
+        super().__init__()
+    
+    def on_subscription_matched(self, datareader, info) -> None:
+        """
+        Callback when a subscription is matched by a publisher.
+
+        :param datareader: The DDS data reader.
+        :param info: Information about the matched subscription.
+        """
+        if (0 < info.current_count_change) :
+            print ("Subscriber matched publisher {}".format(info.last_publication_handle))
+        else :
+            print ("Subscriber unmatched publisher {}".format(info.last_publication_handle))
+    
+    def on_data_available(self, reader) -> None:
+        """
+        Placeholder for data avaliable in the DDS reader listener.
+        """
+        pass
+
+
+class Reader:
+    """
+    Default DDS reader class for FastDDS using SimpleMessage or WarningPayload.
+
+    Attributes:
+        alive (bool): Flag to indicate if the reader is alive.
+        participant_qos: Quality of Service settings for the DDS participant.
+        participant: The DDS participant.
+        topic_data_type: Data type for the DDS topic.
+        type_support: DDS type support.
+        topic_qos: Quality of Service settings for the DDS topic.
+        topic: The DDS topic.
+        subscriber_qos: Quality of Service settings for the DDS subscriber.
+        subscriber: The DDS subscriber.
+        listener: Listener for DDS reader events.
+        reader_qos: Quality of Service settings for the DDS data reader.
+        reader: The DDS data reader.
+    """
+
+    def __init__(self, profile: str, data_name: str, topic_name: str, listener: Optional[ReaderListener] = None,
+                 data_sharing: Optional[str] = None, settings=None) -> None:
+        """
+        Initialize the DDS data reader.
+
+        :param profile: The DDS profile name.
+        :param data_name: The name of the DDS data.
+        :param topic_name: The name of the DDS topic.
+        :param listener: Listener for DDS reader events.
+        :param data_sharing: The data-sharing mode, None to keep the profile default.
+        :param settings: The DDS settings (DdsConfig) with the QoS overrides, None to keep the defaults.
+        """
+        self.alive = True
+
+        # Create a DDS participant
+        factory = fastdds.DomainParticipantFactory.get_instance()
+        self.participant_qos = fastdds.DomainParticipantQos()
+        factory.get_default_participant_qos(self.participant_qos)
+        participant = factory.create_participant_with_profile(profile)
+        self.participant = participant
+
+        # Register the DDS data type
+        if data_name in DATA_TYPES:
+            self.topic_data_type = DATA_TYPES[data_name]()
+        else:
+            raise ValueError("DDS Reader data name specified not supported")
+        
+        self.topic_data_type.setName(data_name)
+        self.type_support = fastdds.TypeSupport(self.topic_data_type)
+        self.participant.register_type(self.type_support)
+
+        # Create a DDS topic
+        self.topic_qos = fastdds.TopicQos()
+        self.participant.get_default_topic_qos(self.topic_qos)
+        self.topic = self.participant.create_topic(topic_name, self.topic_data_type.getName(), self.topic_qos)
+
+        # Create a DDS subscriber
+        self.subscriber_qos = fastdds.SubscriberQos()
+        self.participant.get_default_subscriber_qos(self.subscriber_qos)
+        self.subscriber = self.participant.create_subscriber(self.subscriber_qos)
+
+        # Set a custom listener if provided
+        if listener is None:
+            self.listener = ReaderListener()
+        else:
+            self.listener = listener
+        
+        # Create a DDS data reader
+        self.reader_qos = fastdds.DataReaderQos()
+        self.subscriber.get_default_datareader_qos(self.reader_qos)
+        configure_data_sharing(self.reader_qos, data_sharing)
+        if settings is not None:
+            configure_qos(self.reader_qos, settings)
+        self.reader = self.subscriber.create_datareader(self.topic, self.reader_qos, self.listener)
+
+    def stop(self) -> None:
+        """
+        Set the alive flag to False to handle the DDS reader shutdown.
+        """
+        self.alive = False
+    
+    def delete(self):
+        """
+        Delete the DDS reader and participant.
+        """
+        factory = fastdds.DomainParticipantFactory.get_instance()
+        self.participant.delete_contained_entities()
+        factory.delete_participant(self.participant)
+
+
+class CallbackReaderListener(ReaderListener):
+    """
+    DDS reader listener forwarding every message to a callback.
+    A single sample is allocated and reused for every take, the callback receives a view over it.
+
+    Attributes:
+        callback: Function called with the raw message.
+        data_name (str): The name of the DDS data.
+        data: The reused sample.
+    """
+
+    def __init__(self, callback: MessageCallback, data_name: str) -> None:
+        """
+        Initialize the DDS reader listener.
+
+        :param callback: Function called with the raw message.
+        :param data_name: The name of the DDS data.
+        """
+        super().__init__()
+        self.callback = callback
+        self.data_name = data_name
+        self.data = getattr(SimpleMessage, data_name)()
+
+    def on_data_available(self, reader) -> None:
+        """
+        Take the available samples and forward their message to the callback.
+
+        :param reader: The DDS data reader.
+        """
+        info = fastdds.SampleInfo()
+        while reader.take_next_sample(self.data, info) == fastdds.RETCODE_OK:
+            if info.valid_data:
+                self.callback(read_message(self.data_name, self.data))
+
+
+def write_message(data_name: str, message, data):
+    """
+    Fill a sample with a message.
+
+    :param data_name: The name of the DDS data.
+    :param message: The message bytes.
+    :param data: The sample to fill.
+    :return: The filled sample.
+    """
+    if data_name == "BinaryMessage":
+        return operations.BuildBinaryMessage(message, data)
+    if data_name == "PlainMessage":
+        return operations.BuildPlainMessage(message, data)
+    # SimpleMessage carries a CDR string, which cannot hold the NUL bytes of the binary header
+    data.message(base64.b64encode(message).decode('ascii'))
+    return data
+
+
+def read_message(data_name: str, data):
+    """
+    Extract the message of a sample.
+
+    :param data_name: The name of the DDS data.
+    :param data: The received sample.
+    :return: The message bytes.
+    """
+    if data_name == "BinaryMessage":
+        return operations.ReadBinaryMessage(data)
+    if data_name == "PlainMessage":
+        return operations.ReadPlainMessage(data)
+    return base64.b64decode(data.message())
+
+
+def topic_name(config, channel: str) -> str:
+    """
+    :param config: The benchmark configuration.
+    :param channel: The channel.
+    :return: The DDS topic of the channel.
+    """
+    topic = config.dds.topic or config.dds.data_name + "Topic"
+    return topic + "Reply" if channel == REPLY_CHANNEL else topic
+
+
+class DdsPublisher(TransportPublisher):
+    """
+    Fast DDS publisher built on the default Writer.
+
+    Attributes:
+        writer (Writer): The DDS writer.
+        data: The sample reused for every write.
+    """
+
+    def __init__(self, config, channel: str = DATA_CHANNEL) -> None:
+        """
+        Initialize the DDS publisher.
+
+        :param config: The benchmark configuration.
+        :param channel: The channel to use.
+        """
+        super().__init__(config, channel)
+        self.writer = None
+        self.data = None
+
+    def open(self) -> None:
+        """
+        Create the DDS participant and data writer.
+        """
+        print(f"Creating participant with profile: {self.config.dds.profile}")
+        self.writer = Writer(self.config.dds.profile, self.config.dds.data_name,
+                             topic_name(self.config, self.channel), self.config.dds.data_sharing, self.config.dds)
+        self.data = getattr(SimpleMessage, self.config.dds.data_name)()
+
+    def wait_ready(self, subscribers: int = 1, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the matched reader count to reach the number of subscribers.
+
+        :param subscribers: Number of subscribers to wait for.
+        :param timeout: Seconds to wait at most, None to wait forever.
+        :return: False if the timeout expired before every subscriber was ready.
+        """
+        return self.writer.wait_discovery(subscribers, timeout)
+
+    def send(self, message: bytes) -> None:
+        """
+        Write a message in the reused sample.
+
+        :param message: The serialized message.
+        """
+        self.writer.writer.write(write_message(self.config.dds.data_name, message, self.data))
+        if self.config.dds.data_name == "SimpleMessage":
+            # base64 encoding, ascii decoding and the copy into the std::string of the sample
+            self.bytes_copied += 3 * 4 * ((len(message) + 2) // 3)
+        else:
+            # single copy into the octets of the sample, through a view of their storage
+            self.bytes_copied += len(message)
+
+    def close(self) -> None:
+        """
+        Delete the DDS writer and participant.
+        """
+        self.writer.delete()
+
+
+class DdsSubscriber(TransportSubscriber):
+    """
+    Fast DDS subscriber built on the default Reader.
+
+    Attributes:
+        reader (Reader): The DDS reader.
+    """
+
+    def __init__(self, config, channel: str = DATA_CHANNEL) -> None:
+        """
+        Initialize the DDS subscriber.
+
+        :param config: The benchmark configuration.
+        :param channel: The channel to use.
+        """
+        super().__init__(config, channel)
+        self.reader = None
+
+    def open(self, callback: MessageCallback) -> None:
+        """
+        Create the DDS participant and data reader.
+
+        :param callback: Function called with the raw message.
+        """
+        print(f"Creating participant with profile: {self.config.dds.profile}")
+        self.reader = Reader(self.config.dds.profile, self.config.dds.data_name, topic_name(self.config, self.channel),
+                             CallbackReaderListener(callback, self.config.dds.data_name),
+                             self.config.dds.data_sharing, self.config.dds)
+
+    def close(self) -> None:
+        """
+        Delete the DDS reader and participant.
+        """
+        self.reader.delete()
+
+
+def create_publisher(config, channel: str = DATA_CHANNEL) -> DdsPublisher:
+    return DdsPublisher(config, channel)
+
+
+def create_subscriber(config, channel: str = DATA_CHANNEL) -> DdsSubscriber:
+    return DdsSubscriber(config, channel)
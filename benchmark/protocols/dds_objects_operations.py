@@ -0,0 +1,124 @@
+from typing import Dict, Optional
+
+import build.SimpleMessage as SimpleMessage
+
+from benchmark.schema import Schema
+
+
+def BuildSimpleMessage(object_info: dict) -> SimpleMessage.SimpleMessage:
+    """
+    Build a SimpleMessage DDS object from a dictionary.
+
+    :param object_info: The dictionary containing the object information.
+    :return: The SimpleMessage DDS object.
+    """
+    dds_object = SimpleMessage.SimpleMessage() 
+    dds_object.message(object_info['message'])
+    return dds_object
+
+
+def ReadSimpleMessage(dds_object: SimpleMessage.SimpleMessage) -> dict:
+    """
+    Read a SimpleMessage DDS object and return a dictionary.
+
+    :param dds_object: The SimpleMessage DDS object.
+    :return: The dictionary containing the object information.
+    """
+    object_info = {}
+    object_info['message'] = dds_object.message()
+
+    return object_info
+
+
+def _octets_view(data_name: str, octets, writable: bool) -> memoryview:
+    """
+    Expose the octets of a generated sequence or array member as a buffer over the C++ storage.
+    Without get_buffer() every octet would go through the SWIG proxy, taking seconds for a 4MB message,
+    so such bindings raise a RuntimeError instead.
+
+    :param data_name: The data type name, for the error message.
+    :param octets: The std::vector<uint8_t> or std::array<uint8_t> proxy.
+    :param writable: Whether the buffer is written to.
+    :return: A buffer over the octets.
+    """
+    view = memoryview(octets.get_buffer()) if hasattr(octets, 'get_buffer') else None
+    if view is None or (writable and view.readonly):
+        raise RuntimeError(f"The {data_name} bindings expose no {'writable ' if writable else ''}get_buffer(), "
+                           f"regenerate them from SimpleMessage.idl with a Fast DDS-Gen that does")
+    return view
+
+
+def BuildBinaryMessage(buffer, dds_object: Optional[SimpleMessage.BinaryMessage] = None) -> SimpleMessage.BinaryMessage:
+    """
+    Build a BinaryMessage DDS object carrying the bytes of a buffer.
+
+    :param buffer: The message bytes.
+    :param dds_object: A BinaryMessage to reuse instead of allocating a new one.
+    :return: The BinaryMessage DDS object.
+    """
+    if dds_object is None:
+        dds_object = SimpleMessage.BinaryMessage()
+    octets = dds_object.data()
+    octets.resize(len(buffer))
+    _octets_view("BinaryMessage", octets, True)[:] = buffer
+    return dds_object
+
+
+def ReadBinaryMessage(dds_object: SimpleMessage.BinaryMessage) -> memoryview:
+    """
+    Read the bytes of a BinaryMessage DDS object.
+
+    :param dds_object: The BinaryMessage DDS object.
+    :return: A view over the message bytes, only valid while the object is not reused.
+    """
+    return _octets_view("BinaryMessage", dds_object.data(), False)
+
+
+def BuildPlainMessage(buffer, dds_object: Optional[SimpleMessage.PlainMessage] = None) -> SimpleMessage.PlainMessage:
+    """
+    Build a PlainMessage DDS object carrying the bytes of a buffer.
+
+    :param buffer: The message bytes, at most PLAIN_MESSAGE_CAPACITY long.
+    :param dds_object: A PlainMessage to reuse instead of allocating a new one.
+    :return: The PlainMessage DDS object.
+    """
+    if len(buffer) > SimpleMessage.PLAIN_MESSAGE_CAPACITY:
+        raise ValueError(f"Message of {len(buffer)} bytes exceeds the PlainMessage capacity")
+    if dds_object is None:
+        dds_object = SimpleMessage.PlainMessage()
+    _octets_view("PlainMessage", dds_object.data(), True)[:len(buffer)] = buffer
+    dds_object.length(len(buffer))
+    return dds_object
+
+
+def ReadPlainMessage(dds_object: SimpleMessage.PlainMessage) -> memoryview:
+    """
+    Read the bytes of a PlainMessage DDS object.
+
+    :param dds_object: The PlainMessage DDS object.
+    :return: A view over the message bytes, only valid while the object is not reused.
+    """
+    return _octets_view("PlainMessage", dds_object.data(), False)[:dds_object.length()]
+
+
+def BuildTypedMessage(schema: Schema, arrays: Dict, dds_object: Optional[SimpleMessage.BinaryMessage] = None) -> SimpleMessage.BinaryMessage:
+    """
+    Build a BinaryMessage DDS object carrying a typed message, serialized as over the other transports.
+
+    :param schema: The typed message schema.
+    :param arrays: The array of every field, by field name.
+    :param dds_object: A BinaryMessage to reuse instead of allocating a new one.
+    :return: The BinaryMessage DDS object.
+    """
+    return BuildBinaryMessage(schema.encode(arrays), dds_object)
+
+
+def ReadTypedMessage(schema: Schema, dds_object: SimpleMessage.BinaryMessage) -> Dict:
+    """
+    Read a typed message from a BinaryMessage DDS object, without copying its arrays when the bindings expose the octets.
+
+    :param schema: The typed message schema.
+    :param dds_object: The BinaryMessage DDS object.
+    :return: A numpy view of every field, by field name, only valid while the object is not reused.
+    """
+    return schema.decode(ReadBinaryMessage(dds_object))
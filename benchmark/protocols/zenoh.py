@@ -0,0 +1,257 @@
+import importlib
+import json
+import threading
+from typing import Optional
+
+import zenoh
+
+from benchmark import message
+from benchmark.protocols.base import DATA_CHANNEL, REPLY_CHANNEL, MessageCallback, TransportPublisher, TransportSubscriber
+
+# Messages the shared memory pool holds when its size is not configured
+SHM_POOL_MESSAGES = 16
+
+
+def _ready_key(key: str) -> str:
+    """
+    :param key: The key expression of a channel.
+    :return: The key expression prefix of the liveliness tokens of the subscribers ready on the channel.
+    """
+    return f"{key}/ready"
+
+
+def _session_config(config) -> zenoh.Config:
+    """
+    :param config: The benchmark configuration.
+    :return: The Zenoh session configuration, with the shared memory transport enabled as configured.
+    """
+    session_config = zenoh.Config()
+    session_config.insert_json5("transport/shared_memory/enabled", json.dumps(config.zenoh.shared_memory))
+    return session_config
+
+
+def _shm_module():
+    """
+    :return: The shared memory API of eclipse-zenoh (1.x builds that ship it), None if unavailable.
+    """
+    try:
+        return importlib.import_module("zenoh.shm")
+    except ImportError:
+        return None
+
+
+class ZenohPublisher(TransportPublisher):
+    """
+    Zenoh publisher.
+
+    With `config.zenoh.shared_memory` the messages are copied into buffers allocated from a shared memory
+    provider, and Zenoh hands same-host subscribers a reference to the segment instead of the bytes.
+    Messages fall back to regular buffers when the installed Zenoh has no shared memory API, or one at a
+    time when the pool is exhausted. Subscribers announce themselves with liveliness tokens.
+
+    Attributes:
+        key (str): The key expression of the channel.
+        session: The Zenoh session.
+        publisher: The Zenoh publisher declared on the key.
+        provider: The shared memory provider, None when sending regular buffers.
+        shm_sent (int): Messages sent from shared memory.
+        shm_fallbacks (int): Messages sent as regular buffers because the pool was exhausted.
+    """
+
+    def __init__(self, config, channel: str = DATA_CHANNEL) -> None:
+        """
+        Initialize the Zenoh publisher.
+
+        :param config: The benchmark configuration.
+        :param channel: The channel to use.
+        """
+        super().__init__(config, channel)
+        self.key = config.zenoh.reply_key if channel == REPLY_CHANNEL else config.zenoh.key
+        self.session = None
+        self.publisher = None
+        self.provider = None
+        self.shm_sent = 0
+        self.shm_fallbacks = 0
+        self._policy = None
+
+    def open(self) -> None:
+        """
+        Open the Zenoh session, declare the publisher and create the shared memory pool if enabled.
+        """
+        self.session = zenoh.open(_session_config(self.config))
+        self.publisher = self.session.declare_publisher(self.key)
+        if self.config.zenoh.shared_memory:
+            self._open_provider()
+        print(f"Publisher is sending data to resource: {self.key}" + (" (shared memory)" if self.provider else ""))
+
+    def wait_ready(self, subscribers: int = 1, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the liveliness tokens of the subscribers, declared once their subscriber is.
+
+        :param subscribers: Number of subscribers to wait for.
+        :param timeout: Seconds to wait at most, None to wait forever.
+        :return: False if the timeout expired before every subscriber was ready.
+        """
+        tokens = set()
+        condition = threading.Condition()
+
+        def on_token(sample) -> None:
+            with condition:
+                if sample.kind == zenoh.SampleKind.PUT:
+                    tokens.add(str(sample.key_expr))
+                else:
+                    tokens.discard(str(sample.key_expr))
+                condition.notify()
+
+        # History replays the tokens declared before this call
+        watcher = self.session.liveliness().declare_subscriber(f"{_ready_key(self.key)}/*", on_token, history=True)
+        try:
+            with condition:
+                return condition.wait_for(lambda: len(tokens) >= subscribers, timeout)
+        finally:
+            watcher.undeclare()
+
+    def _open_provider(self) -> None:
+        """
+        Create the shared memory provider, or report why messages are sent as regular buffers.
+        """
+        shm = _shm_module()
+        if shm is None:
+            print("This Zenoh build has no shared memory API, sending regular buffers")
+            return
+        size = self.config.zenoh.shm_pool_size or SHM_POOL_MESSAGES * (message.HEADER_SIZE + self.config.payload_size)
+        try:
+            self.provider = shm.ShmProvider.default_backend(size)
+        except zenoh.ZError as error:
+            print(f"Shared memory pool of {size} bytes unavailable ({error}), sending regular buffers")
+            return
+        # Reclaim the buffers released by the subscribers before giving up on an allocation
+        self._policy = shm.GarbageCollect()
+
+    def send(self, data) -> None:
+        """
+        Publish a message.
+        Zenoh copies the message into its own buffer when converting it to ZBytes, or the message is
+        copied into a shared memory buffer: the same single copy, the shared memory saves the socket transfer.
+
+        :param data: The serialized message.
+        """
+        if self.provider is not None:
+            try:
+                buffer = self.provider.alloc(len(data), self._policy)
+            except zenoh.ZError:
+                self.shm_fallbacks += 1
+            else:
+                try:
+                    # Copy the message once, straight into the shared memory segment
+                    memoryview(buffer)[:] = data
+                except TypeError:
+                    # Builds whose buffers expose no writable view only take bytes-like objects owning their memory
+                    if isinstance(data, memoryview):
+                        data = data.tobytes()
+                        self.bytes_copied += len(data)
+                    buffer[:] = data
+                self.publisher.put(buffer)
+                self.bytes_copied += len(data)
+                self.shm_sent += 1
+                return
+        self.publisher.put(data)
+        self.bytes_copied += len(data)
+
+    def report(self) -> None:
+        """
+        Print the messages sent from shared memory.
+        """
+        if self.provider is not None:
+            print(f"Shared memory: {self.shm_sent} messages sent, {self.shm_fallbacks} as regular buffers "
+                  f"(pool exhausted)")
+
+    def close(self) -> None:
+        """
+        Undeclare the publisher and close the session.
+        """
+        self.publisher.undeclare()
+        self.session.close()
+
+
+class ZenohSubscriber(TransportSubscriber):
+    """
+    Zenoh subscriber.
+
+    Payloads received from shared memory are mapped by Zenoh, but the Python API exposes no buffer view
+    over them, so the callback still receives a copy.
+
+    Attributes:
+        key (str): The key expression of the channel.
+        session: The Zenoh session.
+        subscriber: The Zenoh subscriber declared on the key.
+        token: The liveliness token announcing the subscriber to the publishers.
+        shm_received (int): Messages delivered via shared memory, still copied out of the segment on receipt.
+        received (int): Messages received.
+    """
+
+    def __init__(self, config, channel: str = DATA_CHANNEL) -> None:
+        """
+        Initialize the Zenoh subscriber.
+
+        :param config: The benchmark configuration.
+        :param channel: The channel to use.
+        """
+        super().__init__(config, channel)
+        self.key = config.zenoh.reply_key if channel == REPLY_CHANNEL else config.zenoh.key
+        self.session = None
+        self.subscriber = None
+        self.token = None
+        self.shm_received = 0
+        self.received = 0
+
+    def open(self, callback: MessageCallback) -> None:
+        """
+        Open the Zenoh session, declare the subscriber and announce it.
+
+        :param callback: Function called with the raw message.
+        """
+        self.session = zenoh.open(_session_config(self.config))
+        print(f"Subscriber is subscribing to resource: {self.key}")
+        if self.config.zenoh.shared_memory and _shm_module() is not None:
+            self.subscriber = self.session.declare_subscriber(self.key, lambda sample: self._receive(sample, callback))
+        else:
+            self.subscriber = self.session.declare_subscriber(
+                self.key, lambda sample: callback(sample.payload.to_bytes()))
+        self.token = self.session.liveliness().declare_token(f"{_ready_key(self.key)}/{self.session.zid()}")
+
+    def _receive(self, sample, callback: MessageCallback) -> None:
+        """
+        Count the payloads delivered through shared memory and pass a copy of the message on.
+
+        :param sample: The received sample.
+        :param callback: Function called with the raw message.
+        """
+        payload = sample.payload
+        self.received += 1
+        if payload.as_shm() is not None:
+            self.shm_received += 1
+        callback(payload.to_bytes())
+
+    def report(self) -> None:
+        """
+        Print the messages delivered via shared memory.
+        """
+        if self.received:
+            print(f"Shared memory: {self.shm_received}/{self.received} messages delivered via shm, copied on receipt")
+
+    def close(self) -> None:
+        """
+        Undeclare the subscriber and its token and close the session.
+        """
+        self.token.undeclare()
+        self.subscriber.undeclare()
+        self.session.close()
+
+
+def create_publisher(config, channel: str = DATA_CHANNEL) -> ZenohPublisher:
+    return ZenohPublisher(config, channel)
+
+
+def create_subscriber(config, channel: str = DATA_CHANNEL) -> ZenohSubscriber:
+    return ZenohSubscriber(config, channel)
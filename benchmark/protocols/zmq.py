@@ -0,0 +1,328 @@
+import asyncio
+import threading
+import time
+import zmq
+import zmq.asyncio
+from contextlib import suppress
+from typing import Optional
+from zmq.utils.monitor import recv_monitor_message
+
+from benchmark import message
+from benchmark.protocols.base import DATA_CHANNEL, REPLY_CHANNEL, MessageCallback, TransportPublisher, TransportSubscriber
+
+# Poll period used by the receive thread to check for shutdown
+POLL_TIMEOUT_MS = 100
+# Pattern -> (publisher socket type, subscriber socket type).
+# XPUB is a PUB socket that also reports the subscriptions, for the readiness handshake.
+PATTERNS = {
+    "pubsub": (zmq.XPUB, zmq.SUB),
+    "pushpull": (zmq.PUSH, zmq.PULL),
+    "radiodish": (zmq.RADIO, zmq.DISH),
+}
+
+
+def _context(config, context_class=zmq.Context):
+    """
+    Create the ZeroMQ context of a socket. inproc endpoints only connect sockets of the same context,
+    so they all use the process-wide instance.
+
+    :param config: The benchmark configuration.
+    :param context_class: The context class, synchronous or asyncio.
+    :return: The context, and whether the socket owns it and must terminate it.
+    """
+    if config.zmq.publisher_address.startswith("inproc://"):
+        shared = zmq.Context.instance(config.zmq.io_threads)
+        return (shared, False) if context_class is zmq.Context else (context_class.shadow(shared.underlying), False)
+    return context_class(config.zmq.io_threads), True
+
+
+def _socket(config, context, side: int):
+    """
+    Create a socket of the configured pattern.
+
+    :param config: The benchmark configuration.
+    :param context: The ZeroMQ context.
+    :param side: 0 for the publisher socket, 1 for the subscriber socket.
+    :return: The socket.
+    """
+    if config.zmq.pattern not in PATTERNS:
+        raise ValueError(f"Unknown ZeroMQ pattern '{config.zmq.pattern}', expected one of {sorted(PATTERNS)}")
+    if config.zmq.pattern == "radiodish" and not zmq.has("draft"):
+        raise RuntimeError("The radiodish pattern needs libzmq and pyzmq built with draft support")
+    socket = context.socket(PATTERNS[config.zmq.pattern][side])
+    options = ((zmq.SNDHWM, config.zmq.send_hwm), (zmq.SNDBUF, config.zmq.send_buffer)) if side == 0 else \
+        ((zmq.RCVHWM, config.zmq.receive_hwm), (zmq.RCVBUF, config.zmq.receive_buffer))
+    for option, value in options:
+        if value is not None:
+            socket.setsockopt(option, value)
+    if side == 0 and config.zmq.pattern == "pubsub":
+        # Report every subscription, not only the first one of a topic
+        socket.setsockopt(zmq.XPUB_VERBOSE, 1)
+    return socket
+
+
+def _group(channel: str) -> str:
+    """
+    :param channel: The channel name.
+    :return: The RADIO/DISH group of the channel.
+    """
+    return f"benchmark-{channel}"
+
+
+class ZmqPublisher(TransportPublisher):
+    """
+    ZeroMQ publisher: an XPUB, PUSH or RADIO socket depending on the configured pattern.
+
+    Attributes:
+        address (str): The endpoint the socket binds to.
+        context: The ZeroMQ context.
+        socket: The publisher socket.
+    """
+
+    def __init__(self, config, channel: str = DATA_CHANNEL) -> None:
+        """
+        Initialize the ZeroMQ publisher.
+
+        :param config: The benchmark configuration.
+        :param channel: The channel to use.
+        """
+        super().__init__(config, channel)
+        self.address = config.zmq.reply_publisher_address if channel == REPLY_CHANNEL else config.zmq.publisher_address
+        self.context = None
+        self.socket = None
+        self._owns_context = True
+        self._group = _group(channel) if config.zmq.pattern == "radiodish" else None
+
+    def open(self) -> None:
+        """
+        Create the ZeroMQ context and bind the publisher socket.
+        """
+        self.context, self._owns_context = _context(self.config)
+        self.socket = _socket(self.config, self.context, 0)
+        self.socket.bind(self.address)
+        print(f"Publisher is instantiated at {self.address} ({self.config.zmq.pattern})...")
+
+    def wait_ready(self, subscribers: int = 1, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the subscriptions of the subscribers (PUB/SUB) or their connections (PUSH/PULL).
+        A subscription reported by the XPUB socket is in place, so no message is lost to a slow joiner.
+
+        :param subscribers: Number of subscribers to wait for.
+        :param timeout: Seconds to wait at most, None to wait forever.
+        :return: False if the timeout expired before every subscriber was ready.
+        """
+        pattern = self.config.zmq.pattern
+        if pattern == "radiodish":
+            print("RADIO/DISH has no readiness signal, use --startup-delay to let the subscribers join")
+            return True
+        if pattern == "pushpull" and self.address.startswith("inproc://"):
+            # inproc connections have no handshake, and PUSH holds the messages until a subscriber connects
+            return True
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        source = self.socket if pattern == "pubsub" else self.socket.get_monitor_socket(zmq.EVENT_HANDSHAKE_SUCCEEDED)
+        ready = 0
+        try:
+            while ready < subscribers:
+                remaining = None if deadline is None else max(deadline - time.monotonic(), 0.0) * 1000
+                if not source.poll(remaining):
+                    return False
+                if source is self.socket:
+                    # Subscription frames start with 1, unsubscriptions with 0
+                    ready += 1 if source.recv()[:1] == b"\x01" else -1
+                else:
+                    recv_monitor_message(source)
+                    ready += 1
+        finally:
+            if source is not self.socket:
+                self.socket.disable_monitor()
+                source.close()
+        return True
+
+    def send(self, data: bytes) -> Optional[zmq.MessageTracker]:
+        """
+        Send a message on the publisher socket.
+        In zero-copy mode the frame references the message buffer, which must stay untouched
+        until the returned tracker is done. In multipart mode the header is sent as a first frame
+        and only the payload frame references the buffer.
+
+        :param data: The serialized message.
+        :return: The frame tracker in zero-copy mode, None otherwise.
+        """
+        zero_copy = self.config.publish_mode == "zero-copy"
+        if self._group is not None:
+            frame = zmq.Frame(data, copy=not zero_copy, track=zero_copy)
+            frame.group = self._group
+            self.socket.send(frame, copy=False)
+            if zero_copy:
+                return frame.tracker
+            self.bytes_copied += len(data)
+            return None
+
+        if self.config.zmq.multipart:
+            view = memoryview(data)
+            self.socket.send(view[:message.HEADER_SIZE], zmq.SNDMORE)
+            self.bytes_copied += message.HEADER_SIZE
+            data = view[message.HEADER_SIZE:]
+        if zero_copy:
+            return self.socket.send(data, copy=False, track=True)
+
+        self.socket.send(data)
+        self.bytes_copied += len(data)
+        return None
+
+    def close(self) -> None:
+        """
+        Close the socket and terminate the context, unless it is shared.
+        """
+        self.socket.close()
+        if self._owns_context:
+            self.context.term()
+
+
+class ZmqSubscriber(TransportSubscriber):
+    """
+    ZeroMQ subscriber: a SUB, PULL or DISH socket depending on the configured pattern,
+    receiving on a background thread.
+
+    Attributes:
+        address (str): The endpoint the socket connects to.
+        context: The ZeroMQ context.
+        socket: The subscriber socket.
+        alive (bool): Flag to indicate if the receive thread should keep running.
+        thread (threading.Thread): The receive thread.
+        task (asyncio.Task): The receive task, when receiving from an event loop.
+    """
+
+    def __init__(self, config, channel: str = DATA_CHANNEL) -> None:
+        """
+        Initialize the ZeroMQ subscriber.
+
+        :param config: The benchmark configuration.
+        :param channel: The channel to use.
+        """
+        super().__init__(config, channel)
+        self.address = config.zmq.reply_subscriber_address if channel == REPLY_CHANNEL else config.zmq.subscriber_address
+        self.context = None
+        self.socket = None
+        self.alive = False
+        self.thread = None
+        self.task = None
+        self._owns_context = True
+
+    def _connect(self, context_class) -> None:
+        """
+        Connect the subscriber socket.
+
+        :param context_class: The ZeroMQ context class, synchronous or asyncio.
+        """
+        self.context, self._owns_context = _context(self.config, context_class)
+        self.socket = _socket(self.config, self.context, 1)
+        self.socket.connect(self.address)
+
+        if self.config.zmq.pattern == "pubsub":
+            # Subscribe to all topics
+            self.socket.setsockopt_string(zmq.SUBSCRIBE, "")
+        elif self.config.zmq.pattern == "radiodish":
+            self.socket.join(_group(self.channel))
+        print(f"Subscriber connected to {self.address} ({self.config.zmq.pattern})...")
+
+    def _terminate(self) -> None:
+        """
+        Close the socket and terminate the context, unless it is shared.
+        """
+        self.socket.close()
+        if self._owns_context:
+            self.context.term()
+
+    def open(self, callback: MessageCallback) -> None:
+        """
+        Connect the subscriber socket and start the receive thread.
+
+        :param callback: Function called with the raw message.
+        """
+        self._connect(zmq.Context)
+        self.alive = True
+        self.thread = threading.Thread(target=self._receive, args=(callback,), daemon=True)
+        self.thread.start()
+
+    def _receive(self, callback: MessageCallback) -> None:
+        """
+        Receive loop, stopped by clearing the alive flag.
+
+        :param callback: Function called with the raw message.
+        """
+        while self.alive:
+            if self.socket.poll(POLL_TIMEOUT_MS):
+                if self.config.zmq.multipart:
+                    callback(self._join(self.socket.recv_multipart(copy=False)))
+                else:
+                    callback(self.socket.recv())
+
+    async def open_async(self, sink) -> None:
+        """
+        Connect an asyncio subscriber socket and receive in a task of the running event loop.
+
+        :param sink: The sink receiving the messages.
+        """
+        self._connect(zmq.asyncio.Context)
+        self.task = asyncio.get_running_loop().create_task(self._receive_async(sink))
+
+    async def _receive_async(self, sink) -> None:
+        """
+        Receive task, stopped by cancellation.
+
+        :param sink: The sink receiving the messages.
+        """
+        while True:
+            if self.config.zmq.multipart:
+                await sink.put(self._join(await self.socket.recv_multipart(copy=False)))
+            else:
+                await sink.put(await self.socket.recv())
+
+    @staticmethod
+    def _join(frames: list):
+        """
+        :param frames: The frames of a multipart message, received without copy.
+        :return: The message, the header and payload frames handed over as they are.
+        """
+        if len(frames) == 1:
+            return frames[0].buffer
+        header, payload = frames
+        return message.Parts(header.buffer, payload.buffer)
+
+    async def close_async(self) -> None:
+        """
+        Cancel the receive task, close the socket and terminate the context.
+        """
+        if self.task is None:
+            await super().close_async()
+            return
+        self.task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self.task
+        self._terminate()
+
+    def close(self) -> None:
+        """
+        Stop the receive thread, close the socket and terminate the context.
+        """
+        self.alive = False
+        self.thread.join()
+        self._terminate()
+
+
+def create_publisher(config, channel: str = DATA_CHANNEL) -> ZmqPublisher:
+    return ZmqPublisher(config, channel)
+
+
+def create_subscriber(config, channel: str = DATA_CHANNEL) -> ZmqSubscriber:
+    return ZmqSubscriber(config, channel)
+
+
+def requires_single_process(config) -> bool:
+    """
+    :param config: The benchmark configuration.
+    :return: True for inproc endpoints, which only connect sockets of the same process.
+    """
+    return config.zmq.publisher_address.startswith("inproc://")
@@ -0,0 +1,269 @@
+import threading
+import time
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from benchmark import message
+from benchmark.clock import ClockSyncClient
+from benchmark.config import BenchmarkConfig
+from benchmark.delivery import DeliveryStatistics
+from benchmark.events import EventKind, open_event_log
+from benchmark.histogram import LatencyHistogram
+from benchmark.pipeline import ProcessingPipeline
+from benchmark.protocols import TransportSubscriber
+from benchmark.resources import ResourceSampler, report_usage
+from benchmark.results import MessageRecords
+from benchmark.schema import SCHEMAS
+from benchmark.startup import StartupTimes
+from benchmark.trials import steady_state_start
+
+
+@dataclass
+class RunResult:
+    """
+    Outcome of a subscriber run.
+
+    Attributes:
+        transport (str): The transport name.
+        payload_size (int): The payload size in bytes.
+        rate (float): The target send rate, 0 for back-to-back.
+        histogram (LatencyHistogram): Latencies in nanoseconds, measured from the intended send time.
+        delivery (dict): Delivery totals, see DeliveryStatistics.summary.
+        subscribers (int): Number of subscribers the publisher fanned out to.
+        send_time (Optional[LatencyHistogram]): Duration of the publisher send calls in nanoseconds,
+            when the publisher ran in this process.
+        per_subscriber (List[RunResult]): Result of every subscriber of a fan-out run.
+        records (Optional[MessageRecords]): Per-message records, kept when `config.results_store` is set.
+        variant (Optional[str]): Description of the middleware settings of the run (DDS profile and QoS, ZeroMQ sockets).
+        startup (Dict[str, float]): Startup phases of the sides of the run in seconds, keyed by role and phase
+            (e.g. "publisher_discovery", "subscriber_first_message").
+        trials (List[RunResult]): Result of every trial, when the run combines several trials of the same point.
+        warmup_excluded (int): Messages excluded from the latency by the steady-state detection.
+        resources (Dict[str, Dict[str, float]]): Resource usage of the sides of the run, keyed by role,
+            see ResourceSampler.stop.
+    """
+    transport: str
+    payload_size: int
+    rate: float
+    histogram: LatencyHistogram
+    delivery: dict
+    subscribers: int = 1
+    send_time: Optional[LatencyHistogram] = None
+    per_subscriber: List["RunResult"] = field(default_factory=list)
+    records: Optional[MessageRecords] = None
+    variant: Optional[str] = None
+    startup: Dict[str, float] = field(default_factory=dict)
+    trials: List["RunResult"] = field(default_factory=list)
+    warmup_excluded: int = 0
+    resources: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
+
+def save_histogram(config: BenchmarkConfig, transport: str, histogram: LatencyHistogram, name: str) -> None:
+    """
+    Save a histogram to `config.histogram_output`, if set.
+
+    :param config: The benchmark configuration.
+    :param transport: The transport name.
+    :param histogram: The histogram to save.
+    :param name: Name of the recorded quantity, for the printed message.
+    """
+    if config.histogram_output:
+        path = config.histogram_output.format(transport=transport)
+        histogram.save(path)
+        print(f"{name} histogram saved to {path}")
+
+
+def exclude_transient(latencies: array, histogram: LatencyHistogram, records: Optional[MessageRecords]) -> int:
+    """
+    Detect the end of the warm-up transient in the latencies of a run, and rebuild its histogram and
+    per-message records without the messages before it.
+
+    :param latencies: Latency of every accepted message, in arrival order.
+    :param histogram: The latency histogram of the run, rebuilt in place.
+    :param records: The per-message records of the run, in the same order, None if not kept.
+    :return: Number of messages excluded.
+    """
+    excluded = steady_state_start(latencies)
+    if excluded:
+        histogram.reset()
+        for latency in latencies[excluded:]:
+            histogram.record(latency)
+        if records is not None:
+            records.drop_first(excluded)
+    print(f"Steady state detected after {excluded} of {len(latencies)} messages, {excluded} excluded from the latency")
+    return excluded
+
+
+class LatencyRecorder:
+    """
+    Latency and delivery accounting of the messages received by a subscriber.
+    With clock synchronization the send timestamps are translated to the local clock before computing latencies.
+
+    Attributes:
+        config (BenchmarkConfig): The benchmark configuration.
+        transport (str): The transport name.
+        histogram (LatencyHistogram): Latencies in nanoseconds.
+        delivery (DeliveryStatistics): Delivery accounting of every publisher.
+        finished (threading.Event): Set once the last message or the end marker of every publisher arrived.
+        last_activity (float): `time.monotonic()` of the last message received.
+        clock_client (Optional[ClockSyncClient]): Clock offset estimation, when enabled.
+        pipeline (Optional[ProcessingPipeline]): Processing stage the accepted messages are handed to, when enabled.
+        uncorrected (int): Latencies recorded before the first clock probe reply.
+        events (Optional[EventLog]): Per-message event recording, when `config.event_log` is set.
+        records (Optional[MessageRecords]): Per-message records for the results store, when `config.results_store` is set.
+        startup (StartupTimes): Startup phases of the subscriber.
+        opened (Optional[float]): `time.perf_counter()` once the subscriber was open, until the first message arrived.
+        ended (set): Identifiers of the publishers whose end marker arrived.
+        warmup_received (int): Warm-up messages received, not accounted for.
+        latencies (Optional[array]): Latency of every accepted message in arrival order, kept for
+            the steady-state detection when `config.warmup_detect` is set.
+        resources (ResourceSampler): Resource sampling of the subscriber process, started once the subscriber is open.
+        received (int): Data messages received, warm-up and duplicates included.
+        bytes_received (int): Bytes of the data messages received.
+        schema (Optional[Schema]): Typed message schema every accepted payload is decoded with, when `config.schema` is set.
+        decode_time (LatencyHistogram): Duration of the typed payload decoding, in nanoseconds.
+        invalid (int): Typed payloads that could not be decoded.
+    """
+
+    def __init__(self, config: BenchmarkConfig, transport: str) -> None:
+        """
+        Initialize the recorder.
+
+        :param config: The benchmark configuration.
+        :param transport: The transport name.
+        """
+        self.config = config
+        self.transport = transport
+        self.histogram = LatencyHistogram(significant_figures=config.histogram_precision)
+        self.delivery = DeliveryStatistics(config.count)
+        self.finished = threading.Event()
+        self.last_activity = time.monotonic()
+        self.clock_client: Optional[ClockSyncClient] = None
+        self.pipeline: Optional[ProcessingPipeline] = None
+        self.uncorrected = 0
+        self.events = open_event_log(config, transport, "subscriber", config.count * max(config.publishers, 1))
+        self.records = MessageRecords() if config.results_store else None
+        self.startup = StartupTimes("subscriber")
+        self.opened: Optional[float] = None
+        self.ended = set()
+        self.warmup_received = 0
+        self.latencies = array("q") if config.warmup_detect else None
+        self.resources = ResourceSampler("subscriber", config.resource_interval)
+        self.received = 0
+        self.bytes_received = 0
+        self.schema = SCHEMAS[config.schema] if config.schema else None
+        self.decode_time = LatencyHistogram(significant_figures=config.histogram_precision)
+        self.invalid = 0
+
+    def record(self, data, receive_ns: int) -> None:
+        """
+        Account for a received message.
+
+        :param data: The received message.
+        :param receive_ns: The receive timestamp, `time.time_ns()`.
+        """
+        # Extract the header and calculate latency
+        header, payload = message.decode(data)
+        if header.flags & message.Flags.CLOCK_REPLY:
+            if self.clock_client is not None:
+                self.clock_client.handle_reply(header, payload, receive_ns)
+            return
+        if header.flags & message.Flags.END:
+            # Messages lost before the end marker will not come, no need to wait for the timeout
+            self.ended.add(header.publisher_id)
+            if len(self.ended) >= self.config.publishers:
+                self.finished.set()
+            return
+        self.received += 1
+        self.bytes_received += len(data)
+        if self.opened is not None:
+            self.startup.record("first_message", time.perf_counter() - self.opened)
+            self.opened = None
+        if header.flags & message.Flags.WARMUP:
+            # Warm-up messages only keep the subscriber from timing out
+            self.warmup_received += 1
+            self.last_activity = time.monotonic()
+            return
+        send_ns = header.timestamp_ns
+        if self.clock_client is not None:
+            offset = self.clock_client.offset(receive_ns)
+            if offset is None:
+                self.uncorrected += 1
+            else:
+                send_ns -= offset
+        latency = receive_ns - send_ns
+        self.last_activity = time.monotonic()
+
+        # Account for the message, duplicates do not count towards latency
+        if not self.delivery.record(header.publisher_id, header.sequence, header.payload_length,
+                                    send_ns, receive_ns):
+            if self.events is not None:
+                self.events.record(EventKind.DUPLICATE, header.flags, header.publisher_id, header.sequence,
+                                   send_ns, receive_ns, len(data))
+            return
+        self.histogram.record(latency)
+        if self.latencies is not None:
+            self.latencies.append(latency)
+        if self.schema is not None:
+            self._decode(payload)
+        if self.pipeline is not None:
+            self.pipeline.submit(data, send_ns)
+        if self.records is not None:
+            self.records.add(header.publisher_id, header.sequence, len(data), send_ns, receive_ns)
+        if self.events is not None:
+            self.events.record(EventKind.RECEIVED, header.flags, header.publisher_id, header.sequence,
+                               send_ns, receive_ns, len(data))
+        if self.delivery.complete(self.config.publishers):
+            self.finished.set()
+
+    def _decode(self, payload: memoryview) -> None:
+        """
+        Expose a typed payload as arrays, as a consumer would, timing the decoding.
+
+        :param payload: The payload of an accepted message.
+        """
+        started = time.perf_counter_ns()
+        try:
+            self.schema.decode(payload)
+        except ValueError as error:
+            if not self.invalid:
+                print(f"Invalid {self.schema.name} payload: {error}")
+            self.invalid += 1
+            return
+        self.decode_time.record(time.perf_counter_ns() - started)
+
+    def result(self, subscriber: TransportSubscriber) -> RunResult:
+        """
+        Print the results, save the histogram and close the event log.
+
+        :param subscriber: The subscriber that received the messages.
+        :return: The latency and delivery of the run.
+        """
+        if self.finished.is_set():
+            print("All packets received.")
+        if self.warmup_received:
+            print(f"Warm-up messages received (not measured): {self.warmup_received}")
+        excluded = exclude_transient(self.latencies, self.histogram, self.records) if self.latencies is not None else 0
+        if self.clock_client is not None:
+            self.clock_client.estimator.report()
+            if self.uncorrected:
+                print(f"Latencies received before the first probe reply (not corrected): {self.uncorrected}")
+        self.histogram.report()
+        if self.schema is not None:
+            print(f"Typed payloads ({self.schema.name}): {self.decode_time.total} decoded, {self.invalid} invalid, "
+                  f"decode p50 {self.decode_time.percentile(50) / 1e3:.1f} us, "
+                  f"p99 {self.decode_time.percentile(99) / 1e3:.1f} us")
+        if self.pipeline is not None:
+            self.pipeline.report()
+        subscriber.report()
+        self.delivery.report()
+        self.startup.report()
+        usage = self.resources.stop(self.received, self.bytes_received)
+        report_usage("subscriber", usage)
+        save_histogram(self.config, self.transport, self.histogram, "Latency")
+        if self.events is not None:
+            self.events.close()
+        return RunResult(self.transport, self.config.payload_size, self.config.rate, self.histogram,
+                         self.delivery.summary(), records=self.records, startup=self.startup.prefixed(),
+                         warmup_excluded=excluded, resources={"subscriber": usage} if usage else {})
@@ -0,0 +1,205 @@
+import dataclasses
+import datetime
+import json
+import os
+import socket
+import statistics
+from importlib import metadata
+from typing import Dict, Iterator, List, Tuple
+
+from benchmark import runner
+from benchmark.config import BenchmarkConfig
+
+# The fixed matrix of the suite: (mode, payload size, rate), rate 0 is back-to-back
+MATRIX = (
+    ("oneway", 1024, 1000.0),
+    ("oneway", 65536, 1000.0),
+    ("oneway", 1048576, 100.0),
+    ("oneway", 65536, 0.0),
+    ("pingpong", 1024, 0.0),
+)
+# Messages per run, the publisher starts as soon as the local subscriber is ready
+SUITE_COUNT = 500
+SUITE_TIMEOUT = 10.0
+DEFAULT_BASELINE = "results/baseline.json"
+DEFAULT_TRIALS = 3
+# Relative change tolerated on top of the trial-to-trial noise
+DEFAULT_TOLERANCE = 0.25
+# Number of scaled median absolute deviations of the baseline trials counted as noise
+NOISE_FACTOR = 3.0
+# Metric -> True when higher is better
+METRICS = {"p50_ms": False, "p99_ms": False, "message_rate": True}
+# Packages whose upgrade the suite guards
+PACKAGES = ("pyzmq", "eclipse-zenoh", "fastdds")
+
+
+def suite_points(config: BenchmarkConfig, transports: List[str]) -> Iterator[Tuple[str, str, BenchmarkConfig]]:
+    """
+    Expand the suite matrix for every transport. The workload options of the configuration that are
+    not part of the matrix (addresses, profiles, publish mode) are kept.
+
+    :param config: The benchmark configuration.
+    :param transports: The transport names.
+    :return: The name, transport and configuration of every point.
+    """
+    for transport in transports:
+        for mode, payload_size, rate in MATRIX:
+            point = dataclasses.replace(config, mode=mode, payload_size=payload_size, rate=rate, count=SUITE_COUNT,
+                                        startup_delay=0.0, timeout=SUITE_TIMEOUT, subscribers=1,
+                                        sweep_payload_sizes=[], sweep_rates=[], sweep_subscribers=[],
+                                        histogram_output=None, event_log=None)
+            yield f"{transport}/{mode}/{payload_size}/{rate:g}", transport, point
+
+
+def _metrics(result: runner.RunResult) -> Dict[str, float]:
+    """
+    :param result: The result of a run.
+    :return: The compared metrics of the run; the message rate only for back-to-back runs.
+    """
+    values = {"p50_ms": result.histogram.percentile(50) / 1e6, "p99_ms": result.histogram.percentile(99) / 1e6}
+    if not result.rate:
+        values["message_rate"] = result.delivery["message_rate"]
+    return values
+
+
+def measure(config: BenchmarkConfig, transports: List[str], trials: int) -> Dict[str, Dict[str, List[float]]]:
+    """
+    Run every point of the suite several times, locally.
+    Transports whose middleware cannot be imported are skipped.
+
+    :param config: The benchmark configuration.
+    :param transports: The transport names.
+    :param trials: Number of runs of every point.
+    :return: The values of every metric over the trials, by point name.
+    """
+    measured = {}
+    unavailable = set()
+    for name, transport, point in suite_points(config, transports):
+        if transport in unavailable:
+            continue
+        for _ in range(trials):
+            try:
+                result = runner.run_local(point, transport)
+            except ImportError as error:
+                print(f"[{transport}] Skipped, the middleware is not available: {error}")
+                unavailable.add(transport)
+                break
+            if not result.histogram.total:
+                raise RuntimeError(f"{name}: no message received")
+            for metric, value in _metrics(result).items():
+                measured.setdefault(name, {}).setdefault(metric, []).append(value)
+    return measured
+
+
+def package_versions() -> Dict[str, str]:
+    """
+    :return: The installed version of every guarded package.
+    """
+    versions = {}
+    for package in PACKAGES:
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            pass
+    return versions
+
+
+def _threshold(values: List[float], higher_is_better: bool, tolerance: float) -> float:
+    """
+    :param values: The baseline values of a metric over the trials.
+    :param higher_is_better: Whether larger values are better.
+    :param tolerance: Relative change tolerated on top of the noise.
+    :return: The worst value still accepted.
+    """
+    median = statistics.median(values)
+    # Scaled median absolute deviation, a robust estimate of the trial-to-trial standard deviation
+    noise = 1.4826 * statistics.median(abs(value - median) for value in values)
+    margin = tolerance * median + NOISE_FACTOR * noise
+    return median - margin if higher_is_better else median + margin
+
+
+def compare(baseline: dict, measured: Dict[str, Dict[str, List[float]]], tolerance: float) -> List[str]:
+    """
+    Compare the median of the measured trials with the baseline of every point and print the comparison.
+
+    :param baseline: The baseline, as saved by save_baseline.
+    :param measured: The measured values, see measure.
+    :param tolerance: Relative change tolerated on top of the baseline noise.
+    :return: Description of every regression.
+    """
+    regressions = []
+    print(f"{'Point':<32} {'Metric':<13} {'Baseline':>10} {'Current':>10} {'Limit':>10}  Status")
+    for name, metrics in measured.items():
+        reference = baseline["points"].get(name)
+        for metric, values in metrics.items():
+            current = statistics.median(values)
+            if reference is None or metric not in reference:
+                print(f"{name:<32} {metric:<13} {'-':>10} {current:>10.3f} {'-':>10}  no baseline")
+                continue
+            higher_is_better = METRICS[metric]
+            limit = _threshold(reference[metric], higher_is_better, tolerance)
+            regressed = current < limit if higher_is_better else current > limit
+            print(f"{name:<32} {metric:<13} {statistics.median(reference[metric]):>10.3f} {current:>10.3f} "
+                  f"{limit:>10.3f}  {'REGRESSION' if regressed else 'ok'}")
+            if regressed:
+                regressions.append(f"{name} {metric}: {current:.3f} beyond {limit:.3f}")
+    return regressions
+
+
+def save_baseline(path: str, measured: Dict[str, Dict[str, List[float]]], trials: int) -> None:
+    """
+    Write the measured values as the new baseline, to be committed.
+
+    :param path: The baseline file.
+    :param measured: The measured values, see measure.
+    :param trials: Number of runs of every point.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    baseline = {
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "host": socket.gethostname(),
+        "versions": package_versions(),
+        "trials": trials,
+        "points": measured,
+    }
+    with open(path, "w") as output_file:
+        json.dump(baseline, output_file, indent=2)
+    print(f"Baseline saved to {path}")
+
+
+def run_suite(config: BenchmarkConfig, baseline_path: str = DEFAULT_BASELINE, trials: int = DEFAULT_TRIALS,
+              tolerance: float = DEFAULT_TOLERANCE, update: bool = False) -> bool:
+    """
+    Run the regression suite over the configured transports and compare it with the baseline.
+
+    :param config: The benchmark configuration.
+    :param baseline_path: The baseline file.
+    :param trials: Number of runs of every point.
+    :param tolerance: Relative change tolerated on top of the baseline noise.
+    :param update: Save the measurements as the new baseline instead of comparing.
+    :return: True if no regression was found.
+    """
+    measured = measure(config, config.transports, trials)
+    if update:
+        save_baseline(baseline_path, measured, trials)
+        return True
+    if not os.path.exists(baseline_path):
+        print(f"No baseline at {baseline_path}, create it with --update-baseline")
+        return False
+
+    with open(baseline_path, "r") as input_file:
+        baseline = json.load(input_file)
+    for package, version in package_versions().items():
+        previous = baseline.get("versions", {}).get(package)
+        if previous and previous != version:
+            print(f"{package} {previous} -> {version}")
+    if baseline.get("host") != socket.gethostname():
+        print(f"Warning: the baseline was measured on {baseline.get('host')}, not on this host")
+
+    regressions = compare(baseline, measured, tolerance)
+    for regression in regressions:
+        print(f"Regression: {regression}")
+    print("No regression." if not regressions else f"{len(regressions)} regressions.")
+    return not regressions
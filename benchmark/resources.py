@@ -0,0 +1,229 @@
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Counters of the usage summed when combining processes or trials, the others are peaks
+SUMMED = ("duration", "cpu_time", "user_time", "system_time", "minor_faults", "major_faults",
+          "voluntary_switches", "involuntary_switches", "messages", "bytes")
+
+
+def _read_stat() -> Tuple[int, int, int, int, int, int]:
+    """
+    :return: Minor and major page faults, user and system CPU time in clock ticks, number of threads and
+        resident set size in pages of the current process, from /proc/self/stat.
+    """
+    with open("/proc/self/stat", "r") as stat_file:
+        # The command name may contain spaces, field N of stat is the (N - 3)th after it
+        fields = stat_file.read().rsplit(")", 1)[1].split()
+    return int(fields[7]), int(fields[9]), int(fields[11]), int(fields[12]), int(fields[17]), int(fields[21])
+
+
+def _read_switches(exclude: int) -> Dict[int, Tuple[int, int]]:
+    """
+    :param exclude: Thread id to leave out, the sampler thread.
+    :return: Voluntary and involuntary context switches of every thread of the current process, by thread id.
+    """
+    switches = {}
+    for task in os.listdir("/proc/self/task"):
+        if int(task) == exclude:
+            continue
+        voluntary = involuntary = 0
+        try:
+            with open(f"/proc/self/task/{task}/status", "r") as status_file:
+                for line in status_file:
+                    if line.startswith("voluntary_ctxt_switches:"):
+                        voluntary = int(line.split()[1])
+                    elif line.startswith("nonvoluntary_ctxt_switches:"):
+                        involuntary = int(line.split()[1])
+        except OSError:
+            # The thread exited in between
+            continue
+        switches[int(task)] = (voluntary, involuntary)
+    return switches
+
+
+class ResourceSampler:
+    """
+    Background sampling of the resources used by the current process, read from /proc: CPU time, resident
+    memory, page faults, context switches and threads. The counters are taken between `start` and `stop`,
+    the resident memory, thread count and CPU utilization are the peaks seen by the samples.
+
+    Context switches are read per thread, those of threads exiting between two samples are partly missed.
+    The sampler thread itself is left out of the switches and the thread count, not of the CPU time.
+    Sides running as threads of the same process (ZeroMQ inproc) all measure that process.
+
+    Attributes:
+        role (str): The side: "publisher", "subscriber", "ping" or "echo".
+        interval (float): Seconds between two samples, 0 to disable the sampling.
+    """
+
+    def __init__(self, role: str, interval: float) -> None:
+        """
+        :param role: The side: "publisher", "subscriber", "ping" or "echo".
+        :param interval: Seconds between two samples, 0 to disable the sampling.
+        """
+        self.role = role
+        self.interval = interval if os.path.exists("/proc/self/stat") else 0.0
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._sampler_id = 0
+        self._start: Tuple[float, int, Tuple[int, ...]] = (0.0, 0, ())
+        self._previous: Tuple[float, int] = (0.0, 0)
+        self._switches_start: Dict[int, Tuple[int, int]] = {}
+        self._switches: Dict[int, Tuple[int, int]] = {}
+        self._rss_peak = 0
+        self._threads_peak = 0
+        self._cpu_peak = 0.0
+
+    def start(self) -> None:
+        """
+        Take the initial sample and start sampling in the background.
+        """
+        if not self.interval:
+            return
+        now, cpu_ns = time.monotonic(), time.process_time_ns()
+        stat = _read_stat()
+        self._start = (now, cpu_ns, stat)
+        self._previous = (now, cpu_ns)
+        self._rss_peak, self._threads_peak = stat[5], stat[4]
+        self._switches_start = _read_switches(0)
+        self._switches = dict(self._switches_start)
+        self._thread = threading.Thread(target=self._sample, name="resource-sampler", daemon=True)
+        self._thread.start()
+
+    def _sample(self) -> None:
+        """
+        Sampler thread loop.
+        """
+        self._sampler_id = threading.get_native_id()
+        while not self._stopped.wait(self.interval):
+            self._update()
+
+    def _update(self) -> Tuple[int, ...]:
+        """
+        Take a sample and update the peaks.
+
+        :return: The /proc/self/stat values of the sample, see _read_stat.
+        """
+        now, cpu_ns = time.monotonic(), time.process_time_ns()
+        stat = _read_stat()
+        switches = _read_switches(self._sampler_id)
+        elapsed = now - self._previous[0]
+        if elapsed > 0:
+            self._cpu_peak = max(self._cpu_peak, (cpu_ns - self._previous[1]) / 1e9 / elapsed)
+        self._previous = (now, cpu_ns)
+        self._rss_peak = max(self._rss_peak, stat[5])
+        # The final sample is taken once the sampler thread exited
+        threads = stat[4] - (1 if self._thread is not None else 0)
+        self._threads_peak = max(self._threads_peak, threads)
+        # Exited threads keep their last sampled counters
+        self._switches.update(switches)
+        return stat
+
+    def stop(self, messages: int, size: int) -> Dict[str, float]:
+        """
+        Stop sampling and summarize the resources used since `start`.
+
+        :param messages: Number of messages the side handled over the period.
+        :param size: Number of message bytes the side handled over the period.
+        :return: The usage: duration and CPU times in seconds, peak CPU utilization in cores, peak resident memory
+            in bytes, page faults, context switches, peak thread count, messages and bytes. Empty when disabled.
+        """
+        if self._thread is None:
+            return {}
+        self._stopped.set()
+        self._thread.join()
+        self._thread = None
+        minor, major, user, system, _, _ = self._update()
+        start_time, start_cpu, (start_minor, start_major, start_user, start_system, _, _) = self._start
+        ticks = os.sysconf("SC_CLK_TCK")
+        voluntary = involuntary = 0
+        for thread_id, (thread_voluntary, thread_involuntary) in self._switches.items():
+            initial = self._switches_start.get(thread_id, (0, 0))
+            voluntary += thread_voluntary - initial[0]
+            involuntary += thread_involuntary - initial[1]
+        return {
+            "duration": time.monotonic() - start_time,
+            "cpu_time": (time.process_time_ns() - start_cpu) / 1e9,
+            "user_time": (user - start_user) / ticks,
+            "system_time": (system - start_system) / ticks,
+            "cpu_peak": self._cpu_peak,
+            "rss_peak": self._rss_peak * os.sysconf("SC_PAGE_SIZE"),
+            "minor_faults": minor - start_minor,
+            "major_faults": major - start_major,
+            "voluntary_switches": voluntary,
+            "involuntary_switches": involuntary,
+            "threads_peak": self._threads_peak,
+            "messages": messages,
+            "bytes": size,
+        }
+
+
+def combine_usage(usages: List[Dict[str, float]]) -> Dict[str, float]:
+    """
+    Combine the usage of several processes (fan-out subscribers) or trials of the same side.
+    Counters, durations, messages and bytes are summed, the peaks are the highest of the usages.
+
+    :param usages: Usages produced by ResourceSampler.stop, empty ones are ignored.
+    :return: The combined usage, empty if every usage is.
+    """
+    usages = [usage for usage in usages if usage]
+    if not usages:
+        return {}
+    return {name: sum(usage[name] for usage in usages) if name in SUMMED else max(usage[name] for usage in usages)
+            for name in usages[0]}
+
+
+def per_message(usage: Dict[str, float]) -> Dict[str, float]:
+    """
+    :param usage: A usage, see ResourceSampler.stop.
+    :return: CPU time per message (s) and per MB (s), page faults and context switches per message.
+    """
+    messages = usage["messages"] or 1
+    megabytes = usage["bytes"] / 1e6 or 1
+    return {
+        "cpu_per_message": usage["cpu_time"] / messages,
+        "cpu_per_megabyte": usage["cpu_time"] / megabytes,
+        "faults_per_message": (usage["minor_faults"] + usage["major_faults"]) / messages,
+        "switches_per_message": (usage["voluntary_switches"] + usage["involuntary_switches"]) / messages,
+    }
+
+
+def report_usage(role: str, usage: Dict[str, float]) -> None:
+    """
+    Print the resources used by a side, and their cost per message and per MB.
+
+    :param role: The side.
+    :param usage: The usage, see ResourceSampler.stop. Nothing is printed when empty.
+    """
+    if not usage:
+        return
+    costs = per_message(usage)
+    print(f"Resources ({role}): CPU {usage['cpu_time'] * 1e3:.0f} ms (user {usage['user_time'] * 1e3:.0f} ms, "
+          f"system {usage['system_time'] * 1e3:.0f} ms, peak {usage['cpu_peak'] * 100:.0f}% of a core), "
+          f"RSS peak {usage['rss_peak'] / 1e6:.1f} MB, threads {usage['threads_peak']:.0f}")
+    print(f"Cost ({role}): {costs['cpu_per_message'] * 1e6:.1f} us CPU/msg, {costs['cpu_per_megabyte'] * 1e3:.2f} ms CPU/MB, "
+          f"page faults {usage['minor_faults']:.0f} minor + {usage['major_faults']:.0f} major "
+          f"({costs['faults_per_message']:.2f}/msg), context switches {usage['voluntary_switches']:.0f} voluntary + "
+          f"{usage['involuntary_switches']:.0f} involuntary ({costs['switches_per_message']:.2f}/msg)")
+
+
+def print_table(results: List) -> None:
+    """
+    Print the resource cost of every side of every point, when sampled.
+
+    :param results: RunResult of every point.
+    """
+    rows = [(result, role, usage) for result in results for role, usage in result.resources.items() if usage]
+    if not rows:
+        return
+    print(f"{'Transport':<10} {'Variant':<16} {'Payload':>10} {'Rate (Hz)':>10} {'Side':<10} {'CPU us/msg':>10} "
+          f"{'CPU ms/MB':>10} {'Peak CPU':>8} {'RSS (MB)':>9} {'Faults/msg':>10} {'Switches/msg':>12} {'Threads':>7}")
+    for result, role, usage in rows:
+        costs = per_message(usage)
+        rate = f"{result.rate:g}" if result.rate else "max"
+        print(f"{result.transport:<10} {result.variant or '-':<16} {result.payload_size:>10} {rate:>10} {role:<10} "
+              f"{costs['cpu_per_message'] * 1e6:>10.1f} {costs['cpu_per_megabyte'] * 1e3:>10.2f} "
+              f"{usage['cpu_peak'] * 100:>7.0f}% {usage['rss_peak'] / 1e6:>9.1f} {costs['faults_per_message']:>10.2f} "
+              f"{costs['switches_per_message']:>12.2f} {usage['threads_peak']:>7.0f}")
@@ -0,0 +1,382 @@
+import datetime
+import glob
+import importlib
+import json
+import os
+import platform
+import re
+import socket
+import subprocess
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from benchmark.histogram import REPORT_PERCENTILES, LatencyHistogram
+
+# Per-message columns of a stored run, with their array type codes
+COLUMNS = {
+    "publisher_id": "I",
+    "sequence": "Q",
+    "size": "I",
+    "send_ns": "q",
+    "receive_ns": "q",
+    "latency_ns": "q",
+}
+# Fields identifying comparable runs in the report
+GROUP_FIELDS = ("transport", "profile", "variant", "mode", "payload_size", "rate", "subscribers")
+
+# Log lines of the original publisher/subscriber scripts and of the early harness
+_LOG_PACKET = (
+    re.compile(r"Received [Pp]acket (\d+): Size (\d+), Latency = ([\d.]+) ms"),
+    re.compile(r"Received Packet (\d+): Latency = ([\d.]+) ms, length = (\d+) bytes"),
+)
+_LOG_PROFILE = re.compile(r"Creating participant with profile: (\S+)")
+# Line of a publisher log of the original scripts, giving the number of packets to send
+_LOG_SENT = re.compile(r"Sent packet (\d+)/(\d+)")
+
+
+def _numpy():
+    """
+    :return: The numpy module, only needed to save, load and report results.
+    """
+    return importlib.import_module("numpy")
+
+
+class MessageRecords:
+    """
+    Per-message records of a run, appended column by column in typed arrays.
+
+    Attributes:
+        columns (Dict[str, array]): The values of every column of COLUMNS.
+    """
+
+    def __init__(self) -> None:
+        self.columns: Dict[str, array] = {name: array(code) for name, code in COLUMNS.items()}
+
+    def add(self, publisher_id: int, sequence: int, size: int, send_ns: int, receive_ns: int) -> None:
+        """
+        Record a message.
+
+        :param publisher_id: Identifier of the publisher of the message.
+        :param sequence: Sequence number of the message.
+        :param size: Size of the message in bytes.
+        :param send_ns: Send time of the message.
+        :param receive_ns: Receive time of the message, on the same clock.
+        """
+        columns = self.columns
+        columns["publisher_id"].append(publisher_id)
+        columns["sequence"].append(sequence)
+        columns["size"].append(size)
+        columns["send_ns"].append(send_ns)
+        columns["receive_ns"].append(receive_ns)
+        columns["latency_ns"].append(receive_ns - send_ns)
+
+    def extend(self, other: "MessageRecords") -> None:
+        """
+        Append the records of another run, e.g. another subscriber of the same stream.
+
+        :param other: The records to append.
+        """
+        for name, values in other.columns.items():
+            self.columns[name].extend(values)
+
+    def drop_first(self, count: int) -> None:
+        """
+        Remove the first records, e.g. the warm-up messages of the run.
+
+        :param count: Number of records to remove.
+        """
+        for values in self.columns.values():
+            del values[:count]
+
+    def __len__(self) -> int:
+        return len(self.columns["sequence"])
+
+
+def _git_commit() -> Optional[str]:
+    """
+    :return: The commit of the benchmark sources, None outside a git checkout.
+    """
+    try:
+        output = subprocess.run(["git", "rev-parse", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.stdout.strip() if output.returncode == 0 else None
+
+
+def run_metadata(config, result) -> dict:
+    """
+    Describe a run: its configuration, the environment it ran in and its summary.
+
+    :param config: The configuration of the run.
+    :param result: The RunResult of the run.
+    :return: The JSON serializable metadata.
+    """
+    return {
+        "transport": result.transport,
+        "profile": config.dds.profile if result.transport == "dds" else None,
+        "variant": result.variant,
+        "mode": config.mode,
+        "payload": config.payload,
+        "schema": config.schema,
+        "payload_size": result.payload_size,
+        "rate": result.rate,
+        "count": config.count,
+        "subscribers": result.subscribers,
+        "publish_mode": config.publish_mode,
+        "chunk_size": config.chunk_size,
+        "compression": config.compression,
+        "runtime": config.runtime,
+        "host": socket.gethostname(),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "git_commit": _git_commit(),
+        "time": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "source": "run",
+        "delivery": result.delivery,
+        "startup": result.startup,
+        "warmup": config.warmup,
+        "warmup_excluded": result.warmup_excluded,
+        "resources": result.resources,
+        "histogram": result.histogram.to_dict(),
+    }
+
+
+def save_run(directory: str, metadata: dict, records: Optional[MessageRecords]) -> str:
+    """
+    Write a run to the results store, one compressed numpy archive per run: a column per per-message
+    field and the metadata as JSON.
+
+    :param directory: The results store directory.
+    :param metadata: The run metadata.
+    :param records: The per-message records, None to store the summary only.
+    :return: Path of the stored run.
+    """
+    numpy = _numpy()
+    os.makedirs(directory, exist_ok=True)
+    stamp = re.sub(r"[^0-9T]", "", metadata["time"])[:15]
+    name = f"{stamp}_{metadata['transport']}_{metadata['payload_size']}_{metadata['rate']:g}"
+    path = os.path.join(directory, f"{name}.npz")
+    suffix = 1
+    while os.path.exists(path):
+        suffix += 1
+        path = os.path.join(directory, f"{name}_{suffix}.npz")
+
+    columns = records.columns if records is not None else MessageRecords().columns
+    numpy.savez_compressed(path, metadata=numpy.array(json.dumps(metadata)),
+                           **{name: numpy.frombuffer(values, dtype=values.typecode) if len(values) else
+                              numpy.array([], dtype=values.typecode) for name, values in columns.items()})
+    return path
+
+
+def load_runs(directory: str) -> List[Tuple[dict, dict]]:
+    """
+    Read every run of the results store.
+
+    :param directory: The results store directory.
+    :return: The metadata and the columns (numpy arrays) of every run, oldest first.
+    """
+    numpy = _numpy()
+    runs = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.npz"))):
+        with numpy.load(path) as archive:
+            metadata = json.loads(str(archive["metadata"]))
+            metadata["path"] = path
+            runs.append((metadata, {name: archive[name] for name in COLUMNS}))
+    return runs
+
+
+def _sent_count(path: str) -> Optional[int]:
+    """
+    :param path: A subscriber log of the original scripts.
+    :return: Number of packets sent according to the matching `publisher_...` log, None without one.
+    """
+    directory, name = os.path.split(path)
+    if not name.startswith("subscriber_"):
+        return None
+    publisher_path = os.path.join(directory, "publisher_" + name[len("subscriber_"):])
+    if not os.path.exists(publisher_path):
+        return None
+    sent = None
+    with open(publisher_path, "r", errors="replace") as log:
+        for match in _LOG_SENT.finditer(log.read()):
+            sent = max(sent or 0, int(match.group(1)))
+    return sent
+
+
+def import_log(path: str, directory: str) -> Optional[str]:
+    """
+    Import a subscriber log of the original scripts (`results/subscriber_<transport>[_<profile>].log`) into the
+    results store. Only the latencies and sizes were logged, so the send times are left at 0 and the
+    receive times hold the latencies. The logged packet number is a receive counter, not the publisher
+    sequence, so the loss can only be known from the matching publisher log (`results/publisher_...log`);
+    without one the sent and lost counts are stored as unknown (None).
+
+    :param path: The log file.
+    :param directory: The results store directory.
+    :return: Path of the stored run, None if the log holds no received packet.
+    """
+    records = MessageRecords()
+    histogram = LatencyHistogram()
+    profile = None
+    with open(path, "r", errors="replace") as log:
+        for line in log:
+            match = _LOG_PROFILE.search(line)
+            if match:
+                profile = match.group(1)
+                continue
+            for index, pattern in enumerate(_LOG_PACKET):
+                match = pattern.search(line)
+                if match is None:
+                    continue
+                if index == 0:
+                    sequence, size, latency_ms = match.groups()
+                else:
+                    sequence, latency_ms, size = match.groups()
+                latency_ns = round(float(latency_ms) * 1e6)
+                records.add(0, int(sequence) - 1, int(size), 0, latency_ns)
+                histogram.record(latency_ns)
+                break
+    if not len(records):
+        return None
+
+    # The file name suffix tells apart the variants of a participant profile (shm, shm-no-ipc)
+    name = os.path.splitext(os.path.basename(path))[0]
+    parts = name.split("_", 2)
+    transport = parts[1] if len(parts) > 1 else name
+    if len(parts) > 2:
+        profile = parts[2]
+    sizes = sorted(records.columns["size"])
+    # The sequence column holds the receive order
+    sent = _sent_count(path)
+    delivered = len(records)
+    metadata = {
+        "transport": transport,
+        "profile": profile,
+        "mode": "oneway",
+        "payload": "constant",
+        "payload_size": sizes[len(sizes) // 2],
+        "rate": 0.0,
+        "count": sent if sent is not None else delivered,
+        "subscribers": 1,
+        "host": None,
+        "git_commit": None,
+        "time": datetime.datetime.fromtimestamp(os.path.getmtime(path), datetime.timezone.utc)
+                .isoformat(timespec="seconds"),
+        "source": path,
+        "delivery": {"sent": sent, "delivered": delivered, "lost": sent - delivered if sent is not None else None,
+                     "delivered_ratio": delivered / sent if sent else None, "goodput": 0.0, "message_rate": 0.0},
+        "histogram": histogram.to_dict(),
+    }
+    return save_run(directory, metadata, records)
+
+
+def _group_key(metadata: dict) -> tuple:
+    return tuple(metadata.get(name) for name in GROUP_FIELDS)
+
+
+def _group_label(key: tuple) -> str:
+    transport, profile, variant, mode, payload_size, rate, subscribers = key
+    label = f"{transport}/{profile}" if profile else transport
+    if variant and variant != profile:
+        # DDS descriptions start with the profile
+        label += f" [{variant[len(profile) + 1:] if profile and variant.startswith(profile + ' ') else variant}]"
+    label += f" {payload_size}B {f'{rate:g}Hz' if rate else 'max'}"
+    if mode == "pingpong":
+        label += " rtt"
+    if subscribers and subscribers > 1:
+        label += f" x{subscribers}"
+    return label
+
+
+def report(directory: str, plots: Optional[str] = None, transports: Optional[List[str]] = None) -> None:
+    """
+    Compare the stored runs: print one row per group of comparable runs (transport, profile, mode,
+    payload size, rate, subscribers), and optionally plot their latency CDFs and percentiles with matplotlib.
+
+    :param directory: The results store directory.
+    :param plots: Directory to save the plots to, None to skip plotting.
+    :param transports: Only report these transports, None for all.
+    """
+    numpy = _numpy()
+    groups: Dict[tuple, list] = {}
+    for metadata, columns in load_runs(directory):
+        if transports and metadata["transport"] not in transports:
+            continue
+        groups.setdefault(_group_key(metadata), []).append((metadata, columns))
+    if not groups:
+        print(f"No runs stored in {directory}")
+        return
+
+    percentiles = REPORT_PERCENTILES
+    width = max(len(_group_label(key)) for key in groups)
+    print(f"{'Run group':<{width}} {'Runs':>4} {'Messages':>8} {'Delivered':>10} {'Mean (ms)':>9} "
+          + " ".join(f"{f'p{percentile:g} (ms)':>11}" for percentile in percentiles) + f" {'Max (ms)':>9}")
+    latencies = {}
+    for key, runs in groups.items():
+        # Groups are compared on the per-message latencies when stored, the histograms otherwise
+        values = [columns["latency_ns"] for _, columns in runs if len(columns["latency_ns"])]
+        # Runs may be stored with any histogram precision, they are merged in the settings of the first one
+        histograms = [LatencyHistogram.from_dict(metadata["histogram"]) for metadata, _ in runs]
+        histogram = histograms[0]
+        for other in histograms[1:]:
+            histogram.merge(other.with_settings(histogram.lowest_discernible, histogram.highest_trackable,
+                                                histogram.significant_figures))
+        # Imported logs without a publisher log leave the sent count unknown
+        sent = None if any(metadata["delivery"]["sent"] is None for metadata, _ in runs) else \
+            sum(metadata["delivery"]["sent"] for metadata, _ in runs)
+        delivered = sum(metadata["delivery"]["delivered"] for metadata, _ in runs)
+        if values:
+            latency = latencies[key] = numpy.concatenate(values) / 1e6
+            row = [latency.mean(), *numpy.percentile(latency, percentiles), latency.max()]
+        else:
+            row = [histogram.mean() / 1e6, *(value / 1e6 for value in histogram.percentiles(percentiles).values()),
+                   (histogram.maximum or 0) / 1e6]
+        ratio = f"{delivered / sent * 100:.2f}%" if sent else "-"
+        print(f"{_group_label(key):<{width}} {len(runs):>4} {histogram.total:>8} {ratio:>10} {row[0]:>9.2f} "
+              + " ".join(f"{value:>11.2f}" for value in row[1:-1]) + f" {row[-1]:>9.2f}")
+
+    if plots:
+        _plot(plots, latencies)
+
+
+def _plot(directory: str, latencies: Dict[tuple, "object"]) -> None:
+    """
+    Save the latency CDF and percentile plots of the run groups.
+
+    :param directory: Directory to save the plots to.
+    :param latencies: Per-message latencies in ms of every run group.
+    """
+    numpy = _numpy()
+    matplotlib = importlib.import_module("matplotlib")
+    matplotlib.use("Agg")
+    pyplot = importlib.import_module("matplotlib.pyplot")
+    os.makedirs(directory, exist_ok=True)
+
+    figure, axes = pyplot.subplots(figsize=(10, 6))
+    for key, latency in latencies.items():
+        values = numpy.sort(latency)
+        axes.plot(values, numpy.arange(1, len(values) + 1) / len(values), label=_group_label(key))
+    axes.set_xscale("log")
+    axes.set_xlabel("Latency (ms)")
+    axes.set_ylabel("Fraction of messages")
+    axes.set_title("Latency CDF")
+    axes.grid(True, which="both", alpha=0.3)
+    axes.legend(fontsize="small")
+    figure.savefig(os.path.join(directory, "latency_cdf.png"), dpi=120, bbox_inches="tight")
+    pyplot.close(figure)
+
+    figure, axes = pyplot.subplots(figsize=(10, 6))
+    labels = [f"p{percentile:g}" for percentile in REPORT_PERCENTILES] + ["max"]
+    width = 0.8 / max(len(latencies), 1)
+    for index, (key, latency) in enumerate(latencies.items()):
+        values = [*numpy.percentile(latency, REPORT_PERCENTILES), latency.max()]
+        axes.bar(numpy.arange(len(labels)) + index * width, values, width, label=_group_label(key))
+    axes.set_xticks(numpy.arange(len(labels)) + width * (len(latencies) - 1) / 2, labels)
+    axes.set_yscale("log")
+    axes.set_ylabel("Latency (ms)")
+    axes.set_title("Latency percentiles")
+    axes.legend(fontsize="small")
+    figure.savefig(os.path.join(directory, "latency_percentiles.png"), dpi=120, bbox_inches="tight")
+    pyplot.close(figure)
+    print(f"Plots saved to {directory}")
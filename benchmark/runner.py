@@ -0,0 +1,552 @@
+import dataclasses
+import multiprocessing
+import os
+import queue
+import random
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from benchmark import aio, message
+from benchmark.clock import ClockSyncClient, ClockSyncServer
+from benchmark.config import BenchmarkConfig
+from benchmark.delivery import DeliveryStatistics, combine_summaries
+from benchmark.events import EventKind, open_event_log
+from benchmark.histogram import LatencyHistogram, merge
+from benchmark.payload import generate_payloads
+from benchmark.pipeline import ProcessingPipeline
+from benchmark.protocols import (REPLY_CHANNEL, create_publisher, create_subscriber, import_time,
+                                 requires_single_process)
+from benchmark.recorder import LatencyRecorder, RunResult, exclude_transient, save_histogram
+from benchmark.resources import ResourceSampler, combine_usage, report_usage
+from benchmark.results import MessageRecords
+from benchmark.scheduler import OpenLoopScheduler
+from benchmark.startup import StartupTimes
+
+# Period used by the subscriber to check for completion and inactivity
+WAIT_PERIOD = 0.5
+
+
+@dataclass
+class PublishResult:
+    """
+    Outcome of a publisher run.
+
+    Attributes:
+        send_time (LatencyHistogram): Duration of every send call in nanoseconds.
+        message_rate (float): Messages sent per second, from the first send to the end of the last one.
+        throughput (float): Message bytes sent per second over the same period.
+        startup (Dict[str, float]): Startup phases of the publisher in seconds, see StartupTimes.prefixed.
+        resources (Dict[str, float]): Resource usage of the publisher while sending, see ResourceSampler.stop.
+    """
+    send_time: LatencyHistogram
+    message_rate: float
+    throughput: float
+    startup: Dict[str, float]
+    resources: Dict[str, float]
+
+
+def _open_publisher(config: BenchmarkConfig, transport: str, startup: StartupTimes):
+    """
+    Create and open the data channel publisher, recording the import and open phases.
+
+    :param config: The benchmark configuration.
+    :param transport: The transport name.
+    :param startup: The startup phases of the side.
+    :return: The open publisher.
+    """
+    publisher = create_publisher(transport, config)
+    seconds = import_time(transport)
+    if seconds is not None:
+        startup.record("import", seconds)
+    with startup.measure("open"):
+        publisher.open()
+    return publisher
+
+
+def _wait_subscribers(config: BenchmarkConfig, publisher, subscribers: int, startup: Optional[StartupTimes] = None,
+                      opened: float = 0.0) -> None:
+    """
+    Wait for the subscribers of a publisher to be ready, recording the time to discovery since the publisher opened.
+
+    :param config: The benchmark configuration.
+    :param publisher: The open publisher.
+    :param subscribers: Number of subscribers to wait for.
+    :param startup: The startup phases of the side, None to not record the discovery.
+    :param opened: `time.perf_counter()` once the publisher was open.
+    """
+    if not publisher.wait_ready(subscribers, config.ready_timeout):
+        print(f"Subscribers not ready after {config.ready_timeout}s, sending anyway.")
+    elif startup is not None:
+        startup.record("discovery", time.perf_counter() - opened)
+
+
+def run_publisher(config: BenchmarkConfig, transport: str) -> PublishResult:
+    """
+    Publish the configured workload over a transport.
+    With a target rate the messages follow an open-loop schedule and carry their intended send time.
+    The `config.warmup` warm-up messages precede the measured ones on the same schedule.
+
+    :param config: The benchmark configuration.
+    :param transport: The transport name.
+    :return: The send call durations and the send throughput.
+    """
+    publisher_id = config.publisher_id if config.publisher_id is not None else random.getrandbits(32)
+    print(f"[{transport}] Starting publisher {publisher_id:08x}.")
+    startup = StartupTimes("publisher")
+    publisher = _open_publisher(config, transport, startup)
+    opened = time.perf_counter()
+    # Clock probe replies share the publisher with the main loop
+    send_lock = threading.Lock()
+    clock_server = ClockSyncServer(config, transport, publisher, send_lock) if config.clock_sync else None
+    events = open_event_log(config, transport, "publisher", config.count)
+    try:
+        # Generate every payload before sending, so generation never shows up in the latency
+        payloads = generate_payloads(config)
+        pool = message.MessagePool(payloads, config.buffer_pool_size) if config.publish_mode == "zero-copy" else None
+        _wait_subscribers(config, publisher, config.subscribers, startup, opened)
+        if clock_server is not None and not clock_server.settled.wait(config.ready_timeout):
+            print(f"No clock probe window answered after {config.ready_timeout}s, latencies may not be corrected.")
+        time.sleep(config.startup_delay)
+        bytes_copied = 0
+        scheduler = OpenLoopScheduler(config.rate)
+        send_lag = LatencyHistogram(significant_figures=config.histogram_precision)
+        send_time = LatencyHistogram(significant_figures=config.histogram_precision)
+        # The warm-up sends are accounted for apart, switching to the measured histograms is then a swap
+        # instead of a reset between the scheduled time and the send of the first measured message
+        warmup_lag = LatencyHistogram(significant_figures=config.histogram_precision) if config.warmup else send_lag
+        warmup_time = LatencyHistogram(significant_figures=config.histogram_precision) if config.warmup else send_time
+        lag_histogram, time_histogram = warmup_lag, warmup_time
+        bytes_sent = 0
+        # Warm-up included, for the cost per message
+        bytes_total = 0
+        sampler = ResourceSampler("publisher", config.resource_interval)
+
+        sampler.start()
+        scheduler.start()
+        first_send_ns = time.perf_counter_ns()
+        # The warm-up follows the same schedule and flows straight into the measured messages
+        for i in range(config.warmup + config.count):
+            intended_ns = scheduler.wait(i)
+            if i < config.warmup:
+                sequence, flags = i, message.Flags.WARMUP
+            else:
+                sequence, flags = i - config.warmup, message.Flags.NONE
+                if not sequence:
+                    first_send_ns = time.perf_counter_ns()
+                    lag_histogram, time_histogram = send_lag, send_time
+                    bytes_sent = 0
+            if pool is not None:
+                index, data = pool.encode(publisher_id, sequence, flags, timestamp_ns=intended_ns)
+                lag_histogram.record(time.time_ns() - intended_ns)
+                with send_lock:
+                    send_ns = time.perf_counter_ns()
+                    guard = publisher.send(data)
+                    time_histogram.record(time.perf_counter_ns() - send_ns)
+                pool.release(index, guard)
+            else:
+                data = message.encode(publisher_id, sequence, payloads[i % len(payloads)], flags,
+                                      timestamp_ns=intended_ns)
+                bytes_copied += len(data)
+                lag_histogram.record(time.time_ns() - intended_ns)
+                with send_lock:
+                    send_ns = time.perf_counter_ns()
+                    publisher.send(data)
+                    time_histogram.record(time.perf_counter_ns() - send_ns)
+            bytes_sent += len(data)
+            bytes_total += len(data)
+            if events is not None:
+                events.record(EventKind.SENT, flags, publisher_id, sequence, intended_ns, time.time_ns(), len(data))
+        duration = (time.perf_counter_ns() - first_send_ns) / 1e9
+        with send_lock:
+            # The subscribers stop on the end marker instead of waiting for the inactivity timeout
+            publisher.send(message.encode(publisher_id, config.count, b"", message.Flags.END))
+        usage = sampler.stop(config.warmup + config.count, bytes_total)
+
+        print("All packets sent.")
+        if config.rate:
+            print(f"Send lag behind schedule: p50 {send_lag.percentile(50) / 1e6:.2f} ms, "
+                  f"p99 {send_lag.percentile(99) / 1e6:.2f} ms, max {send_lag.maximum / 1e6:.2f} ms")
+        if send_time.total:
+            print(f"Send call time: p50 {send_time.percentile(50) / 1e6:.2f} ms, "
+                  f"p99 {send_time.percentile(99) / 1e6:.2f} ms, max {send_time.maximum / 1e6:.2f} ms")
+        message_rate = config.count / duration if duration else 0.0
+        throughput = bytes_sent / duration if duration else 0.0
+        print(f"Send throughput: {message_rate:.1f} msg/s, {throughput / 1e6:.2f} MB/s")
+        publisher.report()
+        startup.report()
+        report_usage("publisher", usage)
+        sent = config.warmup + config.count
+        if sent:
+            print(f"Bytes copied per message: {(bytes_copied + publisher.bytes_copied) / sent:.0f} "
+                  f"(harness {bytes_copied / sent:.0f}, transport {publisher.bytes_copied / sent:.0f})")
+    finally:
+        if clock_server is not None:
+            clock_server.close()
+        publisher.close()
+        if events is not None:
+            events.close()
+    return PublishResult(send_time, message_rate, throughput, startup.prefixed(), usage)
+
+
+def run_subscriber(config: BenchmarkConfig, transport: str) -> RunResult:
+    """
+    Receive the configured workload over a transport and report its latency and delivery.
+    Returns once the last message of every publisher arrived or no message arrived for `config.timeout` seconds.
+    With the asyncio runtime the messages are handed to the event loop through a bounded queue.
+    With `config.processing_work` set, every message is then handed to the processing stage.
+
+    :param config: The benchmark configuration.
+    :param transport: The transport name.
+    :return: The latency and delivery of the run.
+    """
+    if config.runtime == "asyncio":
+        return aio.run_subscribers(config, [transport])[0]
+
+    print(f"[{transport}] Creating subscriber.")
+    recorder = LatencyRecorder(config, transport)
+    if config.processing_work:
+        recorder.pipeline = ProcessingPipeline(config)
+    subscriber = create_subscriber(transport, config)
+    seconds = import_time(transport)
+    if seconds is not None:
+        recorder.startup.record("import", seconds)
+    with recorder.startup.measure("open"):
+        subscriber.open(lambda data: recorder.record(data, time.time_ns()))
+    recorder.opened = time.perf_counter()
+    recorder.resources.start()
+    try:
+        if config.clock_sync:
+            recorder.clock_client = ClockSyncClient(config, transport)
+        _wait_finished(recorder.finished, lambda: recorder.last_activity, config.timeout)
+    finally:
+        if recorder.clock_client is not None:
+            recorder.clock_client.close()
+        subscriber.close()
+        if recorder.pipeline is not None:
+            recorder.pipeline.close()
+    return recorder.result(subscriber)
+
+
+def run_ping(config: BenchmarkConfig, transport: str) -> RunResult:
+    """
+    Send pings over a transport and measure the round-trip time of their echoes.
+    Each ping waits for its echo, or `config.ping_timeout` seconds, before the next one is sent.
+    Times are taken with `time.perf_counter_ns()` in this process, so no clock synchronization is needed.
+    The `config.warmup` warm-up pings precede the measured ones and are not accounted for.
+
+    :param config: The benchmark configuration.
+    :param transport: The transport name.
+    :return: The round-trip times and delivery of the echoes.
+    """
+    publisher_id = config.publisher_id if config.publisher_id is not None else random.getrandbits(32)
+    print(f"[{transport}] Starting ping originator {publisher_id:08x}.")
+    startup = StartupTimes("ping")
+    histogram = LatencyHistogram(significant_figures=config.histogram_precision)
+    delivery = DeliveryStatistics(config.count)
+    replies = queue.Queue()
+    events = open_event_log(config, transport, "ping", config.count)
+    records = MessageRecords() if config.results_store else None
+    round_trips = array("q") if config.warmup_detect else None
+
+    def on_reply(data: bytes) -> None:
+        receive_ns = time.perf_counter_ns()
+        header, payload = message.decode(data)
+        if header.publisher_id == publisher_id and header.flags & message.Flags.ECHO:
+            replies.put((header, len(payload), receive_ns))
+
+    # The echo responder only subscribes once its reply publisher reached this subscriber,
+    # so both directions are ready when the publisher is
+    subscriber = create_subscriber(transport, config, REPLY_CHANNEL)
+    subscriber.open(on_reply)
+    publisher = _open_publisher(config, transport, startup)
+    opened = time.perf_counter()
+    try:
+        # Generate every payload before sending, so generation never shows up in the latency
+        payloads = generate_payloads(config)
+        pool = message.MessagePool(payloads, config.buffer_pool_size) if config.publish_mode == "zero-copy" else None
+        _wait_subscribers(config, publisher, 1, startup, opened)
+        time.sleep(config.startup_delay)
+        scheduler = OpenLoopScheduler(config.rate)
+        sampler = ResourceSampler("ping", config.resource_interval)
+        bytes_sent = 0
+        # Payload bytes of every measured ping, and of the round trips accounted for in each direction
+        ping_lengths = array("q", bytes(8 * config.count))
+        ping_bytes = echo_bytes = 0
+
+        sampler.start()
+        scheduler.start()
+        for i in range(config.warmup + config.count):
+            scheduler.wait(i)
+            warmup = i < config.warmup
+            sequence = i if warmup else i - config.warmup
+            flags = message.Flags.PING | (message.Flags.WARMUP if warmup else message.Flags.NONE)
+            sent_ns = time.perf_counter_ns()
+            if pool is not None:
+                index, data = pool.encode(publisher_id, sequence, flags, timestamp_ns=sent_ns)
+                pool.release(index, publisher.send(data))
+            else:
+                data = message.encode(publisher_id, sequence, payloads[i % len(payloads)], flags, timestamp_ns=sent_ns)
+                publisher.send(data)
+            bytes_sent += len(data)
+            if not warmup:
+                ping_lengths[sequence] = len(data) - message.HEADER_SIZE
+
+            # Wait for the echo, late echoes of previous pings are still accounted for
+            deadline_ns = sent_ns + int(config.ping_timeout * 1e9)
+            while True:
+                try:
+                    header, echo_length, receive_ns = replies.get(
+                        timeout=max(deadline_ns - time.perf_counter_ns(), 0) / 1e9)
+                except queue.Empty:
+                    print(f"{'Warm-up ping' if warmup else 'Ping'} {sequence + 1}/"
+                          f"{config.warmup if warmup else config.count} timed out")
+                    break
+                if header.flags & message.Flags.WARMUP:
+                    # Echoes of the warm-up pings are not accounted for
+                    if warmup and header.sequence == sequence:
+                        break
+                    continue
+                # The goodput counts the payload bytes that went both ways, the echo may carry none
+                ping_length = ping_lengths[header.sequence]
+                if delivery.record(publisher_id, header.sequence, ping_length + echo_length, header.timestamp_ns,
+                                   receive_ns):
+                    ping_bytes += ping_length
+                    echo_bytes += echo_length
+                    histogram.record(receive_ns - header.timestamp_ns)
+                    if round_trips is not None:
+                        round_trips.append(receive_ns - header.timestamp_ns)
+                    # The echo payload actually received, which differs from the configured size with
+                    # file or image payloads, or no echoed payload
+                    if records is not None:
+                        records.add(publisher_id, header.sequence, echo_length, header.timestamp_ns, receive_ns)
+                    if events is not None:
+                        events.record(EventKind.ROUND_TRIP, header.flags, publisher_id, header.sequence,
+                                      header.timestamp_ns, receive_ns, echo_length)
+                if not warmup and header.sequence == sequence:
+                    break
+        publisher.send(message.encode(publisher_id, config.count, b"", message.Flags.END))
+        usage = sampler.stop(config.warmup + config.count, bytes_sent)
+    finally:
+        publisher.close()
+        subscriber.close()
+        if events is not None:
+            events.close()
+
+    excluded = exclude_transient(round_trips, histogram, records) if round_trips is not None else 0
+    histogram.report(label="RTT")
+    delivery.report()
+    stream = delivery.streams.get(publisher_id)
+    duration = stream.duration() if stream is not None else 0.0
+    if duration:
+        print(f"Goodput per direction: ping {ping_bytes / duration / 1e6:.2f} MB/s, "
+              f"echo {echo_bytes / duration / 1e6:.2f} MB/s")
+    startup.report()
+    report_usage("ping", usage)
+    save_histogram(config, transport, histogram, "Round-trip")
+    return RunResult(transport, config.payload_size, config.rate, histogram, delivery.summary(), records=records,
+                     startup=startup.prefixed(), warmup_excluded=excluded, resources={"ping": usage} if usage else {})
+
+
+def run_echo(config: BenchmarkConfig, transport: str) -> None:
+    """
+    Echo the pings received over a transport back to their originator, with or without their payload.
+    Returns once the last ping was echoed, the end marker arrived or no ping arrived for `config.timeout` seconds.
+
+    :param config: The benchmark configuration.
+    :param transport: The transport name.
+    """
+    print(f"[{transport}] Creating echo responder.")
+    finished = threading.Event()
+    last_activity = time.monotonic()
+    echoed = 0
+    bytes_echoed = 0
+
+    publisher = create_publisher(transport, config, REPLY_CHANNEL)
+    publisher.open()
+    # Subscribing only once the originator receives the echoes tells it that both directions are ready
+    _wait_subscribers(config, publisher, 1)
+
+    def on_message(data: bytes) -> None:
+        nonlocal last_activity, echoed, bytes_echoed
+        header, payload = message.decode(data)
+        last_activity = time.monotonic()
+        if header.flags & message.Flags.END:
+            finished.set()
+            return
+        if not header.flags & message.Flags.PING:
+            return
+
+        # The echo keeps the originator timestamp, only the flags change
+        echo_payload = payload if config.echo_payload else b""
+        warmup = header.flags & message.Flags.WARMUP
+        publisher.send(message.encode(header.publisher_id, header.sequence, echo_payload,
+                                      message.Flags.ECHO | warmup, timestamp_ns=header.timestamp_ns))
+        echoed += 1
+        bytes_echoed += len(data)
+        if not warmup and header.sequence >= config.count - 1:
+            finished.set()
+
+    subscriber = create_subscriber(transport, config)
+    subscriber.open(on_message)
+    sampler = ResourceSampler("echo", config.resource_interval)
+    sampler.start()
+    try:
+        _wait_finished(finished, lambda: last_activity, config.timeout)
+    finally:
+        subscriber.close()
+        publisher.close()
+    print(f"Echoed {echoed} pings.")
+    report_usage("echo", sampler.stop(echoed, bytes_echoed))
+
+
+def _wait_finished(finished: threading.Event, last_activity: Callable[[], float], timeout: float) -> None:
+    """
+    Wait until an event is set or nothing happened for a while.
+
+    :param finished: The event set on completion.
+    :param last_activity: Returns the `time.monotonic()` of the last activity.
+    :param timeout: Seconds of inactivity after which to stop waiting.
+    """
+    try:
+        while not finished.wait(WAIT_PERIOD):
+            if time.monotonic() - last_activity() > timeout:
+                print(f"No packet received for {timeout}s, stopping.")
+                break
+    except KeyboardInterrupt:
+        print('Interrupted!')
+
+
+def _child_process(target: Callable, config: BenchmarkConfig, transport: str,
+                   results: multiprocessing.Queue, cpu: Optional[int] = None) -> None:
+    """
+    Child process (or thread) entry point running one side of the benchmark and sending back its result.
+
+    :param target: The function running the side.
+    :param config: The benchmark configuration.
+    :param transport: The transport name.
+    :param results: Queue receiving the result.
+    :param cpu: CPU to pin the process to, None to let the scheduler decide.
+    """
+    if cpu is not None:
+        os.sched_setaffinity(0, {cpu})
+    results.put(target(config, transport))
+
+
+def _subscriber_cpus(count: int) -> List[Optional[int]]:
+    """
+    :param count: Number of subscriber processes.
+    :return: The CPU of every subscriber, one per core after the publisher's core 0, wrapping around.
+    """
+    if not hasattr(os, "sched_setaffinity"):
+        return [None] * count
+    cpus = sorted(os.sched_getaffinity(0))
+    if len(cpus) < 2:
+        return [None] * count
+    return [cpus[1 + index % (len(cpus) - 1)] for index in range(count)]
+
+
+def run_local(config: BenchmarkConfig, transport: str) -> RunResult:
+    """
+    Run the receiving side in child processes and the sending side in this one.
+    In one-way mode `config.subscribers` subscriber processes receive the same stream, and their
+    latencies are merged. In ping-pong mode the child is the echo responder and this process the ping originator.
+    Transports whose endpoints only connect within a process (ZeroMQ inproc) run the children as threads.
+
+    :param config: The benchmark configuration.
+    :param transport: The transport name.
+    :return: The result of the side measuring latency.
+    """
+    single_process = requires_single_process(transport, config)
+    context = multiprocessing.get_context("spawn")
+    results = queue.Queue() if single_process else context.Queue()
+    child_class = threading.Thread if single_process else context.Process
+    if config.mode == "pingpong":
+        child = child_class(target=_child_process, args=(run_echo, config, transport, results))
+        child.start()
+        try:
+            return run_ping(config, transport)
+        finally:
+            child.join()
+
+    # Histograms are saved once merged, and local subscribers share the publisher clock
+    child_config = dataclasses.replace(config, histogram_output=None,
+                                       clock_sync=config.clock_sync and config.subscribers == 1)
+    child_configs = [child_config] * config.subscribers
+    if config.event_log and config.subscribers > 1 and "{pid}" not in config.event_log:
+        # Every subscriber records its own events, threads share the process id
+        if single_process:
+            child_configs = [dataclasses.replace(child_config, event_log=f"{config.event_log}.{index}")
+                             for index in range(config.subscribers)]
+        else:
+            child_config.event_log += ".{pid}"
+    cpus = _subscriber_cpus(config.subscribers) if config.pin_cpus else [None] * config.subscribers
+    children = [child_class(target=_child_process, args=(run_subscriber, child_config, transport, results, cpu))
+                for child_config, cpu in zip(child_configs, cpus)]
+    for child in children:
+        child.start()
+    affinity = os.sched_getaffinity(0) if config.pin_cpus and hasattr(os, "sched_setaffinity") else None
+    try:
+        if affinity is not None:
+            os.sched_setaffinity(0, {min(affinity)})
+        published = run_publisher(config, transport)
+        received = [_wait_result(children, results, transport) for _ in children]
+    finally:
+        if affinity is not None:
+            os.sched_setaffinity(0, affinity)
+        for child in children:
+            child.join()
+
+    histogram = merge(result.histogram for result in received)
+    delivery = combine_summaries([result.delivery for result in received])
+    # The slowest subscriber bounds the startup of a fan-out
+    startup = dict(published.startup)
+    for result in received:
+        for phase, seconds in result.startup.items():
+            startup[phase] = max(startup.get(phase, 0.0), seconds)
+    usages = {"publisher": published.resources,
+              "subscriber": combine_usage([result.resources.get("subscriber", {}) for result in received])}
+    if len(received) > 1:
+        print(f"[{transport}] Fan-out to {len(received)} subscribers:")
+        for index, result in enumerate(received):
+            print(f"Subscriber {index + 1}: p50 {result.histogram.percentile(50) / 1e6:.2f} ms, "
+                  f"p99 {result.histogram.percentile(99) / 1e6:.2f} ms, max {(result.histogram.maximum or 0) / 1e6:.2f} ms, "
+                  f"delivered {result.delivery['delivered_ratio'] * 100:.2f}%")
+        histogram.report()
+        report_usage(f"{len(received)} subscribers", usages["subscriber"])
+    save_histogram(config, transport, histogram, "Latency")
+    records = None
+    if config.results_store:
+        records = MessageRecords()
+        for result in received:
+            records.extend(result.records)
+    return RunResult(transport, config.payload_size, config.rate, histogram, delivery,
+                     len(received), published.send_time, received, records, startup=startup,
+                     warmup_excluded=sum(result.warmup_excluded for result in received),
+                     resources={role: usage for role, usage in usages.items() if usage})
+
+
+def _wait_result(processes: List[multiprocessing.Process], results: multiprocessing.Queue,
+                 transport: str) -> RunResult:
+    """
+    Wait for the next result of the subscriber processes.
+
+    :param processes: The subscriber processes, or threads.
+    :param results: Queue receiving the RunResult.
+    :param transport: The transport name.
+    :return: The result of a subscriber.
+    """
+    while True:
+        try:
+            return results.get(timeout=WAIT_PERIOD)
+        except queue.Empty:
+            if not any(process.is_alive() for process in processes):
+                break
+    try:
+        return results.get_nowait()
+    except queue.Empty:
+        # Threads have no exit code
+        exit_codes = [getattr(process, "exitcode", None) for process in processes]
+        raise RuntimeError(f"[{transport}] Subscribers exited with codes {exit_codes} without a result")
@@ -0,0 +1,59 @@
+import time
+
+# Below this many nanoseconds before the deadline the scheduler spins instead of sleeping
+SPIN_THRESHOLD_NS = 200_000
+
+
+class OpenLoopScheduler:
+    """
+    Fixed-rate send schedule that does not adapt to slow sends.
+
+    Message i is due at start + i / rate, whatever happened to the previous messages. A message
+    sent late keeps its intended send time, so the latency measured from that time includes the
+    delay instead of hiding it (coordinated omission). A rate of 0 sends back-to-back.
+
+    Attributes:
+        rate (float): Target rate in messages per second, 0 for back-to-back.
+        interval_ns (int): Time between two intended sends.
+    """
+
+    def __init__(self, rate: float = 0.0) -> None:
+        """
+        Initialize the scheduler.
+
+        :param rate: Target rate in messages per second, 0 for back-to-back.
+        """
+        if rate < 0:
+            raise ValueError("The send rate cannot be negative")
+        self.rate = rate
+        self.interval_ns = int(1e9 / rate) if rate > 0 else 0
+        self._monotonic_start = None
+        self._wall_start = None
+
+    def start(self) -> None:
+        """
+        Start the schedule, message 0 is due now.
+        """
+        self._monotonic_start = time.perf_counter_ns()
+        self._wall_start = time.time_ns()
+
+    def wait(self, index: int) -> int:
+        """
+        Wait until a message is due.
+
+        :param index: The message index since start.
+        :return: The intended send time of the message, on the `time.time_ns()` clock.
+        """
+        if not self.interval_ns:
+            return time.time_ns()
+        if self._monotonic_start is None:
+            self.start()
+
+        offset = index * self.interval_ns
+        deadline = self._monotonic_start + offset
+        remaining = deadline - time.perf_counter_ns()
+        if remaining > SPIN_THRESHOLD_NS:
+            time.sleep((remaining - SPIN_THRESHOLD_NS) / 1e9)
+        while time.perf_counter_ns() < deadline:
+            pass
+        return self._wall_start + offset
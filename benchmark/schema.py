@@ -0,0 +1,153 @@
+import importlib
+import math
+import struct
+import zlib
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from benchmark.message import Buffer
+
+# Typed payload header, little endian: schema identifier (I), layout version (H), field count (H),
+# followed by the dimensions of every field as uint32
+SCHEMA_HEADER = struct.Struct("<IHH")
+LAYOUT_VERSION = 1
+# Alignment of the field data within the payload; the message header is a multiple of it,
+# so the arrays stay aligned in any message buffer aligned to it
+ALIGNMENT = 16
+
+
+def _numpy():
+    """
+    :return: The numpy module, imported only when typed payloads are used.
+    """
+    return importlib.import_module("numpy")
+
+
+def _align(offset: int) -> int:
+    """
+    :param offset: A byte offset.
+    :return: The offset rounded up to ALIGNMENT.
+    """
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+class Field(NamedTuple):
+    """
+    Array field of a typed message.
+
+    Attributes:
+        name (str): The field name.
+        dtype (str): The numpy dtype of the elements, with an explicit byte order, e.g. "<f4".
+        shape (Tuple[Optional[int], ...]): The array shape, None for the dimensions set by every message.
+    """
+    name: str
+    dtype: str
+    shape: Tuple[Optional[int], ...]
+
+
+class Schema:
+    """
+    Typed message made of n-dimensional arrays, serialized the same way whatever the transport:
+    a small header with the schema identifier and the dimensions of every field, then the raw array data,
+    each field aligned to ALIGNMENT bytes. Decoding exposes the fields as `numpy.frombuffer` views over
+    the received buffer, so a 4MB frame is never copied or converted on the receive side.
+
+    Attributes:
+        name (str): The message type name.
+        fields (List[Field]): The array fields, in serialization order.
+        identifier (int): CRC32 of the name and fields, both sides must use the same schema.
+    """
+
+    def __init__(self, name: str, fields: List[Field]) -> None:
+        """
+        :param name: The message type name.
+        :param fields: The array fields, in serialization order.
+        """
+        self.name = name
+        self.fields = fields
+        self.identifier = zlib.crc32(repr((name, [tuple(field) for field in fields])).encode())
+        self._dimensions = struct.Struct("<" + "".join("I" * len(field.shape) for field in fields))
+        self._data_offset = _align(SCHEMA_HEADER.size + self._dimensions.size)
+        # numpy dtypes of the fields, resolved on first use
+        self._dtypes: list = []
+
+    def _field_dtypes(self) -> list:
+        """
+        :return: The numpy dtype of every field.
+        """
+        if not self._dtypes:
+            numpy = _numpy()
+            self._dtypes = [numpy.dtype(field.dtype) for field in self.fields]
+        return self._dtypes
+
+    def _layout(self, shapes: List[Tuple[int, ...]]) -> Tuple[List[int], int]:
+        """
+        :param shapes: The shape of every field.
+        :return: The offset of every field within the payload, and the payload size.
+        """
+        offsets = []
+        offset = self._data_offset
+        for dtype, shape in zip(self._field_dtypes(), shapes):
+            offsets.append(offset)
+            offset = _align(offset + math.prod(shape) * dtype.itemsize)
+        return offsets, offset
+
+    def encode(self, arrays: Dict) -> bytearray:
+        """
+        Serialize the arrays of a message, converting them to the field dtypes if needed.
+
+        :param arrays: The array of every field, by field name.
+        :return: The payload.
+        """
+        numpy = _numpy()
+        values = []
+        for field in self.fields:
+            value = numpy.ascontiguousarray(arrays[field.name], dtype=field.dtype)
+            if value.ndim != len(field.shape) or any(expected is not None and expected != actual
+                                                     for expected, actual in zip(field.shape, value.shape)):
+                raise ValueError(f"{self.name}.{field.name}: shape {value.shape} does not match {field.shape}")
+            values.append(value)
+        offsets, size = self._layout([value.shape for value in values])
+
+        payload = bytearray(size)
+        SCHEMA_HEADER.pack_into(payload, 0, self.identifier, LAYOUT_VERSION, len(self.fields))
+        self._dimensions.pack_into(payload, SCHEMA_HEADER.size, *(dimension for value in values for dimension in value.shape))
+        for dtype, value, offset in zip(self._field_dtypes(), values, offsets):
+            numpy.frombuffer(payload, dtype=dtype, count=value.size, offset=offset)[:] = value.reshape(-1)
+        return payload
+
+    def decode(self, payload: Buffer) -> Dict:
+        """
+        Expose the fields of a payload without copying them.
+
+        :param payload: The payload, e.g. the view returned by message.decode.
+        :return: A `numpy.frombuffer` view of every field, by field name, read-only for immutable buffers
+            and only valid while the buffer is.
+        """
+        numpy = _numpy()
+        view = memoryview(payload)
+        if len(view) < self._data_offset:
+            raise ValueError(f"Payload of {len(view)} bytes is shorter than the {self.name} header")
+        identifier, version, count = SCHEMA_HEADER.unpack_from(view)
+        if identifier != self.identifier or count != len(self.fields):
+            raise ValueError(f"Payload of schema 0x{identifier:08x} is not a {self.name} (0x{self.identifier:08x})")
+        if version != LAYOUT_VERSION:
+            raise ValueError(f"Unsupported typed payload layout {version}")
+
+        dimensions = iter(self._dimensions.unpack_from(view, SCHEMA_HEADER.size))
+        shapes = [tuple(next(dimensions) for _ in field.shape) for field in self.fields]
+        offsets, size = self._layout(shapes)
+        if size > len(view):
+            raise ValueError(f"Truncated {self.name}: {size} bytes announced, got {len(view)}")
+        return {field.name: numpy.frombuffer(view, dtype=dtype, count=math.prod(shape), offset=offset).reshape(shape)
+                for field, dtype, shape, offset in zip(self.fields, self._field_dtypes(), shapes, offsets)}
+
+
+# Raw camera frame, height x width x BGR
+IMAGE_FRAME = Schema("ImageFrame", [Field("pixels", "|u1", (None, None, 3))])
+# LiDAR sweep, float32 (x, y, z, intensity) points
+POINT_CLOUD = Schema("PointCloud", [Field("points", "<f4", (None, 4))])
+# Schema name -> typed message, the synthetic payload of the same name generates its arrays
+SCHEMAS: Dict[str, Schema] = {
+    "image": IMAGE_FRAME,
+    "pointcloud": POINT_CLOUD,
+}
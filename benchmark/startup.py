@@ -0,0 +1,89 @@
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+# Time the benchmark package was first imported, when the process start time is not available
+_IMPORTED = time.time()
+# The process phase only describes the first side started in a process
+_process_measured = False
+
+
+def process_start_time() -> float:
+    """
+    :return: Time the current process started, in seconds since the epoch. From /proc on Linux
+        (10 ms resolution), otherwise the time the benchmark package was imported.
+    """
+    try:
+        with open("/proc/self/stat", "r") as stat_file:
+            # The command name may contain spaces, the fields after it are space separated
+            fields = stat_file.read().rsplit(")", 1)[1].split()
+        with open("/proc/stat", "r") as system_file:
+            boot_time = next(int(line.split()[1]) for line in system_file if line.startswith("btime "))
+    except (OSError, IndexError, StopIteration, ValueError):
+        return _IMPORTED
+    # Field 22 of stat, the start time in clock ticks after boot, is the 20th after the command name
+    return boot_time + int(fields[19]) / os.sysconf("SC_CLK_TCK")
+
+
+class StartupTimes:
+    """
+    Durations of the startup phases of one side of a benchmark, in seconds.
+
+    The "process" phase runs from the process start to the creation of the first StartupTimes of the process:
+    interpreter startup, package imports and configuration. The other phases are measured around the transport calls:
+    "import" of the middleware module, "open" of the transport entities, "discovery" until the subscribers
+    are ready (publisher), and "first_message" from the open subscriber to the first message received.
+
+    Attributes:
+        role (str): The side: "publisher", "subscriber" or "ping".
+        phases (Dict[str, float]): Duration of every measured phase, in measurement order.
+    """
+
+    def __init__(self, role: str) -> None:
+        """
+        Start measuring, recording the process phase for the first side of the process.
+
+        :param role: The side: "publisher", "subscriber" or "ping".
+        """
+        global _process_measured
+        self.role = role
+        self.phases: Dict[str, float] = {}
+        if not _process_measured:
+            _process_measured = True
+            self.phases["process"] = max(time.time() - process_start_time(), 0.0)
+
+    @contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        """
+        Record the duration of the enclosed block as a phase.
+
+        :param phase: The phase name.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[phase] = time.perf_counter() - start
+
+    def record(self, phase: str, seconds: float) -> None:
+        """
+        Record a phase measured elsewhere.
+
+        :param phase: The phase name.
+        :param seconds: The duration of the phase.
+        """
+        self.phases[phase] = seconds
+
+    def prefixed(self) -> Dict[str, float]:
+        """
+        :return: The phases keyed by role and phase, e.g. "publisher_discovery".
+        """
+        return {f"{self.role}_{phase}": seconds for phase, seconds in self.phases.items()}
+
+    def report(self) -> None:
+        """
+        Print the startup phases.
+        """
+        print(f"Startup ({self.role}): " + ", ".join(f"{phase.replace('_', ' ')} {seconds * 1e3:.1f} ms"
+                                                     for phase, seconds in self.phases.items()))
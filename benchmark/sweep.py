@@ -0,0 +1,194 @@
+import dataclasses
+import itertools
+from typing import Iterator, List, Optional
+
+from benchmark.config import ZMQ_ENDPOINTS, BenchmarkConfig, DdsConfig, ZmqConfig
+
+# A point is past the knee when it achieves less than this fraction of the offered rate ...
+KNEE_RATE_RATIO = 0.95
+# ... delivers less than this fraction of the messages ...
+KNEE_DELIVERED_RATIO = 0.99
+# ... or its p99 latency grows beyond this factor of the p99 at the lowest rate of the same payload size
+KNEE_LATENCY_FACTOR = 2.0
+# DDS settings that can be swept, in the order they are described
+DDS_QOS_FIELDS = ("profile", "data_sharing", "reliability", "history_depth", "max_samples", "publish_mode",
+                  "flow_controller_rate")
+# ZeroMQ settings that can be swept, in the order they are described; endpoint is a key of ZMQ_ENDPOINTS
+ZMQ_SWEEP_FIELDS = ("endpoint", "pattern", "send_hwm", "receive_hwm", "send_buffer", "receive_buffer", "io_threads",
+                    "multipart")
+
+
+def _combinations(sweep: dict, fields: tuple, middleware: str) -> Iterator[dict]:
+    """
+    :param sweep: Setting name -> values to sweep.
+    :param fields: The settings that can be swept, in order.
+    :param middleware: The middleware name, for errors.
+    :return: The settings of every combination of the swept values, a single empty one without a sweep.
+    """
+    unknown = set(sweep) - set(fields)
+    if unknown:
+        raise ValueError(f"Cannot sweep the {middleware} settings {sorted(unknown)}, expected some of {list(fields)}")
+    names = [name for name in fields if name in sweep]
+    for values in itertools.product(*(sweep[name] for name in names)):
+        yield dict(zip(names, values))
+
+
+def dds_variants(config: BenchmarkConfig) -> Iterator[DdsConfig]:
+    """
+    Expand the DDS QoS sweep: every combination of the values in `config.dds.sweep`.
+
+    :param config: The benchmark configuration.
+    :return: The DDS settings of every combination, the configured ones without a QoS sweep.
+    """
+    for settings in _combinations(config.dds.sweep, DDS_QOS_FIELDS, "DDS"):
+        yield dataclasses.replace(config.dds, sweep={}, **settings)
+
+
+def zmq_variants(config: BenchmarkConfig) -> Iterator[ZmqConfig]:
+    """
+    Expand the ZeroMQ sweep: every combination of the values in `config.zmq.sweep`.
+
+    :param config: The benchmark configuration.
+    :return: The ZeroMQ settings of every combination, the configured ones without a sweep.
+    """
+    for settings in _combinations(config.zmq.sweep, ZMQ_SWEEP_FIELDS, "ZeroMQ"):
+        endpoint = settings.pop("endpoint", None)
+        if endpoint is not None and endpoint not in ZMQ_ENDPOINTS:
+            raise ValueError(f"Unknown ZeroMQ endpoint '{endpoint}', expected one of {sorted(ZMQ_ENDPOINTS)}")
+        yield dataclasses.replace(config.zmq, sweep={}, **ZMQ_ENDPOINTS.get(endpoint, {}), **settings)
+
+
+def describe_qos(dds: DdsConfig) -> str:
+    """
+    :param dds: The DDS settings.
+    :return: A short description of the profile and QoS overrides, e.g. "SHMParticipant reliable depth=10 async".
+    """
+    parts = [dds.profile]
+    if dds.data_sharing is not None:
+        parts.append(f"ds={dds.data_sharing}")
+    if dds.reliability is not None:
+        parts.append(dds.reliability)
+    if dds.history_depth is not None:
+        parts.append(f"depth={dds.history_depth}" if dds.history_depth else "keep-all")
+    if dds.max_samples is not None:
+        parts.append(f"max={dds.max_samples}")
+    if dds.publish_mode is not None:
+        parts.append(dds.publish_mode)
+    if dds.flow_controller_rate is not None:
+        parts.append(f"flow={dds.flow_controller_rate / 1e6:g}MB/s")
+    return " ".join(parts)
+
+
+def describe_zmq(zmq: ZmqConfig) -> str:
+    """
+    :param zmq: The ZeroMQ settings.
+    :return: A short description of the endpoint kind, pattern and socket options, e.g. "ipc pushpull sndhwm=100".
+    """
+    parts = [zmq.publisher_address.split("://", 1)[0], zmq.pattern]
+    if zmq.send_hwm is not None:
+        parts.append(f"sndhwm={zmq.send_hwm}")
+    if zmq.receive_hwm is not None:
+        parts.append(f"rcvhwm={zmq.receive_hwm}")
+    if zmq.send_buffer is not None:
+        parts.append(f"sndbuf={zmq.send_buffer}")
+    if zmq.receive_buffer is not None:
+        parts.append(f"rcvbuf={zmq.receive_buffer}")
+    if zmq.io_threads != 1:
+        parts.append(f"io={zmq.io_threads}")
+    if zmq.multipart:
+        parts.append("multipart")
+    return " ".join(parts)
+
+
+def describe_variant(config: BenchmarkConfig, transport: str) -> Optional[str]:
+    """
+    :param config: The configuration of a run.
+    :param transport: The transport name.
+    :return: The description of the middleware settings of the run, None for the default settings of Zenoh.
+    """
+    if transport == "dds":
+        return describe_qos(config.dds)
+    if transport == "zmq":
+        return describe_zmq(config.zmq)
+    if transport == "zenoh" and config.zenoh.shared_memory:
+        return "shm"
+    return None
+
+
+def sweep_configs(config: BenchmarkConfig, transport: Optional[str] = None) -> Iterator[BenchmarkConfig]:
+    """
+    Expand the sweep matrix of a configuration: middleware setting combinations in the outer loop (DDS QoS
+    and ZeroMQ socket settings, on their own transport only), then subscriber counts, then payload sizes,
+    then rates in the inner one. Without sweep values the configuration itself is the only point.
+
+    :param config: The benchmark configuration.
+    :param transport: The transport the points run on, None when they are shared by several transports.
+    :return: One configuration per (variant, subscribers, payload size, rate) point.
+    """
+    variants = itertools.product(dds_variants(config) if transport == "dds" else [config.dds],
+                                 zmq_variants(config) if transport == "zmq" else [config.zmq])
+    subscriber_counts = config.sweep_subscribers or [config.subscribers]
+    payload_sizes = config.sweep_payload_sizes or [config.payload_size]
+    # Back-to-back (rate 0) is the highest possible rate
+    rates = sorted(config.sweep_rates or [config.rate], key=lambda rate: rate or float("inf"))
+    for dds, zmq in variants:
+        for subscribers in subscriber_counts:
+            for payload_size in payload_sizes:
+                for rate in rates:
+                    yield dataclasses.replace(config, dds=dds, zmq=zmq, subscribers=subscribers,
+                                              payload_size=payload_size, rate=rate)
+
+
+def find_knees(results: List) -> set:
+    """
+    Find, for every transport (and middleware variant), subscriber count and payload size, the first rate past the
+    latency-throughput knee.
+
+    :param results: RunResult of every point, rates in increasing order within a payload size.
+    :return: Indexes in `results` of the knee points.
+    """
+    knees = set()
+    groups = {}
+    for index, result in enumerate(results):
+        groups.setdefault((result.transport, result.variant, result.subscribers, result.payload_size), []).append(index)
+
+    for indexes in groups.values():
+        # The lowest rate gives the unloaded latency
+        baseline = results[indexes[0]].histogram.percentile(99)
+        for index in indexes:
+            result = results[index]
+            delivery = result.delivery
+            saturated = result.rate > 0 and delivery["message_rate"] < KNEE_RATE_RATIO * result.rate
+            lossy = delivery["delivered_ratio"] < KNEE_DELIVERED_RATIO
+            slow = baseline and result.histogram.percentile(99) > KNEE_LATENCY_FACTOR * baseline
+            if saturated or lossy or slow:
+                knees.add(index)
+                break
+    return knees
+
+
+def print_table(results: List) -> None:
+    """
+    Print the latency and throughput of every sweep point, marking the knee of each payload size.
+    A Variant column describes the middleware settings (DDS QoS, ZeroMQ sockets) when some points have them.
+
+    :param results: RunResult of every point.
+    """
+    knees = find_knees(results)
+    variant_width = max(len(result.variant or "") for result in results)
+    variant_width = max(variant_width, len("Variant")) if variant_width else 0
+    variant_header = f"{'Variant':<{variant_width}} " if variant_width else ""
+    print(f"{'Transport':<10} {variant_header}{'Subs':>4} {'Payload':>10} {'Rate (Hz)':>10} {'Achieved':>10} {'MB/s':>9} {'Delivered':>10} "
+          f"{'p50 (ms)':>9} {'p99 (ms)':>9} {'p99.9 (ms)':>10} {'Max (ms)':>9} {'Send p50 (ms)':>13}")
+    for index, result in enumerate(results):
+        histogram = result.histogram
+        delivery = result.delivery
+        rate = f"{result.rate:g}" if result.rate else "max"
+        maximum = histogram.maximum if histogram.total else 0
+        send_time = f"{result.send_time.percentile(50) / 1e6:.2f}" if result.send_time is not None else "-"
+        variant = f"{result.variant or '-':<{variant_width}} " if variant_width else ""
+        print(f"{result.transport:<10} {variant}{result.subscribers:>4} {result.payload_size:>10} {rate:>10} {delivery['message_rate']:>10.1f} "
+              f"{delivery['goodput'] / 1e6:>9.2f} {delivery['delivered_ratio'] * 100:>9.2f}% "
+              f"{histogram.percentile(50) / 1e6:>9.2f} {histogram.percentile(99) / 1e6:>9.2f} "
+              f"{histogram.percentile(99.9) / 1e6:>10.2f} {maximum / 1e6:>9.2f} {send_time:>13}"
+              f"{'  <- knee' if index in knees else ''}")
@@ -0,0 +1,190 @@
+import dataclasses
+import itertools
+import random
+import statistics
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from benchmark.histogram import LatencyHistogram, merge
+from benchmark.resources import combine_usage
+
+# Batch size of the MSER steady-state detection (MSER-5)
+MSER_BATCH = 5
+# Resamples drawn for every bootstrap interval
+BOOTSTRAP_RESAMPLES = 10000
+# Statistic -> its value in ms from a latency histogram, summarized over the trials
+TRIAL_METRICS: Dict[str, Callable[[LatencyHistogram], float]] = {
+    "mean": lambda histogram: histogram.mean() / 1e6,
+    "p50": lambda histogram: histogram.percentile(50) / 1e6,
+    "p99": lambda histogram: histogram.percentile(99) / 1e6,
+    "p99.9": lambda histogram: histogram.percentile(99.9) / 1e6,
+}
+
+
+def steady_state_start(samples: Sequence[int], batch: int = MSER_BATCH) -> int:
+    """
+    Find the end of the warm-up transient of a series with the MSER rule: the series is cut in batches,
+    and the truncation point minimizing the standard error of the mean of the remaining batch means is kept.
+    Only the first half of the series is considered, a later minimum means no steady state was reached.
+
+    :param samples: The measurements, in arrival order.
+    :param batch: Number of samples per batch.
+    :return: Number of leading samples to exclude, 0 when there is no transient.
+    """
+    means = [statistics.fmean(samples[start:start + batch]) for start in range(0, len(samples) - batch + 1, batch)]
+    if len(means) < 4:
+        return 0
+    # Sums and squared sums of the batch means from every truncation point to the end
+    suffix_sums = list(itertools.accumulate(reversed(means)))[::-1]
+    suffix_squares = list(itertools.accumulate(value * value for value in reversed(means)))[::-1]
+    best, best_error = 0, float("inf")
+    for start in range(len(means) // 2 + 1):
+        remaining = len(means) - start
+        deviations = suffix_squares[start] - suffix_sums[start] ** 2 / remaining
+        error = max(deviations, 0.0) / remaining ** 2
+        if error < best_error:
+            best, best_error = start, error
+    return best * batch
+
+
+def _interval(distribution: List[float], confidence: float) -> Tuple[float, float]:
+    """
+    :param distribution: The bootstrap distribution of a statistic, sorted in place.
+    :param confidence: The confidence level.
+    :return: The percentile interval of the distribution.
+    """
+    distribution.sort()
+    last = len(distribution) - 1
+    low = distribution[max(int((1 - confidence) / 2 * last), 0)]
+    high = distribution[min(int((1 + confidence) / 2 * last + 0.5), last)]
+    return low, high
+
+
+def bootstrap_interval(values: Sequence[float], confidence: float = 0.95, resamples: int = BOOTSTRAP_RESAMPLES,
+                       seed: int = 0) -> Tuple[float, float]:
+    """
+    Percentile bootstrap confidence interval of the mean of independent values, e.g. a statistic of every trial.
+
+    :param values: The values, at least one.
+    :param confidence: The confidence level.
+    :param resamples: Number of resamples.
+    :param seed: Seed of the resampling, for reproducible intervals.
+    :return: The lower and upper bounds of the interval.
+    """
+    generator = random.Random(seed)
+    means = [statistics.fmean(generator.choices(values, k=len(values))) for _ in range(resamples)]
+    return _interval(means, confidence)
+
+
+def bootstrap_difference(first: Sequence[float], second: Sequence[float], confidence: float = 0.95,
+                         resamples: int = BOOTSTRAP_RESAMPLES, seed: int = 0) -> Tuple[float, float]:
+    """
+    Percentile bootstrap confidence interval of the difference of the means of two independent sets of values.
+    The difference is significant at this confidence level when the interval does not contain 0.
+
+    :param first: The values of the first set.
+    :param second: The values of the second set.
+    :param confidence: The confidence level.
+    :param resamples: Number of resamples.
+    :param seed: Seed of the resampling, for reproducible intervals.
+    :return: The lower and upper bounds of the interval of mean(first) - mean(second).
+    """
+    generator = random.Random(seed)
+    differences = [statistics.fmean(generator.choices(first, k=len(first)))
+                   - statistics.fmean(generator.choices(second, k=len(second))) for _ in range(resamples)]
+    return _interval(differences, confidence)
+
+
+def trial_metrics(result) -> Dict[str, List[float]]:
+    """
+    :param result: A RunResult combining several trials, see combine_trials.
+    :return: The values of every statistic of TRIAL_METRICS over the trials that received messages, in ms.
+    """
+    trials = [trial for trial in result.trials if trial.histogram.total]
+    return {name: [metric(trial.histogram) for trial in trials] for name, metric in TRIAL_METRICS.items()}
+
+
+def combine_trials(results: List):
+    """
+    Combine the trials of a sweep point into one result: the latencies are merged, the delivery counts summed,
+    and the rates, startup phases and excluded warm-up messages averaged over the trials. The resource usage of
+    every side is combined, see combine_usage.
+
+    :param results: RunResult of every trial of the point.
+    :return: The combined RunResult, keeping the trials; the single result itself for one trial.
+    """
+    if len(results) == 1:
+        return results[0]
+    summaries = [result.delivery for result in results]
+    delivery = {name: sum(summary[name] for summary in summaries)
+                for name in ("sent", "delivered", "lost", "duplicates", "out_of_order")}
+    delivery["publishers"] = max(summary["publishers"] for summary in summaries)
+    delivery["delivered_ratio"] = delivery["delivered"] / delivery["sent"] if delivery["sent"] else 0.0
+    for name in ("goodput", "message_rate"):
+        delivery[name] = statistics.fmean(summary[name] for summary in summaries)
+    send_times = [result.send_time for result in results if result.send_time is not None]
+    phases = {phase for result in results for phase in result.startup}
+    startup = {phase: statistics.fmean(result.startup[phase] for result in results if phase in result.startup)
+               for phase in phases}
+    return dataclasses.replace(results[0], histogram=merge(result.histogram for result in results), delivery=delivery,
+                               send_time=merge(send_times) if send_times else None, per_subscriber=[], records=None,
+                               startup=startup, trials=list(results),
+                               resources={role: combine_usage([result.resources.get(role, {}) for result in results])
+                                          for role in results[0].resources},
+                               warmup_excluded=round(statistics.fmean(result.warmup_excluded for result in results)))
+
+
+def _label(result) -> str:
+    """
+    :param result: A RunResult.
+    :return: The transport, with its middleware variant if any.
+    """
+    return f"{result.transport} ({result.variant})" if result.variant else result.transport
+
+
+def report_trials(result, confidence: float = 0.95) -> None:
+    """
+    Print the statistics of a point over its trials, with their bootstrap confidence intervals.
+
+    :param result: A RunResult combining several trials, see combine_trials.
+    :param confidence: The confidence level.
+    """
+    metrics = trial_metrics(result)
+    if not metrics["mean"]:
+        return
+    print(f"[{_label(result)}] {len(metrics['mean'])} trials, mean over the trials "
+          f"[{confidence * 100:g}% bootstrap confidence interval]:")
+    for name, values in metrics.items():
+        low, high = bootstrap_interval(values, confidence)
+        spread = f", stdev {statistics.stdev(values):.3f} ms" if len(values) > 1 else ""
+        print(f"  {name:<6} {statistics.fmean(values):8.3f} ms [{low:.3f}, {high:.3f}]{spread}")
+
+
+def compare_trials(results: List, confidence: float = 0.95) -> None:
+    """
+    Compare the transports (and middleware variants) measured at the same workload point: print the bootstrap
+    confidence interval of the difference of every statistic, and whether it is significant or noise.
+
+    :param results: RunResult of every point, combining several trials.
+    :param confidence: The confidence level.
+    """
+    groups = {}
+    for result in results:
+        if len(result.trials) > 1:
+            groups.setdefault((result.subscribers, result.payload_size, result.rate), []).append(result)
+    groups = {key: group for key, group in groups.items() if len(group) > 1}
+    if not groups:
+        return
+    print(f"Differences of the trial means [{confidence * 100:g}% bootstrap confidence interval], "
+          f"significant when the interval excludes 0:")
+    for (subscribers, payload_size, rate), group in groups.items():
+        print(f"{payload_size} bytes at {f'{rate:g} Hz' if rate else 'max rate'}, {subscribers} subscribers:")
+        for first, second in itertools.combinations(group, 2):
+            first_metrics, second_metrics = trial_metrics(first), trial_metrics(second)
+            if not first_metrics["mean"] or not second_metrics["mean"]:
+                continue
+            for name in TRIAL_METRICS:
+                difference = statistics.fmean(first_metrics[name]) - statistics.fmean(second_metrics[name])
+                low, high = bootstrap_difference(first_metrics[name], second_metrics[name], confidence)
+                verdict = "significant" if low > 0 or high < 0 else "noise"
+                print(f"  {_label(first)} - {_label(second)} {name:<6} {difference:+8.3f} ms "
+                      f"[{low:+.3f}, {high:+.3f}] {verdict}")
@@ -45,14 +45,15 @@ fi
 echo "Building Docker image '$CONTAINER_NAME' with tag $TAG..."
 docker build --build-arg BASE_IMAGE_TAG=$TAG -t $CONTAINER_NAME -f Dockerfile.dev .
 
-# Run the container in detached mode, mounting the src/ directory
+# Run the container in detached mode, mounting the src/ directory and the shared benchmark package
 echo "Running container '$CONTAINER_NAME' in detached mode with volume..."
 #--ipc container:$IPC_SHARED_CONTAINER_NAME
 docker run -itd \
     --network host  \
     --name $CONTAINER_NAME \
     --ipc container:$IPC_SHARED_CONTAINER_NAME \
-    -v $(pwd)/src:/root/app $CONTAINER_NAME
+    -v $(pwd)/src:/root/app \
+    -v $(pwd)/../benchmark:/root/app/benchmark $CONTAINER_NAME
 
     #--ipc container:$IPC_SHARED_CONTAINER_NAME \
 
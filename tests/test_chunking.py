@@ -0,0 +1,86 @@
+import random
+
+from benchmark import message
+from benchmark.config import BenchmarkConfig
+from benchmark.protocols.base import TransportPublisher, TransportSubscriber
+from benchmark.protocols.chunking import ChunkingPublisher, ChunkingSubscriber
+
+
+class LoopbackPublisher(TransportPublisher):
+    """
+    Publisher keeping a copy of every message sent.
+    """
+
+    def __init__(self, config) -> None:
+        super().__init__(config)
+        self.sent = []
+
+    def open(self) -> None:
+        pass
+
+    def send(self, data) -> None:
+        self.sent.append(bytes(data))
+
+    def close(self) -> None:
+        pass
+
+
+class ListSubscriber(TransportSubscriber):
+    """
+    Subscriber whose messages are pushed by the test.
+    """
+
+    def __init__(self, config) -> None:
+        super().__init__(config)
+        self.callback = None
+
+    def open(self, callback) -> None:
+        self.callback = callback
+
+    def close(self) -> None:
+        pass
+
+
+def _setup(payload_size: int, chunk_size: int, reassembly_slots: int = 4):
+    config = BenchmarkConfig(payload_size=payload_size, chunk_size=chunk_size, reassembly_slots=reassembly_slots)
+    publisher = ChunkingPublisher(LoopbackPublisher(config), config)
+    inner = ListSubscriber(config)
+    subscriber = ChunkingSubscriber(inner, config)
+    received = []
+    subscriber.open(lambda data: received.append(bytes(data)))
+    return publisher, inner, subscriber, received
+
+
+def test_chunks_are_reassembled_in_any_order():
+    publisher, inner, _, received = _setup(10000, 1024)
+    payload = bytes(random.Random(0).getrandbits(8) for _ in range(10000))
+    data = message.encode(7, 3, payload, timestamp_ns=99)
+    publisher.send(data)
+    chunks = publisher.inner.sent
+    assert len(chunks) == 10
+    random.Random(1).shuffle(chunks)
+    for chunk in chunks + chunks[:2]:
+        inner.callback(chunk)
+    assert received == [data]
+
+
+def test_small_messages_pass_through():
+    publisher, inner, _, received = _setup(100, 1024)
+    data = message.encode(1, 0, b"small")
+    publisher.send(data)
+    assert publisher.inner.sent == [data]
+    inner.callback(data)
+    assert received == [data]
+
+
+def test_oldest_incomplete_message_is_dropped():
+    publisher, inner, subscriber, received = _setup(4096, 1024, reassembly_slots=1)
+    first, second = message.encode(1, 0, bytes(4096)), message.encode(1, 1, b"\x01" * 4096)
+    publisher.send(first)
+    publisher.send(second)
+    first_chunks, second_chunks = publisher.inner.sent[:4], publisher.inner.sent[4:]
+    inner.callback(first_chunks[0])
+    for chunk in second_chunks:
+        inner.callback(chunk)
+    assert received == [second]
+    assert subscriber.dropped == 1
@@ -0,0 +1,27 @@
+import pytest
+
+from benchmark import cli
+from benchmark.protocols import UnsupportedSetting
+
+
+def _unsupported(transport, point):
+    raise UnsupportedSetting("unsupported setting (no attribute 'publish_mode')")
+
+
+def test_unsupported_point_is_skipped(monkeypatch, capsys):
+    calls = []
+    monkeypatch.setattr(cli, "validate_config", _unsupported)
+    monkeypatch.setitem(cli.TRANSPORT_COMMANDS, ("run", "oneway"), lambda point, transport: calls.append(point))
+    cli.main(["run", "--transport", "zmq", "--count", "1"])
+    assert not calls
+    assert "Skipping" in capsys.readouterr().out
+
+
+def test_run_errors_are_not_taken_for_unsupported_settings(monkeypatch):
+    def broken(point, transport):
+        raise AttributeError("bug in the benchmark")
+
+    monkeypatch.setattr(cli, "validate_config", lambda transport, point: None)
+    monkeypatch.setitem(cli.TRANSPORT_COMMANDS, ("run", "oneway"), broken)
+    with pytest.raises(AttributeError, match="bug"):
+        cli.main(["run", "--transport", "zmq", "--count", "1"])
@@ -0,0 +1,38 @@
+import pytest
+
+from benchmark.clock import ClockOffsetEstimator
+
+
+def _exchange(estimator, t0, offset, outbound, inbound, processing=1000):
+    t1 = t0 + outbound + offset
+    t2 = t1 + processing
+    estimator.add(t0, t1, t2, t2 - offset + inbound)
+
+
+def test_offset_of_symmetric_exchanges():
+    estimator = ClockOffsetEstimator(window=4)
+    assert estimator.offset(0) is None
+    _exchange(estimator, 0, 5_000_000, 100_000, 100_000)
+    assert estimator.offset(0) == 5_000_000
+
+
+def test_min_round_trip_exchange_is_kept():
+    estimator = ClockOffsetEstimator(window=4)
+    # Asymmetric, slow exchanges bias the offset, the fastest one does not
+    _exchange(estimator, 0, 1_000_000, 900_000, 100_000)
+    _exchange(estimator, 10_000_000, 1_000_000, 50_000, 50_000)
+    _exchange(estimator, 20_000_000, 1_000_000, 100_000, 700_000)
+    _exchange(estimator, 30_000_000, 1_000_000, 400_000, 200_000)
+    assert estimator.points[0][1] == 1_000_000
+    assert estimator.min_round_trip() == 100_000
+    assert estimator.offset(10_000_000) == 1_000_000
+
+
+def test_drift_is_tracked():
+    estimator = ClockOffsetEstimator(window=1, history=16)
+    # The remote clock runs 20 ppm fast
+    for index in range(10):
+        t0 = index * 1_000_000_000
+        _exchange(estimator, t0, 3_000_000 + t0 * 20 // 1_000_000, 50_000, 50_000)
+    assert estimator.drift_ppm() == pytest.approx(20, rel=1e-3)
+    assert estimator.offset(20_000_000_000) == pytest.approx(3_400_000, abs=10)
@@ -0,0 +1,76 @@
+import threading
+
+import pytest
+
+from benchmark import message
+from benchmark.config import BenchmarkConfig
+from benchmark.protocols.base import TransportPublisher, TransportSubscriber
+from benchmark.protocols.compression import CompressingPublisher, DecompressingSubscriber
+
+
+class LoopbackPublisher(TransportPublisher):
+    """
+    Publisher keeping a copy of every message sent, failing from a given message on.
+    """
+
+    def __init__(self, config, fail_from=None) -> None:
+        super().__init__(config)
+        self.sent = []
+        self.fail_from = fail_from
+        self.failed = threading.Event()
+
+    def open(self) -> None:
+        pass
+
+    def send(self, data) -> None:
+        if self.fail_from is not None and len(self.sent) >= self.fail_from:
+            self.failed.set()
+            raise OSError("link down")
+        self.sent.append(bytes(data))
+
+    def close(self) -> None:
+        pass
+
+
+class ListSubscriber(TransportSubscriber):
+    def open(self, callback) -> None:
+        self.callback = callback
+
+    def close(self) -> None:
+        pass
+
+
+def _publisher(fail_from=None, **settings) -> CompressingPublisher:
+    config = BenchmarkConfig(compression="zlib", **settings)
+    publisher = CompressingPublisher(LoopbackPublisher(config, fail_from), config)
+    publisher.open()
+    return publisher
+
+
+def test_round_trip_in_order():
+    publisher = _publisher()
+    messages = [message.encode(1, sequence, b"abc" * 10000) for sequence in range(20)]
+    for data in messages:
+        publisher.send(data)
+    publisher.close()
+    assert publisher.compressed == 20
+    subscriber = DecompressingSubscriber(ListSubscriber(publisher.config), publisher.config)
+    received = []
+    subscriber.open(lambda data: received.append(bytes(data)))
+    for data in publisher.inner.sent:
+        subscriber.inner.callback(data)
+    assert received == messages
+
+
+def test_send_errors_fail_the_publish_loop():
+    publisher = _publisher(fail_from=2)
+    guards = [publisher.send(message.encode(1, sequence, b"abc" * 1000)) for sequence in range(4)]
+    for guard in guards:
+        guard.wait()
+    assert publisher.inner.failed.is_set()
+    with pytest.raises(RuntimeError, match="link down"):
+        publisher.send(message.encode(1, 4, b"abc"))
+    with pytest.raises(RuntimeError):
+        publisher.report()
+    publisher.close()
+    assert len(publisher.inner.sent) == 2
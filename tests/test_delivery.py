@@ -0,0 +1,57 @@
+from benchmark.delivery import DeliveryStatistics, StreamTracker
+
+
+def _track(sequences, expected=None) -> StreamTracker:
+    tracker = StreamTracker(expected)
+    for sequence in sequences:
+        tracker.record(sequence, 10, 0, 1)
+    return tracker
+
+
+def test_in_order_stream():
+    tracker = _track(range(5), expected=5)
+    assert (tracker.delivered, tracker.lost(), tracker.gaps) == (5, 0, 0)
+    assert tracker.complete()
+
+
+def test_gaps_and_loss():
+    tracker = _track([0, 1, 4, 5, 9], expected=10)
+    assert tracker.gaps == 2
+    assert tracker.missing == {2, 3, 6, 7, 8}
+    assert tracker.lost() == 5
+    assert tracker.payload_bytes == 50
+
+
+def test_reordered_messages_fill_the_gaps():
+    tracker = _track([0, 3, 1, 2])
+    assert tracker.out_of_order == 2
+    assert not tracker.missing
+    assert tracker.delivered == 4
+
+
+def test_duplicates_are_not_delivered_twice():
+    tracker = StreamTracker()
+    assert tracker.record(0, 10, 0, 1)
+    assert tracker.record(2, 10, 0, 1)
+    assert not tracker.record(2, 10, 0, 1)
+    assert not tracker.record(0, 10, 0, 1)
+    assert tracker.record(1, 10, 0, 1)
+    assert (tracker.duplicates, tracker.delivered, tracker.out_of_order) == (2, 3, 1)
+
+
+def test_goodput_over_the_stream_duration():
+    tracker = StreamTracker()
+    tracker.record(0, 1000, 0, 500_000_000)
+    tracker.record(1, 1000, 100, 1_000_000_000)
+    assert tracker.goodput() == 2000
+    assert tracker.message_rate() == 2
+
+
+def test_statistics_per_publisher():
+    statistics = DeliveryStatistics(expected=3)
+    for publisher_id in (1, 2):
+        for sequence in range(3 if publisher_id == 1 else 2):
+            statistics.record(publisher_id, sequence, 10, 0, 1)
+    summary = statistics.summary()
+    assert (summary["publishers"], summary["sent"], summary["delivered"], summary["lost"]) == (2, 6, 5, 1)
+    assert not statistics.complete(2)
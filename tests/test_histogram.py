@@ -0,0 +1,65 @@
+import pytest
+
+from benchmark.histogram import LatencyHistogram, merge
+
+
+def _histogram(values, significant_figures=3) -> LatencyHistogram:
+    histogram = LatencyHistogram(significant_figures=significant_figures)
+    for value in values:
+        histogram.record(value)
+    return histogram
+
+
+def test_percentiles_within_precision():
+    histogram = _histogram(range(1, 100001))
+    for percentile in (50, 90, 99, 99.9):
+        expected = percentile * 1000
+        assert histogram.percentile(percentile) == pytest.approx(expected, rel=1e-3)
+    assert histogram.percentile(100) == 100000
+    assert (histogram.minimum, histogram.maximum, histogram.total) == (1, 100000, 100000)
+
+
+def test_exact_moments():
+    histogram = _histogram([10, 20, 30, 40])
+    assert histogram.mean() == 25
+    assert histogram.variance() == 125
+    assert LatencyHistogram().percentile(50) == 0
+
+
+def test_out_of_range_values_are_clamped():
+    histogram = LatencyHistogram(highest_trackable=1000)
+    histogram.record(-5)
+    histogram.record(5000)
+    assert histogram.clamped == 2
+    assert (histogram.minimum, histogram.maximum) == (0, 1000)
+
+
+def test_merge_adds_the_samples():
+    first, second = _histogram([1, 2, 3]), _histogram([1000, 2000])
+    merged = merge([first, second])
+    assert merged.total == 5
+    assert (merged.minimum, merged.maximum) == (1, 2000)
+    assert merged.mean() == pytest.approx(3006 / 5)
+    assert first.total == 3
+
+
+def test_merge_rejects_other_settings():
+    with pytest.raises(ValueError):
+        LatencyHistogram().merge(LatencyHistogram(significant_figures=2))
+
+
+def test_dict_round_trip():
+    histogram = _histogram([5, 500, 50000, 5000000])
+    restored = LatencyHistogram.from_dict(histogram.to_dict())
+    assert restored.counts == histogram.counts
+    assert restored.percentiles() == histogram.percentiles()
+    assert (restored.mean(), restored.stddev()) == (histogram.mean(), histogram.stddev())
+
+
+def test_reset_clears_every_sample():
+    histogram = _histogram([7, 70000, 7000000], significant_figures=5)
+    histogram.reset()
+    assert histogram.total == 0 and histogram.minimum is None and histogram.clamped == 0
+    assert not any(histogram.counts)
+    histogram.record(42)
+    assert histogram.percentile(50) == 42
@@ -0,0 +1,53 @@
+import pytest
+
+from benchmark import message
+
+
+def test_encode_decode_round_trip():
+    data = message.encode(0x1234, 42, b"payload", message.Flags.PING | message.Flags.WARMUP, timestamp_ns=123456789)
+    header, payload = message.decode(data)
+    assert header == message.MessageHeader(message.Flags.PING | message.Flags.WARMUP, 7, 0x1234, 42, 123456789)
+    assert bytes(payload) == b"payload"
+    assert len(data) == message.HEADER_SIZE + 7
+
+
+def test_decode_returns_a_view_over_the_payload():
+    data = bytearray(message.encode(1, 0, b"abc"))
+    _, payload = message.decode(data)
+    data[message.HEADER_SIZE] = ord("z")
+    assert bytes(payload) == b"zbc"
+
+
+def test_decode_ignores_trailing_bytes():
+    _, payload = message.decode(message.encode(1, 0, b"abc") + b"padding")
+    assert bytes(payload) == b"abc"
+
+
+@pytest.mark.parametrize("data, error", [
+    (b"short", "shorter"),
+    (b"\x00" * message.HEADER_SIZE, "magic"),
+    (message.encode(1, 0, b"abc")[:-1], "Truncated"),
+])
+def test_decode_rejects_invalid_messages(data, error):
+    with pytest.raises(ValueError, match=error):
+        message.decode(data)
+
+
+def test_decode_rejects_other_versions():
+    data = bytearray(message.encode(1, 0, b""))
+    data[2] = message.VERSION + 1
+    with pytest.raises(ValueError, match="version"):
+        message.decode(data)
+
+
+def test_decode_parts_without_joining():
+    data = message.encode(3, 9, b"payload")
+    parts = message.Parts(data[:message.HEADER_SIZE], data[message.HEADER_SIZE:])
+    header, payload = message.decode(parts)
+    assert (header.sequence, bytes(payload)) == (9, b"payload")
+    assert len(parts) == len(data) and bytes(parts) == data
+    buffer = bytearray(len(data) + 4)
+    message.copy_into(buffer, parts)
+    assert bytes(buffer[:len(data)]) == data
+    with pytest.raises(ValueError, match="Truncated"):
+        message.decode(message.Parts(data[:message.HEADER_SIZE], b"pay"))
@@ -0,0 +1,42 @@
+import json
+
+from benchmark.histogram import LatencyHistogram
+from benchmark.results import import_log, load_runs, report, save_run
+
+SUBSCRIBER_LOG = "".join(f"Received Packet {index}: Latency = {index}.5 ms, length = 1000 bytes\n" for index in (1, 2, 3))
+
+
+def _import(tmp_path, publisher_log=None) -> dict:
+    (tmp_path / "subscriber_zmq.log").write_text(SUBSCRIBER_LOG)
+    if publisher_log is not None:
+        (tmp_path / "publisher_zmq.log").write_text(publisher_log)
+    import_log(str(tmp_path / "subscriber_zmq.log"), str(tmp_path / "store"))
+    (metadata, columns), = load_runs(str(tmp_path / "store"))
+    assert list(columns["latency_ns"]) == [1_500_000, 2_500_000, 3_500_000]
+    return metadata["delivery"]
+
+
+def test_loss_is_taken_from_the_publisher_log(tmp_path):
+    delivery = _import(tmp_path, "".join(f"Sent packet {index}/10\n" for index in range(1, 11)))
+    assert (delivery["sent"], delivery["delivered"], delivery["lost"]) == (10, 3, 7)
+    assert delivery["delivered_ratio"] == 0.3
+
+
+def test_loss_is_unknown_without_publisher_log(tmp_path):
+    delivery = _import(tmp_path)
+    assert (delivery["sent"], delivery["lost"], delivery["delivered_ratio"]) == (None, None, None)
+
+
+def test_report_merges_runs_of_any_precision(tmp_path, capsys):
+    for figures in (2, 3, 5):
+        histogram = LatencyHistogram(significant_figures=figures)
+        for value in (1_000_000, 2_000_000):
+            histogram.record(value)
+        metadata = {"transport": "zmq", "profile": None, "mode": "oneway", "payload_size": 1000, "rate": 0.0,
+                    "subscribers": 1, "time": f"2025-01-0{figures}T00:00:00",
+                    "delivery": {"sent": 2, "delivered": 2}, "histogram": histogram.to_dict()}
+        save_run(str(tmp_path), json.loads(json.dumps(metadata)), None)
+    report(str(tmp_path))
+    row = capsys.readouterr().out.splitlines()[1].split()
+    assert row[3:6] == ["3", "6", "100.00%"]
+    assert float(row[6]) == 1.5
@@ -0,0 +1,41 @@
+import numpy
+import pytest
+
+from benchmark import message
+from benchmark.schema import ALIGNMENT, IMAGE_FRAME, POINT_CLOUD, Field, Schema
+
+
+def test_image_round_trip_without_copy():
+    pixels = numpy.arange(48 * 64 * 3, dtype=numpy.uint8).reshape(48, 64, 3)
+    data = bytearray(message.encode(1, 0, IMAGE_FRAME.encode({"pixels": pixels})))
+    _, payload = message.decode(data)
+    decoded = IMAGE_FRAME.decode(payload)["pixels"]
+    numpy.testing.assert_array_equal(decoded, pixels)
+    assert numpy.shares_memory(decoded, numpy.frombuffer(data, dtype=numpy.uint8))
+
+
+def test_fields_are_aligned_and_converted():
+    schema = Schema("Pair", [Field("labels", "<u2", (None,)), Field("values", "<f8", (None, 2))])
+    values = numpy.arange(6).reshape(3, 2)
+    payload = schema.encode({"labels": [1, 2, 3], "values": values})
+    decoded = schema.decode(payload)
+    assert decoded["values"].dtype == numpy.float64
+    numpy.testing.assert_array_equal(decoded["values"], values)
+    numpy.testing.assert_array_equal(decoded["labels"], [1, 2, 3])
+    base = numpy.frombuffer(payload, dtype=numpy.uint8).ctypes.data
+    assert all((array.ctypes.data - base) % ALIGNMENT == 0 for array in decoded.values())
+
+
+def test_encode_checks_the_fixed_dimensions():
+    with pytest.raises(ValueError, match="shape"):
+        POINT_CLOUD.encode({"points": numpy.zeros((10, 3), dtype=numpy.float32)})
+
+
+def test_decode_rejects_other_schemas_and_truncated_payloads():
+    payload = POINT_CLOUD.encode({"points": numpy.ones((100, 4), dtype=numpy.float32)})
+    with pytest.raises(ValueError, match="is not a ImageFrame"):
+        IMAGE_FRAME.decode(payload)
+    with pytest.raises(ValueError, match="Truncated"):
+        POINT_CLOUD.decode(payload[:-16])
+    with pytest.raises(ValueError, match="shorter"):
+        POINT_CLOUD.decode(payload[:4])
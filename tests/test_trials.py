@@ -0,0 +1,40 @@
+import random
+
+from benchmark.trials import bootstrap_difference, bootstrap_interval, steady_state_start
+
+
+def test_transient_is_detected():
+    generator = random.Random(0)
+    samples = [20_000_000 - index * 100_000 for index in range(100)]
+    samples += [10_000_000 + generator.randint(-100_000, 100_000) for _ in range(900)]
+    excluded = steady_state_start(samples)
+    assert 90 <= excluded <= 120
+    assert excluded % 5 == 0
+
+
+def test_no_transient_in_a_stationary_series():
+    generator = random.Random(0)
+    samples = [10_000_000 + generator.randint(-100_000, 100_000) for _ in range(1000)]
+    assert steady_state_start(samples) < 50
+
+
+def test_short_series_are_kept_whole():
+    assert steady_state_start([5, 4, 3, 2, 1]) == 0
+
+
+def test_bootstrap_interval_contains_the_mean():
+    values = [10.0, 10.5, 9.5, 10.2, 9.8]
+    low, high = bootstrap_interval(values, 0.95)
+    assert low <= sum(values) / len(values) <= high
+    assert 9.5 <= low and high <= 10.5
+    assert bootstrap_interval(values, 0.95) == (low, high)
+    assert bootstrap_interval([3.0]) == (3.0, 3.0)
+
+
+def test_bootstrap_difference_significance():
+    slow, fast = [12.0, 12.2, 11.9, 12.1, 12.0], [10.0, 10.1, 9.9, 10.2, 10.0]
+    low, high = bootstrap_difference(slow, fast)
+    assert low > 0 and high < 3
+    noisy = [10.0, 12.0, 9.0, 11.0, 10.5]
+    low, high = bootstrap_difference(noisy, fast)
+    assert low < 0 < high